@@ -0,0 +1,17 @@
+# benchmarks/etl.py
+"""
+End-to-end ETL benchmark (synthetic CSV -> iter/cast/load/transform/export).
+Same as `ops bench`; see app.bench.suite.
+
+Usage:
+    python benchmarks/etl.py --rows 200000 --dirty-rate 0.05 --date-formats iso,iso_time
+    python benchmarks/etl.py --rows 200000 --baseline benchmarks/results/bench_people_<ts>.json
+"""
+from __future__ import annotations
+
+import sys
+
+from app.ops_cli import main
+
+if __name__ == "__main__":
+    raise SystemExit(main(["bench", *sys.argv[1:]]))
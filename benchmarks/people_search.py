@@ -0,0 +1,162 @@
+# benchmarks/people_search.py
+"""
+find_people substring search: LIKE '%x%' scan vs the trigram index
+(app.people_search), on synthetic names in bench-only tables
+(dbo.bench_people, dbo.bench_people_name_trigrams).
+
+Usage:
+    python benchmarks/people_search.py --names 10000000
+    python benchmarks/people_search.py --names 200000 --repeat 5
+    python benchmarks/people_search.py --names 10000000 --reuse   # tables already filled
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from app.backends import get_backend
+from app.catalog import get_catalog
+from app.db import get_conn
+from app.people_search import index_people, search_sql
+
+PEOPLE = "dbo.bench_people"
+TRIGRAMS = "dbo.bench_people_name_trigrams"
+
+_FIRST = [
+    "Ada", "Alan", "Amara", "Bela", "Boris", "Carmen", "Chen", "Dario", "Elena", "Emil",
+    "Farah", "Felix", "Greta", "Hugo", "Ines", "Ivan", "Jonas", "Kaito", "Lena", "Luca",
+    "Maya", "Milan", "Nadia", "Omar", "Priya", "Rafael", "Sara", "Tomas", "Vera", "Yusuf",
+]
+# ~1.1k syllables -> surnames as varied as real ones (most 6+ char substrings are rare)
+_SYLLABLES = [c + v + e for c in "bcdfghjklmnprstvwz" for v in "aeiou" for e in ("", "n", "r", "l", "s", "k", "t", "m", "d", "x", "ng", "rt")]
+
+
+def _name(rnd: random.Random) -> str:
+    last = "".join(rnd.choice(_SYLLABLES) for _ in range(rnd.randint(2, 3))).capitalize()
+    return f"{rnd.choice(_FIRST)} {last}"
+
+
+def _create_tables() -> None:
+    backend = get_backend()
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        for t in (TRIGRAMS, PEOPLE):
+            cur.execute(backend.drop_table_if_exists_sql(t))
+        cur.execute(
+            f"""
+            CREATE TABLE {backend.full_table(PEOPLE)} (
+                person_id  BIGINT NOT NULL PRIMARY KEY,
+                full_name  {backend.nvarchar_sql(200)} NOT NULL,
+                created_at DATETIME2(0) NOT NULL
+            );
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE TABLE {backend.full_table(TRIGRAMS)} (
+                trigram   NCHAR(3) NOT NULL,
+                person_id BIGINT NOT NULL,
+                PRIMARY KEY (trigram, person_id)
+            );
+            """
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    get_catalog().invalidate()
+
+
+def _fill(n: int, seed: int, batch: int) -> tuple[float, float]:
+    """
+    Inserts n people with their trigrams; returns (people seconds, trigram seconds).
+    """
+    backend = get_backend()
+    rnd = random.Random(seed)
+    created = time.strftime("%Y-%m-%d %H:%M:%S")
+    insert = f"INSERT INTO {PEOPLE}(person_id, full_name, created_at) VALUES (?, ?, ?);"
+    t_people = t_grams = 0.0
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        for start in range(1, n + 1, batch):
+            rows = [(i, _name(rnd), created) for i in range(start, min(start + batch, n + 1))]
+            t0 = time.perf_counter()
+            backend.bulk_insert(cur, insert, rows)
+            t1 = time.perf_counter()
+            index_people(cur, [(pid, name) for pid, name, _c in rows], table=TRIGRAMS)
+            conn.commit()
+            t_people += t1 - t0
+            t_grams += time.perf_counter() - t1
+            if start // batch % 50 == 0:
+                print(f"filled... {rows[-1][0]}")
+    finally:
+        conn.close()
+    return t_people, t_grams
+
+
+def _patterns(n: int, seed: int) -> list[tuple[str, str]]:
+    # replay the generator to pick substrings of names that exist
+    rnd = random.Random(seed)
+    names = [_name(rnd) for _ in range(min(n, 1000))]
+    pick = random.Random(seed + 1)
+    surname = pick.choice(names).split(" ")[1].lower()
+    return [
+        ("surname", surname),
+        ("surname_part", surname[1:5]),
+        ("full_name", pick.choice(names)),
+        ("first_name", "nadia"),
+        ("common_3", "son"),
+        ("short_2", "an"),
+        ("absent", "xyzzy"),
+    ]
+
+
+def _time_query(like: str, top: int, use_index: bool, repeat: int) -> tuple[float, list]:
+    sql, params = search_sql(like, top, people_table=PEOPLE, trigram_table=TRIGRAMS, use_index=use_index)
+    times = []
+    rows: list = []
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            cur.execute(sql, params)
+            rows = [tuple(r[:2]) for r in cur.fetchall()]
+            times.append(time.perf_counter() - t0)
+    finally:
+        conn.close()
+    return statistics.median(times) * 1000, rows
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--names", type=int, default=10_000_000)
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--batch", type=int, default=20_000)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--reuse", action="store_true", help="Keep the existing bench tables")
+    args = ap.parse_args()
+
+    print(f"names={args.names} backend={get_backend().name}")
+    if not args.reuse:
+        _create_tables()
+        t_people, t_grams = _fill(args.names, args.seed, args.batch)
+        print(f"load people={t_people:.1f}s trigrams={t_grams:.1f}s (index overhead {t_grams / max(t_people, 1e-9):.1f}x)")
+
+    for label, like in _patterns(args.names, args.seed):
+        scan_ms, scan_rows = _time_query(like, args.top, False, args.repeat)
+        ix_ms, ix_rows = _time_query(like, args.top, True, args.repeat)
+        same = "ok" if scan_rows == ix_rows else "MISMATCH"
+        print(
+            f"{label:<14} like={like!r:<12} scan={scan_ms:10.1f} ms trigram={ix_ms:10.1f} ms "
+            f"speedup={scan_ms / max(ix_ms, 1e-6):7.1f}x rows={len(ix_rows)} {same}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
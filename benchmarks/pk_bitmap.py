@@ -0,0 +1,84 @@
+# benchmarks/pk_bitmap.py
+"""
+Memory / speed of the client-side PK structures used by
+transform_dataset(pk_mode="client").
+
+Usage:
+    python benchmarks/pk_bitmap.py --keys 10000000 --layout dense
+    python benchmarks/pk_bitmap.py --keys 100000000 --layout dense --skip-set
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left
+
+from app.pk_index import KeyBitmap
+
+
+def _keys(n: int, layout: str, seed: int):
+    if layout == "dense":
+        return range(1, n + 1)
+    rnd = random.Random(seed)
+    # sparse: ~1 key per 32 ids, unordered
+    return (rnd.randrange(0, n * 32) for _ in range(n))
+
+
+def _measure(label: str, build) -> None:
+    # tracemalloc slows allocation down a lot, so time and measure separately
+    tracemalloc.start()
+    obj = build()
+    _cur, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+
+    t0 = time.perf_counter()
+    obj = build()
+    build_s = time.perf_counter() - t0
+
+    probes = 1_000_000
+    t0 = time.perf_counter()
+    hits = 0
+    for k in range(probes):
+        if k in obj:
+            hits += 1
+    probe_ns = (time.perf_counter() - t0) / probes * 1e9
+
+    print(
+        f"{label:<14} build={build_s:8.2f}s peak={peak / 1e6:10.1f} MB "
+        f"probe={probe_ns:6.0f} ns/key hits={hits}"
+    )
+
+
+class _SortedArray:
+    def __init__(self, keys) -> None:
+        self.a = array("q", sorted(keys))
+
+    def __contains__(self, k: int) -> bool:
+        i = bisect_left(self.a, k)
+        return i < len(self.a) and self.a[i] == k
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--keys", type=int, default=10_000_000)
+    ap.add_argument("--layout", choices=["dense", "sparse"], default="dense")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--skip-set", action="store_true", help="Skip the Python set baseline (huge at 100M)")
+    args = ap.parse_args()
+
+    n, layout, seed = args.keys, args.layout, args.seed
+    print(f"keys={n} layout={layout}")
+
+    _measure("KeyBitmap", lambda: KeyBitmap(_keys(n, layout, seed)))
+    _measure("array('q')", lambda: _SortedArray(_keys(n, layout, seed)))
+    if not args.skip_set:
+        _measure("set[int]", lambda: set(_keys(n, layout, seed)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,195 @@
+# benchmarks/row_batch.py
+"""
+Peak RSS / GC time of the transform's in-process work (cast, validate, build
+final + reject parameters), per-row dicts vs columnar RowBatch. No database.
+
+Both modes consume the same fetchmany(batch_size)-sized chunks, as
+transform_dataset reads staging, so only the row representation differs.
+Each mode runs in its own subprocess so ru_maxrss is not shared.
+
+Usage:
+    python benchmarks/row_batch.py --rows 2000000 --batch-size 1000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import itertools
+import json
+import random
+import subprocess
+import sys
+import time
+
+from app.transform_framework import (
+    AllowedRule,
+    BatchValidator,
+    CrossRule,
+    DatasetSpec,
+    FieldRule,
+    RangeRule,
+    cast_value,
+    make_batch,
+    reject_params,
+    row_hash,
+)
+
+SPEC = DatasetSpec(
+    name="bench",
+    stg_table="dbo.stage_bench",
+    final_table="dbo.bench_typed",
+    fields=[
+        FieldRule(field="id", source="id", cast="int", required=True),
+        FieldRule(field="name", source="name", cast="str", required=True),
+        FieldRule(field="amount", source="amount", cast="money"),
+        FieldRule(field="score", source="score", cast="float"),
+        FieldRule(field="status", source="status", cast="str"),
+        FieldRule(field="created_at", source="created_at", cast="date"),
+    ],
+    ranges=[RangeRule(field="score", min=0, max=100)],
+    allowed=[AllowedRule(field="status", allowed={"new", "open", "closed"})],
+    cross=[CrossRule(name="id_positive", fn=lambda t: t["id"] > 0)],
+)
+
+
+def _rows(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    for i in range(1, n + 1):
+        yield (
+            str(i) if rnd.random() > 0.01 else "x",
+            f"name {i % 5000}",
+            f"${rnd.randint(0, 99999) / 100:,.2f}",
+            str(rnd.random() * 110),
+            rnd.choice(["new", "open", "closed", "bogus"]),
+            "2024-01-%02d" % rnd.randint(1, 28),
+        )
+
+
+def _fetchmany(rows_iter, size: int):
+    # stands in for cursor.fetchmany(size) until exhausted
+    while True:
+        chunk = list(itertools.islice(rows_iter, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _legacy(chunks, batch_size: int) -> tuple[int, int]:
+    # the pre-RowBatch loop: one raw dict, typed dict, reasons list per row
+    stg_cols = [fr.source for fr in SPEC.fields]
+    final_cols = [fr.field for fr in SPEC.fields]
+    good_rows: list = []
+    reject_rows: list = []
+    good = bad = 0
+    for rownum, r in enumerate(itertools.chain.from_iterable(chunks), 1):
+        raw = {stg_cols[i]: r[i] for i in range(len(stg_cols))}
+        typed = {}
+        reasons: list[str] = []
+        for fr in SPEC.fields:
+            tv = cast_value(fr.cast, raw.get(fr.source))
+            typed[fr.field] = tv
+            if fr.required and tv is None:
+                reasons.append(f"required:{fr.field}")
+        for rr in SPEC.ranges or []:
+            v = typed.get(rr.field)
+            if v is None:
+                continue
+            if rr.min is not None and v < rr.min:
+                reasons.append(f"range_min:{rr.field}")
+            if rr.max is not None and v > rr.max:
+                reasons.append(f"range_max:{rr.field}")
+        for ar in SPEC.allowed or []:
+            v = typed.get(ar.field)
+            if v is not None and str(v).strip().lower() not in {x.lower() for x in ar.allowed}:
+                reasons.append(f"allowed:{ar.field}")
+        for cr in SPEC.cross or []:
+            try:
+                ok = bool(cr.fn(typed))
+            except Exception:
+                ok = False
+            if not ok:
+                reasons.append(f"cross:{cr.name}")
+        if reasons:
+            bad += 1
+            reject_rows.append(
+                (SPEC.name, None, rownum, row_hash(raw), "|".join(reasons), json.dumps(raw, ensure_ascii=False))
+            )
+        else:
+            good += 1
+            good_rows.append([typed[c] for c in final_cols])
+        if len(good_rows) >= batch_size:
+            good_rows = []
+        if len(reject_rows) >= batch_size:
+            reject_rows = []
+    return good, bad
+
+
+def _batched(chunks, batch_size: int) -> tuple[int, int]:
+    validator = BatchValidator(SPEC)
+    order = list(range(len(SPEC.fields)))
+    good = bad = total = 0
+    for chunk in chunks:
+        batch = make_batch(SPEC, chunk, validator=validator, first_row_num=total + 1)
+        total += batch.n
+        good += sum(1 for _ in batch.good_rows(order))
+        bad += len(reject_params(SPEC, batch, validator, None))
+    return good, bad
+
+
+def _run_mode(mode: str, rows: int, batch_size: int) -> dict:
+    import resource
+
+    gc_time = 0.0
+    gc_start = 0.0
+
+    def on_gc(phase: str, _info: dict) -> None:
+        nonlocal gc_time, gc_start
+        if phase == "start":
+            gc_start = time.perf_counter()
+        else:
+            gc_time += time.perf_counter() - gc_start
+
+    gc.callbacks.append(on_gc)
+    t0 = time.perf_counter()
+    fn = _legacy if mode == "legacy" else _batched
+    good, bad = fn(_fetchmany(_rows(rows), batch_size), batch_size)
+    elapsed = time.perf_counter() - t0
+    gc.callbacks.remove(on_gc)
+
+    return {
+        "mode": mode,
+        "rows": rows,
+        "good": good,
+        "bad": bad,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(rows / elapsed),
+        "gc_seconds": round(gc_time, 3),
+        "gc_collections": sum(s["collections"] for s in gc.get_stats()),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--batch-size", type=int, default=1000)
+    ap.add_argument("--mode", choices=["legacy", "batch"], default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.mode:
+        print(json.dumps(_run_mode(args.mode, args.rows, args.batch_size)))
+        return 0
+
+    for mode in ("legacy", "batch"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--rows", str(args.rows), "--batch-size", str(args.batch_size)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        print(out.stdout.strip())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+# benchmarks/startup.py
+"""
+CLI startup cost: import time and wall time of `ops <command>` (default: ping),
+against a bare `python -c pass`. Exits 1 when the import time is over budget,
+so CI catches a heavy module-level import creeping back into ops_cli / app.commands.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 20 --max-import-ms 40 -- --help
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+RUN_OPS = ROOT / "run_ops.py"
+
+
+def _env() -> dict[str, str]:
+    env = dict(os.environ)
+    src = str(ROOT / "src")
+    env["PYTHONPATH"] = src + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+    return env
+
+
+def import_ms(cmd: list[str]) -> float:
+    """
+    Cumulative -X importtime of everything imported from the first app.* module on
+    (interpreter startup and site are not ours to budget).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", str(RUN_OPS), *cmd],
+        env=_env(),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"ops {' '.join(cmd)} failed:\n{proc.stderr[-2000:]}")
+
+    total_us = 0
+    started = False
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, name = line[len("import time:") :].split("|", 2)
+        if name.strip() == "imported package" or not cumulative.strip().isdigit():
+            continue  # header line
+        top_level = not name[1:].startswith(" ")
+        if not top_level:
+            continue
+        started = started or name.strip().startswith("app")
+        if started:
+            total_us += int(cumulative)
+    return total_us / 1000
+
+
+def wall_ms(argv: list[str]) -> float:
+    t0 = time.perf_counter()
+    subprocess.run(argv, env=_env(), capture_output=True, check=True)
+    return (time.perf_counter() - t0) * 1000
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="startup")
+    p.add_argument("--runs", type=int, default=10, help="Subprocess runs per measurement (median is reported)")
+    p.add_argument("--max-import-ms", type=float, default=60.0, help="Fail when median import time exceeds this")
+    p.add_argument("command", nargs="*", default=["ping"], help="ops command line to time (default: ping)")
+    args = p.parse_args(argv)
+
+    cmd = args.command or ["ping"]
+    imports = [import_ms(cmd) for _ in range(args.runs)]
+    wall = [wall_ms([sys.executable, str(RUN_OPS), *cmd]) for _ in range(args.runs)]
+    base = [wall_ms([sys.executable, "-c", "pass"]) for _ in range(args.runs)]
+
+    imp = statistics.median(imports)
+    w = statistics.median(wall)
+    b = statistics.median(base)
+    ok = imp <= args.max_import_ms
+    mark = "✅" if ok else "❌"
+    print(
+        f"startup {mark} cmd={' '.join(cmd)} import_ms={imp:.1f} max_import_ms={args.max_import_ms} "
+        f"wall_ms={w:.1f} python_ms={b:.1f} overhead_ms={w - b:.1f} runs={args.runs}"
+    )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+# benchmarks/typecast.py
+"""
+ns/value for the app.typecast scalar parsers on clean, dirty and mixed inputs,
+next to the previous implementations (kept here as `legacy_*`).
+
+Usage:
+    python benchmarks/typecast.py --n 200000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable
+
+from app.typecast import to_date_any, to_decimal_money, to_float, to_int
+
+
+# ----- previous implementations (baseline) -----
+def legacy_to_int(v: Any) -> int | None:
+    s = str(v).strip()
+    if s == "":
+        return None
+    try:
+        return int(s)
+    except ValueError:
+        try:
+            return int(float(s))
+        except ValueError:
+            return None
+
+
+def legacy_to_decimal_money(v: Any) -> Decimal | None:
+    s = str(v).strip()
+    if s == "":
+        return None
+    s = s.replace("$", "").replace(",", "")
+    try:
+        return Decimal(s)
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def legacy_to_date_any(v: Any) -> datetime | None:
+    s = str(v).strip()
+    if s == "":
+        return None
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(s)
+    except ValueError:
+        return None
+
+
+# ----- inputs -----
+def _inputs(kind: str, n: int, rnd: random.Random) -> dict[str, list[str]]:
+    if kind == "int":
+        clean = [str(rnd.randint(0, 10**12)) for _ in range(n)]
+        dirty = [rnd.choice([f" {rnd.randint(-999, 999)} ", f"{rnd.randint(0, 999)}.0", "1e3", "n/a", "12x"]) for _ in range(n)]
+    elif kind == "money":
+        clean = [f"{rnd.randint(0, 10**6) / 100:.2f}" for _ in range(n)]
+        dirty = [rnd.choice([f"${rnd.randint(0, 10**6) / 100:,.2f}", f"{rnd.randint(0, 10**7):,}", "$", "abc"]) for _ in range(n)]
+    elif kind == "float":
+        clean = [repr(rnd.random() * 1000) for _ in range(n)]
+        dirty = [rnd.choice([" 1.5 ", "1e-3", "-0", "inf", "x1"]) for _ in range(n)]
+    else:
+        clean = [
+            rnd.choice(
+                [
+                    f"2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+                    f"2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} {rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}:00",
+                ]
+            )
+            for _ in range(n)
+        ]
+        dirty = [rnd.choice(["2024-1-5", "2024-02-30", "2024-03-04T05:06:07.123", "03/04/2024", "nope"]) for _ in range(n)]
+    mixed = [c if rnd.random() < 0.9 else d for c, d in zip(clean, dirty)]
+    return {"clean": clean, "dirty": dirty, "mixed": mixed}
+
+
+def _ns_per_value(fn: Callable[[Any], Any], values: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        for v in values:
+            fn(v)
+        best = min(best, (time.perf_counter_ns() - t0) / len(values))
+    return best
+
+
+CASES: list[tuple[str, str, Callable[[Any], Any], Callable[[Any], Any] | None]] = [
+    ("to_int", "int", to_int, legacy_to_int),
+    ("to_float", "float", to_float, None),
+    ("to_decimal_money", "money", to_decimal_money, legacy_to_decimal_money),
+    ("to_date_any", "date", to_date_any, legacy_to_date_any),
+]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=100_000, help="values per input set")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    print(f"{'parser':<18} {'input':<6} {'ns/value':>9} {'legacy':>9} {'speedup':>8}")
+    for name, kind, fn, legacy in CASES:
+        for label, values in _inputs(kind, args.n, rnd).items():
+            ns = _ns_per_value(fn, values, args.repeat)
+            if legacy is None:
+                print(f"{name:<18} {label:<6} {ns:9.0f} {'-':>9} {'-':>8}")
+                continue
+            ns_old = _ns_per_value(legacy, values, args.repeat)
+            print(f"{name:<18} {label:<6} {ns:9.0f} {ns_old:9.0f} {ns_old / ns:7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
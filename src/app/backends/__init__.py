@@ -0,0 +1,29 @@
+# src/app/backends/__init__.py
+from __future__ import annotations
+
+from functools import lru_cache
+
+from app.backends.base import Backend, split_table
+from app.config import get_backend_name
+
+__all__ = ["Backend", "get_backend", "split_table"]
+
+
+@lru_cache(maxsize=None)
+def _backend(name: str) -> Backend:
+    if name == "mssql":
+        from app.backends.mssql import MssqlBackend
+
+        return MssqlBackend()
+    if name == "sqlite":
+        from app.backends.sqlite import SqliteBackend
+
+        return SqliteBackend()
+    raise RuntimeError(f"Unknown OPS_DB_BACKEND: {name} (expected mssql|sqlite)")
+
+
+def get_backend() -> Backend:
+    """
+    Backend selected by OPS_DB_BACKEND (default mssql).
+    """
+    return _backend(get_backend_name())
@@ -0,0 +1,255 @@
+# src/app/backends/base.py
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+
+def split_table(full: str) -> tuple[str, str]:
+    s = (full or "").strip()
+    if "." in s:
+        a, b = s.split(".", 1)
+        return a.strip(), b.strip()
+    return "dbo", s
+
+
+class Backend:
+    """
+    Connection factory + dialect hooks for one database engine.
+
+    Everything that differs between engines (TOP vs LIMIT, TRUNCATE,
+    OBJECT_ID / sys.tables lookups, identifier quoting, bulk insert) goes
+    through here so loaders, transforms and exporters stay engine-agnostic.
+    """
+
+    name = "base"
+    supports_migrations = False
+    # index names unique per schema (not per table): a renamed table keeps its index names
+    schema_scoped_index_names = False
+    # partition functions / schemes and ALTER TABLE ... SWITCH (see transform_schema)
+    supports_partitioning = False
+    # OPENJSON ... WITH for set-based payload shredding (app.json_pushdown)
+    supports_openjson = False
+    # COMPRESS() / DECOMPRESS() (gzip) for reject payloads (app.reject_store)
+    supports_compress = False
+
+    # ----- connections -----
+    def connect(self) -> Any:
+        raise NotImplementedError
+
+    # ----- identifiers -----
+    def quote_ident(self, name: str) -> str:
+        return f"[{name}]"
+
+    def full_table(self, table: str) -> str:
+        schema, name = split_table(table)
+        return f"{schema}.{name}"
+
+    # ----- SQL fragments -----
+    def top_sql(self, n: int | None) -> str:
+        """
+        Prefix for SELECT: "SELECT {top_sql(n)}col ...". Empty when n is None.
+        """
+        return ""
+
+    def limit_sql(self, n: int | None) -> str:
+        """
+        Suffix for SELECT: "... ORDER BY x{limit_sql(n)}". Empty when n is None.
+        """
+        return ""
+
+    def truncate_sql(self, table: str) -> str:
+        return f"TRUNCATE TABLE {self.full_table(table)};"
+
+    def nvarchar_sql(self, length: int) -> str:
+        """
+        Unicode text column type; length < 0 = unbounded.
+        """
+        return "NVARCHAR(MAX)" if length < 0 else f"NVARCHAR({int(length)})"
+
+    def datalength_sql(self, expr: str) -> str:
+        """
+        Stored size in bytes of a text / binary expression.
+        """
+        return f"DATALENGTH({expr})"
+
+    def rename_table_sql(self, table: str, new_name: str) -> str:
+        """
+        Renames `table` within its schema; new_name is unqualified.
+        """
+        raise NotImplementedError
+
+    def begin_transaction_sql(self) -> str | None:
+        """
+        Statement opening a transaction explicitly (for DDL-only transactions),
+        or None when the driver already runs every statement in one.
+        """
+        return None
+
+    def drop_table_if_exists_sql(self, table: str) -> str:
+        raise NotImplementedError
+
+    def insert_returning_sql(self, table: str, columns: Sequence[str], returning: str) -> str:
+        """
+        Single-row INSERT that returns one generated column as a result row.
+        """
+        raise NotImplementedError
+
+    def update_from_sql(self, table: str, source: str, key: str, columns: Sequence[str]) -> str:
+        """
+        UPDATE of `columns` in `table` from the rows of `source` (e.g. a temp table)
+        with the same `key`.
+        """
+        raise NotImplementedError
+
+    def upsert_add_sql(self, table: str, keys: Sequence[str], counter: str, columns: Sequence[str] = ()) -> str:
+        """
+        Single-row upsert that adds to `counter`: inserts the row, or when a row
+        with the same `keys` exists adds the value to its counter and sets `columns`.
+        Parameters: keys..., counter value, columns... Atomic against concurrent
+        writers of the same key (no separate "update, then insert if missing").
+        """
+        raise NotImplementedError
+
+    # ----- temp tables (live as long as the connection) -----
+    def temp_table_name(self, name: str) -> str:
+        raise NotImplementedError
+
+    def create_temp_table_sql(self, name: str, columns_sql: str) -> list[str]:
+        """
+        Statements that (re)create temp table `name`, dropping a leftover first.
+        """
+        raise NotImplementedError
+
+    def create_index_sql(
+        self,
+        table: str,
+        name: str,
+        columns: Sequence[str],
+        *,
+        unique: bool = False,
+        include: Sequence[str] | None = None,
+        where: str | None = None,
+        compression: str = "none",
+        partition: tuple[str, str] | None = None,
+    ) -> str:
+        """
+        partition: (scheme, column) to align the index with a partitioned table.
+        """
+        raise NotImplementedError
+
+    def table_compression_sql(self, compression: str) -> str:
+        """
+        Suffix for CREATE TABLE (...) applying "row"/"page" compression; "" if unsupported.
+        """
+        return ""
+
+    def clustered_columnstore_sql(self, table: str, name: str, partition: tuple[str, str] | None = None) -> str | None:
+        """
+        Statement converting a new (empty) table to a clustered columnstore, or None if unsupported.
+        """
+        return None
+
+    # ----- partitioning (supports_partitioning) -----
+    def partition_scheme_sql(self, function: str, scheme: str, type_sql: str) -> list[str]:
+        """
+        Statements creating (if missing) a RANGE RIGHT partition function over
+        type_sql without boundaries, and a scheme mapping it.
+        """
+        return []
+
+    def partition_on_sql(self, scheme: str, column: str) -> str:
+        """
+        Suffix for CREATE TABLE (...) placing the table on a partition scheme; "" if unsupported.
+        """
+        return ""
+
+    def split_partition_sql(self, function: str, scheme: str, boundary: Any, type_sql: str) -> str:
+        """
+        Adds `boundary` to the partition function unless it is already there.
+        """
+        raise NotImplementedError
+
+    def partition_number_sql(self, function: str) -> str:
+        """
+        SELECT returning the partition number of one value (the single parameter).
+        """
+        raise NotImplementedError
+
+    def truncate_partitions_sql(self, table: str, numbers: Sequence[int]) -> str:
+        raise NotImplementedError
+
+    def switch_partition_sql(self, source: str, target: str, number: int) -> str:
+        """
+        Moves partition `number` of source into the (empty) same partition of target.
+        """
+        raise NotImplementedError
+
+    # ----- catalog -----
+    def table_exists(self, cur, table: str) -> bool:
+        raise NotImplementedError
+
+    def table_columns(self, cur, table: str) -> list[str]:
+        raise NotImplementedError
+
+    def index_exists(self, cur, table: str, index_name: str) -> bool:
+        raise NotImplementedError
+
+    def catalog_rows(self, cur, schema: str) -> list[tuple[Any, ...]]:
+        """
+        Every table column, index and primary key column of `schema` in one query, as
+        (table, kind, name, type_name, max_length, precision, scale, nullable)
+        with kind "C" (columns, in column order), "I" (indexes; type_name = index
+        type where known) or "K" (primary key columns, in key order; type_name =
+        constraint name where known). See app.catalog.
+        """
+        raise NotImplementedError
+
+    def table_size(self, cur, table: str) -> tuple[int | None, int, int, int] | None:
+        """
+        Cheap size estimate from engine metadata: (approximate rows or None when the
+        engine keeps no row count, used pages, reserved pages, bytes per page).
+        None when unavailable. See app.table_stats.
+        """
+        return None
+
+    def delete_batch_sql(self, table: str) -> str:
+        """
+        DELETE of at most ? arbitrary rows of `table` (chunked deletes).
+        """
+        raise NotImplementedError
+
+    # ----- writes -----
+    def input_sizes(self, columns: Sequence[Any]) -> list[Any] | None:
+        """
+        Parameter sizes (cursor.setinputsizes) for inserting into catalog
+        ColumnInfos, or None when the driver does not need them.
+        """
+        return None
+
+    def set_input_sizes(self, cur, sizes: list[Any] | None) -> None:
+        """
+        Applies (or with None clears) parameter sizes before an executemany.
+        """
+
+    def bulk_insert(self, cur, sql: str, rows: Sequence[Sequence[Any]], *, sizes: list[Any] | None = None) -> None:
+        cur.executemany(sql, rows)
+
+    def insert_many_returning(self, cur, table: str, column: str, values: Sequence[Any], returning: str) -> list[Any]:
+        """
+        Inserts one row per value into table(column); returns the generated
+        `returning` column of each row, in the order of `values`.
+        """
+        sql = self.insert_returning_sql(table, [column], returning)
+        out: list[Any] = []
+        for v in values:
+            cur.execute(sql, (v,))
+            out.append(cur.fetchone()[0])
+        return out
+
+    # ----- schema -----
+    def apply_schema(self, conn) -> int:
+        """
+        Creates the core tables for engines that don't run the SQL Server migrations.
+        Returns number of objects created.
+        """
+        raise NotImplementedError
@@ -0,0 +1,302 @@
+# src/app/backends/mssql.py
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from app.backends.base import Backend, split_table
+from app.config import get_db_config
+
+
+class MssqlBackend(Backend):
+    name = "mssql"
+    supports_migrations = True
+    supports_partitioning = True
+    supports_openjson = True
+    supports_compress = True
+
+    def connect(self):
+        import pyodbc
+
+        cfg = get_db_config()
+
+        if not cfg.trusted:
+            raise RuntimeError("Non-trusted connection not implemented yet (set MSSQL_TRUSTED=true).")
+
+        conn_str = (
+            f"DRIVER={{{cfg.driver}}};"
+            f"SERVER={cfg.server};"
+            f"DATABASE={cfg.database};"
+            "Trusted_Connection=yes;"
+            "Encrypt=yes;"                  # ODBC 18 explicit
+            "TrustServerCertificate=yes;"   # dev-friendly TLS
+            "LoginTimeout=5;"
+        )
+        return pyodbc.connect(conn_str, autocommit=False)
+
+    def top_sql(self, n: int | None) -> str:
+        return "" if n is None else f"TOP ({int(n)}) "
+
+    def rename_table_sql(self, table: str, new_name: str) -> str:
+        return f"EXEC sp_rename '{self.full_table(table)}', '{new_name}';"
+
+    def drop_table_if_exists_sql(self, table: str) -> str:
+        full = self.full_table(table)
+        return f"IF OBJECT_ID('{full}','U') IS NOT NULL DROP TABLE {full};"
+
+    def insert_returning_sql(self, table: str, columns: Sequence[str], returning: str) -> str:
+        cols_sql = ", ".join(self.quote_ident(c) for c in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        return f"INSERT INTO {self.full_table(table)}({cols_sql}) OUTPUT INSERTED.{self.quote_ident(returning)} VALUES ({placeholders});"
+
+    def update_from_sql(self, table: str, source: str, key: str, columns: Sequence[str]) -> str:
+        q = self.quote_ident
+        sets = ", ".join(f"t.{q(c)} = s.{q(c)}" for c in columns)
+        return f"UPDATE t SET {sets} FROM {self.full_table(table)} t JOIN {source} s ON s.{q(key)} = t.{q(key)};"
+
+    def upsert_add_sql(self, table: str, keys: Sequence[str], counter: str, columns: Sequence[str] = ()) -> str:
+        q = self.quote_ident
+        cols = [*keys, counter, *columns]
+        source = ", ".join(f"? AS {q(c)}" for c in cols)
+        on = " AND ".join(f"t.{q(k)} = s.{q(k)}" for k in keys)
+        sets = ", ".join([f"t.{q(counter)} = t.{q(counter)} + s.{q(counter)}", *(f"t.{q(c)} = s.{q(c)}" for c in columns)])
+        # HOLDLOCK: the key range stays locked between the match and the insert
+        return (
+            f"MERGE {self.full_table(table)} WITH (HOLDLOCK) AS t USING (SELECT {source}) AS s ON {on} "
+            f"WHEN MATCHED THEN UPDATE SET {sets} "
+            f"WHEN NOT MATCHED THEN INSERT ({', '.join(q(c) for c in cols)}) VALUES ({', '.join(f's.{q(c)}' for c in cols)});"
+        )
+
+    def temp_table_name(self, name: str) -> str:
+        return f"#{name}"
+
+    def create_temp_table_sql(self, name: str, columns_sql: str) -> list[str]:
+        t = self.temp_table_name(name)
+        return [f"IF OBJECT_ID('tempdb..{t}') IS NOT NULL DROP TABLE {t};", f"CREATE TABLE {t} ({columns_sql});"]
+
+    def create_index_sql(
+        self,
+        table: str,
+        name: str,
+        columns: Sequence[str],
+        *,
+        unique: bool = False,
+        include: Sequence[str] | None = None,
+        where: str | None = None,
+        compression: str = "none",
+        partition: tuple[str, str] | None = None,
+    ) -> str:
+        unique_sql = "UNIQUE " if unique else ""
+        cols_sql = ", ".join(self.quote_ident(c) for c in columns)
+        include_sql = f" INCLUDE ({', '.join(self.quote_ident(c) for c in include)})" if include else ""
+        where_sql = f" WHERE {where}" if where else ""
+        on_sql = self.partition_on_sql(*partition) if partition else ""
+        return (
+            f"CREATE {unique_sql}INDEX {self.quote_ident(name)} ON {self.full_table(table)} ({cols_sql})"
+            f"{include_sql}{where_sql}{self.table_compression_sql(compression)}{on_sql};"
+        )
+
+    def table_compression_sql(self, compression: str) -> str:
+        if compression in ("row", "page"):
+            return f" WITH (DATA_COMPRESSION = {compression.upper()})"
+        return ""
+
+    def clustered_columnstore_sql(self, table: str, name: str, partition: tuple[str, str] | None = None) -> str | None:
+        on_sql = self.partition_on_sql(*partition) if partition else ""
+        return f"CREATE CLUSTERED COLUMNSTORE INDEX {self.quote_ident(name)} ON {self.full_table(table)}{on_sql};"
+
+    def partition_scheme_sql(self, function: str, scheme: str, type_sql: str) -> list[str]:
+        q = self.quote_ident
+        return [
+            f"""
+            IF NOT EXISTS (SELECT 1 FROM sys.partition_functions WHERE name = '{function}')
+                CREATE PARTITION FUNCTION {q(function)} ({type_sql}) AS RANGE RIGHT FOR VALUES ();
+            """,
+            f"""
+            IF NOT EXISTS (SELECT 1 FROM sys.partition_schemes WHERE name = '{scheme}')
+                CREATE PARTITION SCHEME {q(scheme)} AS PARTITION {q(function)} ALL TO ([PRIMARY]);
+            """,
+        ]
+
+    def partition_on_sql(self, scheme: str, column: str) -> str:
+        return f" ON {self.quote_ident(scheme)}({self.quote_ident(column)})"
+
+    def split_partition_sql(self, function: str, scheme: str, boundary: Any, type_sql: str) -> str:
+        q = self.quote_ident
+        value = boundary.isoformat()
+        return f"""
+        IF NOT EXISTS (
+            SELECT 1
+            FROM sys.partition_range_values rv
+            JOIN sys.partition_functions pf ON pf.function_id = rv.function_id
+            WHERE pf.name = '{function}' AND CAST(rv.value AS {type_sql}) = CAST('{value}' AS {type_sql})
+        )
+        BEGIN
+            ALTER PARTITION SCHEME {q(scheme)} NEXT USED [PRIMARY];
+            ALTER PARTITION FUNCTION {q(function)}() SPLIT RANGE ('{value}');
+        END
+        """
+
+    def partition_number_sql(self, function: str) -> str:
+        return f"SELECT $PARTITION.{self.quote_ident(function)}(?);"
+
+    def truncate_partitions_sql(self, table: str, numbers: Sequence[int]) -> str:
+        nums = ", ".join(str(int(n)) for n in numbers)
+        return f"TRUNCATE TABLE {self.full_table(table)} WITH (PARTITIONS ({nums}));"
+
+    def switch_partition_sql(self, source: str, target: str, number: int) -> str:
+        n = int(number)
+        return f"ALTER TABLE {self.full_table(source)} SWITCH PARTITION {n} TO {self.full_table(target)} PARTITION {n};"
+
+    def table_exists(self, cur, table: str) -> bool:
+        schema, name = split_table(table)
+        cur.execute(
+            """
+            SELECT 1
+            FROM sys.tables t
+            JOIN sys.schemas s ON s.schema_id = t.schema_id
+            WHERE s.name = ? AND t.name = ?;
+            """,
+            (schema, name),
+        )
+        return cur.fetchone() is not None
+
+    def table_columns(self, cur, table: str) -> list[str]:
+        schema, name = split_table(table)
+        cur.execute(
+            """
+            SELECT c.name
+            FROM sys.columns c
+            JOIN sys.tables t ON t.object_id = c.object_id
+            JOIN sys.schemas s ON s.schema_id = t.schema_id
+            WHERE s.name = ? AND t.name = ?
+            ORDER BY c.column_id;
+            """,
+            (schema, name),
+        )
+        return [r[0] for r in cur.fetchall()]
+
+    def index_exists(self, cur, table: str, index_name: str) -> bool:
+        cur.execute(
+            """
+            SELECT 1
+            FROM sys.indexes
+            WHERE name = ? AND object_id = OBJECT_ID(?);
+            """,
+            (index_name, self.full_table(table)),
+        )
+        return cur.fetchone() is not None
+
+    def table_size(self, cur, table: str) -> tuple[int | None, int, int, int] | None:
+        # partition metadata: no scan, but needs VIEW DATABASE STATE
+        cur.execute(
+            """
+            SELECT SUM(CASE WHEN index_id IN (0, 1) THEN row_count END),
+                   SUM(used_page_count), SUM(reserved_page_count)
+            FROM sys.dm_db_partition_stats
+            WHERE object_id = OBJECT_ID(?);
+            """,
+            (table,),
+        )
+        row = cur.fetchone()
+        if row is None or row[0] is None:
+            return None
+        rows, used, reserved = row
+        return int(rows), int(used or 0), int(reserved or 0), 8192
+
+    def delete_batch_sql(self, table: str) -> str:
+        return f"DELETE TOP (?) FROM {self.full_table(table)};"
+
+    def catalog_rows(self, cur, schema: str) -> list[tuple[Any, ...]]:
+        cur.execute(
+            """
+            SELECT t.name, 'C', c.name, ty.name,
+                   CASE WHEN c.max_length = -1 THEN NULL
+                        WHEN ty.name IN ('nvarchar', 'nchar') THEN c.max_length / 2
+                        WHEN ty.name IN ('varchar', 'char', 'varbinary', 'binary') THEN c.max_length
+                   END,
+                   c.precision, c.scale, c.is_nullable, c.column_id
+            FROM sys.tables t
+            JOIN sys.schemas s ON s.schema_id = t.schema_id
+            JOIN sys.columns c ON c.object_id = t.object_id
+            JOIN sys.types ty ON ty.user_type_id = c.user_type_id
+            WHERE s.name = ?
+            UNION ALL
+            SELECT t.name, 'I', i.name, LOWER(i.type_desc), NULL, NULL, NULL, NULL, i.index_id
+            FROM sys.tables t
+            JOIN sys.schemas s ON s.schema_id = t.schema_id
+            JOIN sys.indexes i ON i.object_id = t.object_id
+            WHERE s.name = ? AND i.name IS NOT NULL
+            UNION ALL
+            SELECT t.name, 'K', c.name, i.name, NULL, NULL, NULL, NULL, ic.key_ordinal
+            FROM sys.tables t
+            JOIN sys.schemas s ON s.schema_id = t.schema_id
+            JOIN sys.indexes i ON i.object_id = t.object_id AND i.is_primary_key = 1
+            JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+            JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+            WHERE s.name = ? AND ic.key_ordinal > 0
+            ORDER BY 1, 2, 9;
+            """,
+            (schema, schema, schema),
+        )
+        return [tuple(r[:8]) for r in cur.fetchall()]
+
+    def input_sizes(self, columns: Sequence[Any]) -> list[Any] | None:
+        import pyodbc
+
+        sizes: list[Any] = []
+        for c in columns:
+            t = c.type_name
+            if t in ("nvarchar", "nchar"):
+                sizes.append((pyodbc.SQL_WLONGVARCHAR, 0, 0) if c.max_length is None else (pyodbc.SQL_WVARCHAR, c.max_length, 0))
+            elif t in ("varchar", "char"):
+                sizes.append((pyodbc.SQL_LONGVARCHAR, 0, 0) if c.max_length is None else (pyodbc.SQL_VARCHAR, c.max_length, 0))
+            elif t in ("varbinary", "binary"):
+                sizes.append((pyodbc.SQL_LONGVARBINARY, 0, 0) if c.max_length is None else (pyodbc.SQL_VARBINARY, c.max_length, 0))
+            elif t in ("decimal", "numeric", "money"):
+                sizes.append((pyodbc.SQL_DECIMAL, c.precision, c.scale))
+            elif t == "int":
+                sizes.append((pyodbc.SQL_INTEGER, 0, 0))
+            elif t == "bigint":
+                sizes.append((pyodbc.SQL_BIGINT, 0, 0))
+            elif t in ("float", "real"):
+                sizes.append((pyodbc.SQL_DOUBLE, 0, 0))
+            elif t == "date":
+                sizes.append((pyodbc.SQL_TYPE_DATE, 0, 0))
+            elif t in ("datetime2", "datetime"):
+                sizes.append((pyodbc.SQL_TYPE_TIMESTAMP, 27, 7))
+            else:
+                # let the driver infer the rest (bit, uniqueidentifier, ...)
+                sizes.append(None)
+        return sizes
+
+    def set_input_sizes(self, cur, sizes: list[Any] | None) -> None:
+        # sizes stick to the cursor, so clear them for statements that don't pass any
+        cur.setinputsizes(sizes)
+
+    def bulk_insert(self, cur, sql: str, rows: Sequence[Sequence[Any]], *, sizes: list[Any] | None = None) -> None:
+        # pyodbc sends the whole parameter array in one round trip; with sizes from
+        # the catalog it binds fixed-width buffers instead of guessing from the first row
+        cur.fast_executemany = True
+        cur.setinputsizes(sizes)
+        cur.executemany(sql, rows)
+
+    def insert_many_returning(self, cur, table: str, column: str, values: Sequence[Any], returning: str) -> list[Any]:
+        # OUTPUT row order isn't guaranteed, so MERGE carries each value's ordinal
+        # through to OUTPUT; 2 parameters per row keeps a statement under the 2100 limit
+        q = self.quote_ident
+        out: list[Any] = []
+        for start in range(0, len(values), 1000):
+            chunk = values[start : start + 1000]
+            rows_sql = ", ".join(["(?, ?)"] * len(chunk))
+            params = [p for k, v in enumerate(chunk) for p in (k, v)]
+            cur.execute(
+                f"""
+                MERGE INTO {self.full_table(table)} AS t
+                USING (VALUES {rows_sql}) AS s(ord, v) ON 1 = 0
+                WHEN NOT MATCHED THEN INSERT ({q(column)}) VALUES (s.v)
+                OUTPUT s.ord, INSERTED.{q(returning)};
+                """,
+                params,
+            )
+            out.extend(r[1] for r in sorted(cur.fetchall(), key=lambda r: r[0]))
+        return out
@@ -0,0 +1,402 @@
+# src/app/backends/sqlite.py
+from __future__ import annotations
+
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Sequence
+
+from app.backends.base import Backend, split_table
+from app.config import get_sqlite_config
+
+# Local stand-in for SQL Server: benchmarks, CI boxes, laptops.
+#
+# The database file is ATTACHed as schema "dbo", so the "dbo.table" names
+# used throughout the code resolve unchanged. Only the dbo schema exists.
+#
+# Core tables (what the SQL Server migrations create) are created by
+# `ops migrate`, see apply_schema().
+
+SCHEMA = "dbo"
+
+_CORE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS dbo.raw_orders (
+        id            INTEGER PRIMARY KEY AUTOINCREMENT,
+        payload_json  TEXT NOT NULL,
+        ingested_at   DATETIME2(0) NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dbo.people (
+        person_id  INTEGER PRIMARY KEY AUTOINCREMENT,
+        full_name  NVARCHAR(200) NOT NULL,
+        created_at DATETIME2(0) NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dbo.people_rejects (
+        reject_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+        raw_person_id  NVARCHAR(4000) NULL,
+        raw_full_name  NVARCHAR(4000) NULL,
+        raw_created_at NVARCHAR(4000) NULL,
+        reason         NVARCHAR(4000) NOT NULL,
+        rejected_at    DATETIME2(0) NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dbo.dataset_rejects (
+        reject_id       INTEGER PRIMARY KEY AUTOINCREMENT,
+        dataset_name    NVARCHAR(100) NOT NULL,
+        source_file     NVARCHAR(500) NULL,
+        row_num         INT NOT NULL,
+        row_hash        VARBINARY(32) NOT NULL,
+        reject_reasons  NVARCHAR(1000) NOT NULL,
+        raw_json        TEXT NOT NULL,
+        created_at      DATETIME2(0) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        raw_json_z      BLOB NULL
+    );
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS dbo.IX_dataset_rejects_dataset_created
+        ON dataset_rejects(dataset_name, created_at);
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dbo.etl_runs (
+        run_id        CHAR(32)       NOT NULL PRIMARY KEY,
+        command       NVARCHAR(100)  NOT NULL,
+        dataset       NVARCHAR(200)  NULL,
+        source        NVARCHAR(500)  NULL,
+        status        NVARCHAR(20)   NOT NULL,
+        error         NVARCHAR(2000) NULL,
+        host          NVARCHAR(200)  NULL,
+        started_at    DATETIME2(3)   NOT NULL,
+        finished_at   DATETIME2(3)   NOT NULL,
+        seconds       FLOAT          NOT NULL,
+        rows_read     BIGINT         NOT NULL DEFAULT 0,
+        rows_good     BIGINT         NOT NULL DEFAULT 0,
+        rows_bad      BIGINT         NOT NULL DEFAULT 0,
+        rows_skipped  BIGINT         NOT NULL DEFAULT 0,
+        batches       INT            NOT NULL DEFAULT 0,
+        bytes_read    BIGINT         NOT NULL DEFAULT 0,
+        retries       INT            NOT NULL DEFAULT 0,
+        rows_per_sec  FLOAT          NULL,
+        phases_json   TEXT           NULL
+    );
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS dbo.IX_etl_runs_command_started
+        ON etl_runs(command, started_at);
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dbo.load_checkpoints (
+        target_table  NVARCHAR(128)  NOT NULL,
+        source_file   NVARCHAR(300)  NOT NULL,
+        byte_offset   BIGINT         NOT NULL,
+        line_num      BIGINT         NOT NULL,
+        rows_loaded   BIGINT         NOT NULL,
+        updated_at    DATETIME2(0)   NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        head_bytes    BIGINT         NULL,
+        head_sha256   BLOB           NULL,
+        PRIMARY KEY (target_table, source_file)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dbo.dataset_rejects_summary (
+        dataset_name  NVARCHAR(100)  NOT NULL,
+        source_file   NVARCHAR(500)  NOT NULL,
+        reason        NVARCHAR(200)  NOT NULL,
+        reject_day    DATE           NOT NULL,
+        reject_count  BIGINT         NOT NULL,
+        updated_at    DATETIME2(0)   NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (dataset_name, source_file, reason, reject_day)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dbo.people_name_trigrams (
+        trigram    NCHAR(3)  NOT NULL,
+        person_id  BIGINT    NOT NULL,
+        PRIMARY KEY (trigram, person_id)
+    ) WITHOUT ROWID;
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS dbo.IX_people_name_trigrams_person
+        ON people_name_trigrams(person_id);
+    """,
+]
+
+# columns added to core tables after they first shipped: (table, column, declaration)
+_CORE_COLUMNS = [
+    ("dataset_rejects", "raw_json_z", "BLOB NULL"),
+    ("load_checkpoints", "head_bytes", "BIGINT NULL"),
+    ("load_checkpoints", "head_sha256", "BLOB NULL"),
+]
+
+
+_DECL_TYPE = re.compile(r"^\s*([A-Za-z0-9_]+)\s*(?:\(\s*(\w+)\s*(?:,\s*(\d+)\s*)?\))?")
+
+
+def _parse_decl_type(decl: str) -> tuple[str, int | None, int | None, int | None]:
+    """
+    Declared column type -> (type_name, max_length, precision, scale), shaped like
+    the SQL Server catalog: "NVARCHAR(4000)" -> ("nvarchar", 4000, None, None),
+    "DECIMAL(19,4)" -> ("decimal", None, 19, 4), "NVARCHAR(MAX)"/"TEXT" -> max_length None.
+    """
+    m = _DECL_TYPE.match(decl or "")
+    if m is None:
+        return (decl or "").lower(), None, None, None
+    name, a, b = m.group(1).lower(), m.group(2), m.group(3)
+    if name in ("decimal", "numeric"):
+        return name, None, int(a) if a and a.isdigit() else None, int(b) if b else 0
+    if a and a.isdigit() and name in ("nvarchar", "nchar", "varchar", "char", "varbinary", "binary"):
+        return name, int(a), None, None
+    return name, None, None, None
+
+
+def _adapt_datetime(v: datetime) -> str:
+    return v.isoformat(sep=" ")
+
+
+def _convert_datetime(b: bytes) -> datetime:
+    return datetime.fromisoformat(b.decode())
+
+
+def _convert_date(b: bytes) -> date:
+    return datetime.fromisoformat(b.decode()).date()
+
+
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_adapter(date, date.isoformat)
+# declared types are matched on their first word, e.g. "DATETIME2(0)" -> "DATETIME2"
+sqlite3.register_converter("DATETIME2", _convert_datetime)
+sqlite3.register_converter("DATETIME", _convert_datetime)
+sqlite3.register_converter("DATE", _convert_date)
+
+
+class _Connection(sqlite3.Connection):
+    def close(self) -> None:
+        # a cursor still referenced from a traceback keeps the close deferred, and with
+        # it the write lock of the failed transaction; roll back explicitly first
+        try:
+            self.rollback()
+        finally:
+            super().close()
+
+
+class SqliteBackend(Backend):
+    name = "sqlite"
+    supports_migrations = False
+    schema_scoped_index_names = True
+
+    def connect(self):
+        cfg = get_sqlite_config()
+        # check_same_thread=False: pooled connections move between worker threads (one user at a time)
+        conn = sqlite3.connect(
+            ":memory:",
+            timeout=30,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            factory=_Connection,
+        )
+        conn.execute(f"ATTACH DATABASE ? AS {SCHEMA};", (cfg.path,))
+        # WAL lets a streaming reader and a writer connection work side by side
+        conn.execute(f"PRAGMA {SCHEMA}.journal_mode=WAL;")
+        conn.execute(f"PRAGMA {SCHEMA}.synchronous=NORMAL;")
+        return conn
+
+    def _schema_name(self, table: str) -> tuple[str, str]:
+        schema, name = split_table(table)
+        if schema.lower() != SCHEMA:
+            raise RuntimeError(f"SQLite backend only has schema '{SCHEMA}' (got {table})")
+        return SCHEMA, name
+
+    def quote_ident(self, name: str) -> str:
+        return '"' + name.replace('"', '""') + '"'
+
+    def full_table(self, table: str) -> str:
+        schema, name = self._schema_name(table)
+        return f"{schema}.{self.quote_ident(name)}"
+
+    def limit_sql(self, n: int | None) -> str:
+        return "" if n is None else f" LIMIT {int(n)}"
+
+    def truncate_sql(self, table: str) -> str:
+        return f"DELETE FROM {self.full_table(table)};"
+
+    def nvarchar_sql(self, length: int) -> str:
+        # no MAX length in SQLite; TEXT is unbounded
+        return "TEXT" if length < 0 else super().nvarchar_sql(length)
+
+    def datalength_sql(self, expr: str) -> str:
+        return f"LENGTH(CAST({expr} AS BLOB))"
+
+    def rename_table_sql(self, table: str, new_name: str) -> str:
+        return f"ALTER TABLE {self.full_table(table)} RENAME TO {self.quote_ident(new_name)};"
+
+    def begin_transaction_sql(self) -> str | None:
+        # sqlite3 only opens transactions implicitly before DML, not DDL
+        return "BEGIN IMMEDIATE;"
+
+    def drop_table_if_exists_sql(self, table: str) -> str:
+        return f"DROP TABLE IF EXISTS {self.full_table(table)};"
+
+    def insert_returning_sql(self, table: str, columns: Sequence[str], returning: str) -> str:
+        cols_sql = ", ".join(self.quote_ident(c) for c in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        return f"INSERT INTO {self.full_table(table)}({cols_sql}) VALUES ({placeholders}) RETURNING {self.quote_ident(returning)};"
+
+    def update_from_sql(self, table: str, source: str, key: str, columns: Sequence[str]) -> str:
+        q = self.quote_ident
+        sets = ", ".join(f"{q(c)} = s.{q(c)}" for c in columns)
+        return f"UPDATE {self.full_table(table)} AS t SET {sets} FROM {source} AS s WHERE s.{q(key)} = t.{q(key)};"
+
+    def upsert_add_sql(self, table: str, keys: Sequence[str], counter: str, columns: Sequence[str] = ()) -> str:
+        q = self.quote_ident
+        cols = [*keys, counter, *columns]
+        sets = ", ".join([f"{q(counter)} = {q(counter)} + excluded.{q(counter)}", *(f"{q(c)} = excluded.{q(c)}" for c in columns)])
+        return (
+            f"INSERT INTO {self.full_table(table)}({', '.join(q(c) for c in cols)}) VALUES ({', '.join('?' for _ in cols)}) "
+            f"ON CONFLICT({', '.join(q(k) for k in keys)}) DO UPDATE SET {sets};"
+        )
+
+    def temp_table_name(self, name: str) -> str:
+        return f"temp.{self.quote_ident(name)}"
+
+    def create_temp_table_sql(self, name: str, columns_sql: str) -> list[str]:
+        t = self.temp_table_name(name)
+        return [f"DROP TABLE IF EXISTS {t};", f"CREATE TABLE {t} ({columns_sql});"]
+
+    def insert_many_returning(self, cur, table: str, column: str, values: Sequence[Any], returning: str) -> list[Any]:
+        # RETURNING order is unspecified, but one statement assigns increasing
+        # rowids in VALUES order, so sorting restores it
+        out: list[Any] = []
+        for start in range(0, len(values), 1000):
+            chunk = values[start : start + 1000]
+            cur.execute(
+                f"INSERT INTO {self.full_table(table)}({self.quote_ident(column)}) VALUES "
+                f"{', '.join(['(?)'] * len(chunk))} RETURNING {self.quote_ident(returning)};",
+                list(chunk),
+            )
+            out.extend(sorted(r[0] for r in cur.fetchall()))
+        return out
+
+    def create_index_sql(
+        self,
+        table: str,
+        name: str,
+        columns: Sequence[str],
+        *,
+        unique: bool = False,
+        include: Sequence[str] | None = None,
+        where: str | None = None,
+        compression: str = "none",
+        partition: tuple[str, str] | None = None,
+    ) -> str:
+        # INCLUDE columns, compression and partitioning have no SQLite equivalent; the key columns are enough locally
+        schema, tname = self._schema_name(table)
+        unique_sql = "UNIQUE " if unique else ""
+        cols_sql = ", ".join(self.quote_ident(c) for c in columns)
+        where_sql = f" WHERE {where}" if where else ""
+        return (
+            f"CREATE {unique_sql}INDEX IF NOT EXISTS {schema}.{self.quote_ident(name)} "
+            f"ON {self.quote_ident(tname)} ({cols_sql}){where_sql};"
+        )
+
+    def table_exists(self, cur, table: str) -> bool:
+        schema, name = self._schema_name(table)
+        cur.execute(
+            f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ? COLLATE NOCASE;",
+            (name,),
+        )
+        return cur.fetchone() is not None
+
+    def table_columns(self, cur, table: str) -> list[str]:
+        schema, name = self._schema_name(table)
+        cur.execute(f"PRAGMA {schema}.table_info({self.quote_ident(name)});")
+        return [r[1] for r in cur.fetchall()]
+
+    def index_exists(self, cur, table: str, index_name: str) -> bool:
+        schema, name = self._schema_name(table)
+        cur.execute(
+            f"""
+            SELECT 1 FROM {schema}.sqlite_master
+            WHERE type = 'index' AND name = ? COLLATE NOCASE AND tbl_name = ? COLLATE NOCASE;
+            """,
+            (index_name, name),
+        )
+        return cur.fetchone() is not None
+
+    def table_size(self, cur, table: str) -> tuple[int | None, int, int, int] | None:
+        # dbstat (when compiled in) walks the b-tree pages of the table and its
+        # indexes without decoding rows; SQLite keeps no row count, so rows is None
+        schema, name = self._schema_name(table)
+        try:
+            cur.execute(
+                f"""
+                SELECT COUNT(*) FROM dbstat('{schema}') d
+                JOIN {schema}.sqlite_master m ON m.name = d.name
+                WHERE m.tbl_name = ? COLLATE NOCASE;
+                """,
+                (name,),
+            )
+        except sqlite3.OperationalError:
+            return None
+        pages = int(cur.fetchone()[0])
+        if not pages:
+            return None
+        cur.execute(f"PRAGMA {schema}.page_size;")
+        page_bytes = int(cur.fetchone()[0])
+        return None, pages, pages, page_bytes
+
+    def delete_batch_sql(self, table: str) -> str:
+        t = self.full_table(table)
+        return f"DELETE FROM {t} WHERE rowid IN (SELECT rowid FROM {t} LIMIT ?);"
+
+    def catalog_rows(self, cur, schema: str) -> list[tuple[Any, ...]]:
+        if schema.lower() != SCHEMA:
+            raise RuntimeError(f"SQLite backend only has schema '{SCHEMA}' (got {schema})")
+        schema = SCHEMA
+        cur.execute(
+            f"""
+            SELECT m.name, 'C', p.name, p.type, p."notnull", p.cid
+            FROM {schema}.sqlite_master m
+            JOIN pragma_table_info(m.name, '{schema}') p
+            WHERE m.type = 'table'
+            UNION ALL
+            SELECT tbl_name, 'I', name, NULL, NULL, 0
+            FROM {schema}.sqlite_master
+            WHERE type = 'index'
+            UNION ALL
+            SELECT m.name, 'K', p.name, NULL, NULL, p.pk
+            FROM {schema}.sqlite_master m
+            JOIN pragma_table_info(m.name, '{schema}') p
+            WHERE m.type = 'table' AND p.pk > 0
+            ORDER BY 1, 2, 6;
+            """
+        )
+        out: list[tuple[Any, ...]] = []
+        for table, kind, name, decl, notnull, _pos in cur.fetchall():
+            if kind == "K":
+                out.append((table, kind, name, None, None, None, None, None))
+            elif kind == "C":
+                type_name, max_length, precision, scale = _parse_decl_type(decl)
+                out.append((table, kind, name, type_name, max_length, precision, scale, not notnull))
+            else:
+                out.append((table, kind, name, None, None, None, None, None))
+        return out
+
+    def apply_schema(self, conn) -> int:
+        cur = conn.cursor()
+        cur.execute(f"SELECT COUNT(*) FROM {SCHEMA}.sqlite_master;")
+        before = int(cur.fetchone()[0])
+        for ddl in _CORE_TABLES:
+            cur.execute(ddl)
+        for table, column, decl in _CORE_COLUMNS:
+            cur.execute(f"PRAGMA {SCHEMA}.table_info({self.quote_ident(table)});")
+            if column not in {r[1] for r in cur.fetchall()}:
+                cur.execute(f"ALTER TABLE {SCHEMA}.{self.quote_ident(table)} ADD COLUMN {self.quote_ident(column)} {decl};")
+        conn.commit()
+        cur.execute(f"SELECT COUNT(*) FROM {SCHEMA}.sqlite_master;")
+        return int(cur.fetchone()[0]) - before
@@ -0,0 +1,353 @@
+# src/app/bench/suite.py
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from app.backends import get_backend
+from app.catalog import get_catalog
+from app.bench.synth import generate_csv
+from app.exporters.people_exporter import export_people_csv
+from app.exporters.rejects_exporter import export_rejects_csv, export_rejects_jsonl
+from app.db import get_conn
+from app.loaders.csv_loader import iter_csv_rows, load_csv
+from app.loaders.jsonl_loader import load_jsonl
+from app.rejects_repo import count_rejects
+from app.sql_utils import count_table
+from app.transform_framework import DatasetSpec, cast_value, transform_dataset
+from app.transform_schema import ensure_final_table_from_spec
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PHASES = [
+    "generate",
+    "iter_csv_rows",
+    "cast_value",
+    "load_csv",
+    "load_jsonl",
+    "transform_dataset",
+    "export_people",
+    "export_rejects_jsonl",
+    "export_rejects_csv",
+]
+
+_CAST_CHUNK = 10_000
+
+# created by `ops migrate`: checkpoints (load_jsonl), rejects, dbo.people (export_people)
+REQUIRED_TABLES = ["dbo.load_checkpoints", "dbo.dataset_rejects", "dbo.people"]
+
+
+def bench_spec(spec: DatasetSpec) -> DatasetSpec:
+    """
+    Copy of spec pointed at bench-only tables, so a run never touches real data.
+    """
+    name = f"bench_{spec.name}"
+    return replace(
+        spec,
+        name=name,
+        stg_table=f"dbo.{name}_stage",
+        final_table=f"dbo.{name}_typed",
+        indexes=[replace(ix, name=f"{ix.name}_{name}") for ix in spec.indexes or []] or None,
+    )
+
+
+def missing_tables() -> list[str]:
+    """
+    REQUIRED_TABLES that don't exist yet (a fresh, unmigrated database).
+    """
+    catalog = get_catalog()
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        return [t for t in REQUIRED_TABLES if not catalog.table_exists(cur, t)]
+    finally:
+        conn.close()
+
+
+def _peak_rss_mb() -> float | None:
+    """
+    Process high-water mark so far (ru_maxrss; None where unavailable).
+    """
+    if resource is None:
+        return None
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KiB elsewhere
+    return round(kb / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _count_lines(path: str | Path, header: bool) -> int:
+    with open(path, "rb") as f:
+        n = sum(1 for _ in f)
+    return n - 1 if header and n else n
+
+
+def _jsonl_from_csv(csv_path: Path, out_path: Path) -> None:
+    """
+    Same rows as the CSV, one JSON object per line (header names as keys).
+    """
+    header, it = iter_csv_rows(str(csv_path))
+    with out_path.open("w", encoding="utf-8", newline="\n") as f:
+        for row in it:
+            f.write(json.dumps(dict(zip(header, row)), ensure_ascii=False))
+            f.write("\n")
+
+
+def _create_payload_table(table: str) -> None:
+    backend = get_backend()
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute(backend.drop_table_if_exists_sql(table))
+        cur.execute(f"CREATE TABLE {backend.full_table(table)} (payload_json {backend.nvarchar_sql(-1)} NOT NULL);")
+        conn.commit()
+    finally:
+        conn.close()
+    get_catalog().invalidate(table)
+
+
+def _phase(results: dict[str, Any], name: str, fn: Callable[[], int | tuple[int, float]]) -> None:
+    """
+    Runs fn (returns rows, or (rows, seconds) when it times itself) with stdout
+    captured, and records seconds / rows / rows_per_sec / peak RSS.
+    """
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        out = fn()
+    elapsed = time.perf_counter() - t0
+    rows, seconds = out if isinstance(out, tuple) else (out, elapsed)
+    results[name] = {
+        "seconds": round(seconds, 4),
+        "rows": rows,
+        "rows_per_sec": round(rows / seconds) if seconds > 0 else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    print(f"bench ✅ phase={name} rows={rows} seconds={seconds:.3f} rows_per_sec={results[name]['rows_per_sec']}")
+
+
+def run_bench(
+    spec: DatasetSpec,
+    *,
+    rows: int = 100_000,
+    width: int = 0,
+    dirty_rate: float = 0.02,
+    date_formats: list[str] | None = None,
+    batch_size: int = 2000,
+    seed: int = 42,
+    phases: list[str] | None = None,
+    work_dir: str | None = None,
+) -> dict[str, Any]:
+    """
+    Generates a synthetic CSV for spec and times each ETL phase on it.
+
+    Runs against bench_spec(spec) tables (dbo.bench_<name>_stage / _typed) and
+    rejects under dataset bench_<name>; the people exporter reads dbo.people as-is.
+    Returns a JSON-serializable result (see write_result / compare_results).
+    """
+    phases = phases or PHASES
+    unknown = [p for p in phases if p not in PHASES]
+    if unknown:
+        raise RuntimeError(f"Unknown bench phase(s): {unknown} (expected {PHASES})")
+
+    bspec = bench_spec(spec)
+    date_formats = date_formats or ["iso"]
+    out: dict[str, Any] = {}
+
+    tmp = tempfile.TemporaryDirectory(prefix="ops_bench_") if work_dir is None else None
+    base = Path(tmp.name if tmp is not None else work_dir)
+    base.mkdir(parents=True, exist_ok=True)
+    csv_path = base / f"{bspec.name}.csv"
+
+    try:
+        # the CSV is needed by every later phase, so it is always generated
+        def _generate() -> int:
+            generate_csv(
+                spec,
+                str(csv_path),
+                rows=rows,
+                width=width,
+                dirty_rate=dirty_rate,
+                date_formats=date_formats,
+                seed=seed,
+            )
+            return rows
+
+        _phase(out, "generate", _generate)
+
+        if "iter_csv_rows" in phases:
+
+            def _iter() -> int:
+                _header, it = iter_csv_rows(str(csv_path))
+                return sum(1 for _ in it)
+
+            _phase(out, "iter_csv_rows", _iter)
+
+        if "cast_value" in phases:
+
+            def _cast() -> tuple[int, float]:
+                # only the casts are timed; CSV reading is the previous phase
+                header, it = iter_csv_rows(str(csv_path))
+                pos = {c.lower(): i for i, c in enumerate(header)}
+                plan = [(pos[fr.source.lower()], fr.cast.lower()) for fr in spec.fields]
+                n = 0
+                spent = 0.0
+                chunk: list[list[str]] = []
+                for row in it:
+                    chunk.append(row)
+                    if len(chunk) < _CAST_CHUNK:
+                        continue
+                    t0 = time.perf_counter()
+                    for r in chunk:
+                        for i, kind in plan:
+                            cast_value(kind, r[i])
+                    spent += time.perf_counter() - t0
+                    n += len(chunk)
+                    chunk = []
+                t0 = time.perf_counter()
+                for r in chunk:
+                    for i, kind in plan:
+                        cast_value(kind, r[i])
+                spent += time.perf_counter() - t0
+                return n + len(chunk), spent
+
+            _phase(out, "cast_value", _cast)
+
+        if "load_csv" in phases or "transform_dataset" in phases:
+
+            def _load() -> int:
+                load_csv(
+                    csv_path=str(csv_path),
+                    table=bspec.stg_table,
+                    batch_size=batch_size,
+                    drop_and_recreate=True,
+                    confirm=f"DROP_CREATE {bspec.stg_table}",
+                )
+                return rows
+
+            _phase(out, "load_csv", _load)
+
+        if "load_jsonl" in phases:
+            # same rows as load_csv, as JSON objects (use --width for KB-sized payloads)
+            jsonl_path = base / f"{bspec.name}.jsonl"
+            raw_table = f"dbo.{bspec.name}_raw"
+            _jsonl_from_csv(csv_path, jsonl_path)
+            _create_payload_table(raw_table)
+            _phase(
+                out,
+                "load_jsonl",
+                lambda: load_jsonl(path=str(jsonl_path), table=raw_table, batch_size=batch_size, resume=False)["rows"],
+            )
+
+        if "transform_dataset" in phases:
+
+            def _transform() -> int:
+                transform_dataset(bspec, truncate_final=True, truncate_rejects=True, batch_size=batch_size)
+                return rows
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                ensure_final_table_from_spec(
+                    bspec, drop_and_recreate=True, confirm=f"DROP_CREATE {bspec.final_table}"
+                )
+            _phase(out, "transform_dataset", _transform)
+            out["transform_dataset"]["good"] = count_table(bspec.final_table, exact=True)
+            out["transform_dataset"]["bad"] = count_rejects(bspec.name)
+
+        if "export_people" in phases:
+            _phase(
+                out,
+                "export_people",
+                lambda: _count_lines(export_people_csv(str(base / "people.csv")), header=True),
+            )
+
+        if "export_rejects_jsonl" in phases:
+            _phase(
+                out,
+                "export_rejects_jsonl",
+                lambda: _count_lines(
+                    export_rejects_jsonl(dataset=bspec.name, out_path=str(base / "rejects.jsonl")), header=False
+                ),
+            )
+
+        if "export_rejects_csv" in phases:
+            _phase(
+                out,
+                "export_rejects_csv",
+                lambda: _count_lines(
+                    export_rejects_csv(dataset=bspec.name, out_path=str(base / "rejects.csv")), header=True
+                ),
+            )
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    return {
+        "spec": spec.name,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "backend": get_backend().name,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "rows": rows,
+            "width": max(width, len(spec.fields)),
+            "dirty_rate": dirty_rate,
+            "date_formats": date_formats,
+            "batch_size": batch_size,
+            "seed": seed,
+        },
+        "phases": out,
+        "total_seconds": round(sum(p["seconds"] for p in out.values()), 4),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def write_result(result: dict[str, Any], out_path: str) -> Path:
+    p = Path(out_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    return p
+
+
+def load_result(path: str) -> dict[str, Any]:
+    p = Path(path)
+    if not p.exists():
+        raise RuntimeError(f"Baseline not found: {path}")
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+def compare_results(current: dict[str, Any], baseline: dict[str, Any], *, threshold: float = 0.10) -> list[dict[str, Any]]:
+    """
+    Per-phase rows/sec vs baseline for phases present in both.
+    A phase regresses when its throughput dropped by more than `threshold` (0.10 = 10%).
+    """
+    out: list[dict[str, Any]] = []
+    for name, cur in current.get("phases", {}).items():
+        base = baseline.get("phases", {}).get(name)
+        if not base or not base.get("rows_per_sec") or not cur.get("rows_per_sec"):
+            continue
+        ratio = cur["rows_per_sec"] / base["rows_per_sec"]
+        out.append(
+            {
+                "phase": name,
+                "baseline_rows_per_sec": base["rows_per_sec"],
+                "rows_per_sec": cur["rows_per_sec"],
+                "ratio": round(ratio, 3),
+                "regressed": ratio < 1.0 - threshold,
+            }
+        )
+    return out
+
+
+def default_out_path(spec_name: str) -> str:
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return str(Path("benchmarks") / "results" / f"bench_{spec_name}_{stamp}.json")
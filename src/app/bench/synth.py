@@ -0,0 +1,110 @@
+# src/app/bench/synth.py
+from __future__ import annotations
+
+import csv
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+from app.transform_framework import DatasetSpec
+
+# Synthetic staging CSVs shaped like a DatasetSpec: one column per FieldRule.source
+# (values drawn to pass the spec's ranges / allowed sets), optional filler
+# columns up to `width`, and a configurable share of dirty values.
+
+DATE_FORMATS: dict[str, str] = {
+    "iso": "%Y-%m-%d",
+    "iso_time": "%Y-%m-%d %H:%M:%S",
+    "iso_minutes": "%Y-%m-%d %H:%M",
+    "iso_t": "%Y-%m-%dT%H:%M:%S",
+}
+
+# values every cast kind rejects (or, for str, an empty required value)
+_DIRTY: dict[str, list[str]] = {
+    "int": ["x12", "n/a", "1O"],
+    "float": ["abc", "1,2,3", "--1"],
+    "money": ["$", "12$$x", "abc"],
+    "date": ["2024-13-45", "31/31/2024", "yesterday"],
+    "str": [""],
+}
+
+_WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"]
+_EPOCH = datetime(2020, 1, 1)
+
+
+def _value_maker(spec: DatasetSpec, j: int, rnd: random.Random, date_formats: list[str]) -> Callable[[int], str]:
+    fr = spec.fields[j]
+    kind = fr.cast.lower()
+
+    for ar in spec.allowed or []:
+        if ar.field == fr.field:
+            choices = sorted(ar.allowed)
+            return lambda i: rnd.choice(choices)
+
+    lo, hi = 0, 100_000
+    for rr in spec.ranges or []:
+        if rr.field == fr.field:
+            lo = rr.min if rr.min is not None else lo
+            hi = rr.max if rr.max is not None else max(hi, lo)
+
+    if kind == "int":
+        if j == 0:
+            # first field is the PK in transform_dataset: keep it unique
+            return lambda i: str(i)
+        return lambda i: str(rnd.randint(int(lo), int(hi)))
+    if kind == "float":
+        return lambda i: repr(rnd.uniform(lo, hi))
+    if kind == "money":
+        return lambda i: f"${rnd.uniform(lo, hi):,.2f}"
+    if kind == "date":
+        fmts = [DATE_FORMATS[f] for f in date_formats]
+        return lambda i: (_EPOCH + timedelta(seconds=rnd.randrange(5 * 365 * 86400))).strftime(rnd.choice(fmts))
+    return lambda i: f"{rnd.choice(_WORDS)} {i % 5000}"
+
+
+def generate_csv(
+    spec: DatasetSpec,
+    out_path: str,
+    *,
+    rows: int,
+    width: int = 0,
+    dirty_rate: float = 0.0,
+    date_formats: list[str] | None = None,
+    seed: int = 42,
+) -> Path:
+    """
+    Writes `rows` synthetic rows for spec to out_path (header = FieldRule.source names).
+    width: total column count; extra columns (filler_1..) pad the row if width > len(spec.fields).
+    dirty_rate: share of rows with one unparseable / empty value.
+    date_formats: keys of DATE_FORMATS, mixed uniformly (default iso).
+    """
+    date_formats = date_formats or ["iso"]
+    unknown = [f for f in date_formats if f not in DATE_FORMATS]
+    if unknown:
+        raise RuntimeError(f"Unknown date format(s): {unknown} (expected {sorted(DATE_FORMATS)})")
+    if not 0.0 <= dirty_rate <= 1.0:
+        raise RuntimeError(f"dirty_rate must be between 0 and 1 (got {dirty_rate})")
+
+    rnd = random.Random(seed)
+    makers = [_value_maker(spec, j, rnd, date_formats) for j in range(len(spec.fields))]
+    kinds = [fr.cast.lower() for fr in spec.fields]
+    n_fields = len(spec.fields)
+    n_filler = max(0, width - n_fields)
+
+    header = [fr.source for fr in spec.fields] + [f"filler_{k}" for k in range(1, n_filler + 1)]
+
+    p = Path(out_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with p.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        for i in range(1, rows + 1):
+            row: list[Any] = [make(i) for make in makers]
+            if dirty_rate and rnd.random() < dirty_rate:
+                j = rnd.randrange(n_fields)
+                row[j] = rnd.choice(_DIRTY.get(kinds[j], [""]))
+            if n_filler:
+                row.extend(f"{rnd.choice(_WORDS)}-{rnd.randrange(1000)}" for _ in range(n_filler))
+            w.writerow(row)
+    return p
@@ -0,0 +1,100 @@
+# src/app/cast_memo.py
+from __future__ import annotations
+
+import sys
+from typing import Any, Callable, Iterable
+
+_MISSING = object()
+
+
+class CastMemo:
+    """
+    Bounded memo for one field's cast: raw value -> typed value.
+
+    Meant for low-cardinality columns (status, country, repeated dates):
+      - each distinct raw string is cast once,
+      - the cached typed value is returned for every repeat, so all rows share
+        one object (str results are interned),
+      - canonical() maps a raw value to the first-seen equal object, letting
+        raw columns share strings too.
+
+    Only str inputs are memoized: JSON-shredded values can also be bool / int /
+    float, and True == 1 == 1.0 would share one entry. Other inputs are cast
+    every time and canonical() returns them unchanged.
+
+    The cache stops growing at max_entries (no eviction churn). If after
+    `probe` lookups the hit rate is below min_hit_rate the memo switches
+    itself off and becomes a plain pass-through to cast.
+    """
+
+    __slots__ = ("name", "max_entries", "probe", "min_hit_rate", "enabled", "hits", "misses", "_cast", "_cache")
+
+    def __init__(
+        self,
+        name: str,
+        cast: Callable[[Any], Any],
+        *,
+        max_entries: int = 4096,
+        probe: int = 10_000,
+        min_hit_rate: float = 0.5,
+    ) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.probe = probe
+        self.min_hit_rate = min_hit_rate
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._cast = cast
+        # raw -> (canonical raw, typed)
+        self._cache: dict[Any, tuple[Any, Any]] = {}
+
+    def __call__(self, v: Any) -> Any:
+        if not self.enabled or type(v) is not str:
+            return self._cast(v)
+
+        hit = self._cache.get(v, _MISSING)
+        if hit is not _MISSING:
+            self.hits += 1
+            return hit[1]
+
+        self.misses += 1
+        tv = self._cast(v)
+        if len(self._cache) < self.max_entries:
+            if isinstance(tv, str):
+                tv = v if tv == v else sys.intern(tv)
+            self._cache[v] = (v, tv)
+        elif self.misses + self.hits >= self.probe and self.hit_rate < self.min_hit_rate:
+            self.enabled = False
+            self._cache.clear()
+        return tv
+
+    def canonical(self, v: Any) -> Any:
+        hit = self._cache.get(v, _MISSING) if self.enabled and type(v) is str else _MISSING
+        return v if hit is _MISSING else hit[0]
+
+    @property
+    def hit_rate(self) -> float:
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "field": self.name,
+            "enabled": self.enabled,
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+def is_low_cardinality(sample: Iterable[Any], *, max_distinct: int = 4096, max_ratio: float = 0.1) -> bool:
+    """
+    True when a sample's distinct count is small in absolute terms and relative to its size.
+    """
+    values = list(sample)
+    if not values:
+        return False
+    distinct = len(set(values))
+    return distinct <= max_distinct and distinct <= max_ratio * len(values)
@@ -0,0 +1,211 @@
+# src/app/catalog.py
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from app.backends import get_backend, split_table
+
+# Process-wide cache of table / column / index metadata.
+#
+# A schema is read in ONE catalog query (Backend.catalog_rows) the first time
+# any of its tables is looked up, and reused for the rest of the run (or the
+# lifetime of `ops serve`). Code that runs DDL calls invalidate(table) after
+# it; the next lookup reloads the schema.
+#
+# Lookups that miss re-read the schema once (unless it was just loaded), so a
+# table created by another process is still found without an explicit invalidate.
+
+
+@dataclass(frozen=True)
+class ColumnInfo:
+    name: str
+    type_name: str  # lower case: "nvarchar", "int", "decimal", ...
+    max_length: int | None  # characters for text, bytes for binary; None = MAX / not applicable
+    precision: int | None
+    scale: int | None
+    nullable: bool
+
+
+@dataclass(frozen=True)
+class TableInfo:
+    schema: str
+    name: str
+    columns: tuple[ColumnInfo, ...]
+    indexes: frozenset[str]  # lower-cased index names
+    primary_key: tuple[str, ...] = ()  # key columns in order; () = no primary key
+    primary_key_name: str | None = None
+    clustered: str | None = None  # clustered index (rowstore or columnstore); None = heap / not reported
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.schema}.{self.name}"
+
+    @property
+    def column_names(self) -> list[str]:
+        return [c.name for c in self.columns]
+
+    def column(self, name: str) -> ColumnInfo | None:
+        n = name.lower()
+        for c in self.columns:
+            if c.name.lower() == n:
+                return c
+        return None
+
+    def has_index(self, name: str) -> bool:
+        return name.lower() in self.indexes
+
+
+def _build(schema: str, rows: Sequence[tuple[Any, ...]]) -> dict[str, TableInfo]:
+    """
+    rows: (table, kind, name, type_name, max_length, precision, scale, nullable),
+    kind "C" (column, in column order), "I" (index; type_name = lower-case index
+    type, e.g. "clustered", or None) or "K" (primary key column, in key order;
+    type_name = constraint name).
+    """
+    cols: dict[str, list[ColumnInfo]] = {}
+    idx: dict[str, set[str]] = {}
+    pk: dict[str, list[str]] = {}
+    pk_name: dict[str, str] = {}
+    clustered: dict[str, str] = {}
+    names: dict[str, str] = {}
+    for table, kind, name, type_name, max_length, precision, scale, nullable in rows:
+        key = table.lower()
+        names.setdefault(key, table)
+        if kind == "C":
+            cols.setdefault(key, []).append(
+                ColumnInfo(
+                    name=name,
+                    type_name=(type_name or "").lower(),
+                    max_length=max_length,
+                    precision=precision,
+                    scale=scale,
+                    nullable=bool(nullable),
+                )
+            )
+        elif kind == "K":
+            pk.setdefault(key, []).append(name)
+            if type_name:
+                pk_name[key] = type_name
+        else:
+            idx.setdefault(key, set()).add(name.lower())
+            if (type_name or "").lower().startswith("clustered"):
+                clustered[key] = name
+    return {
+        key: TableInfo(
+            schema=schema,
+            name=names[key],
+            columns=tuple(c),
+            indexes=frozenset(idx.get(key, ())),
+            primary_key=tuple(pk.get(key, ())),
+            primary_key_name=pk_name.get(key),
+            clustered=clustered.get(key),
+        )
+        for key, c in cols.items()
+    }
+
+
+class Catalog:
+    """
+    Cached catalog for the configured backend. Thread-safe; see get_catalog().
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._schemas: dict[str, dict[str, TableInfo]] = {}
+        self.loads = 0
+        self.hits = 0
+
+    def _load(self, cur, schema: str) -> dict[str, TableInfo]:
+        tables = _build(schema, list(get_backend().catalog_rows(cur, schema)))
+        self.loads += 1
+        self._schemas[schema.lower()] = tables
+        return tables
+
+    def _lookup(self, cur, table: str) -> tuple[TableInfo | None, bool]:
+        """
+        (info, fresh): fresh=True when the schema was read by this call.
+        """
+        schema, name = split_table(table)
+        with self._lock:
+            tables = self._schemas.get(schema.lower())
+            if tables is None:
+                return self._load(cur, schema).get(name.lower()), True
+            info = tables.get(name.lower())
+            if info is None:
+                return self._load(cur, schema).get(name.lower()), True
+            self.hits += 1
+            return info, False
+
+    def table(self, cur, table: str) -> TableInfo | None:
+        return self._lookup(cur, table)[0]
+
+    def table_exists(self, cur, table: str) -> bool:
+        return self.table(cur, table) is not None
+
+    def columns(self, cur, table: str) -> list[str]:
+        info = self.table(cur, table)
+        return [] if info is None else info.column_names
+
+    def index_exists(self, cur, table: str, index_name: str) -> bool:
+        info, fresh = self._lookup(cur, table)
+        if info is None:
+            return False
+        if info.has_index(index_name):
+            return True
+        if fresh:
+            return False
+        # index may have been created elsewhere since the snapshot
+        self.invalidate(table)
+        info = self.table(cur, table)
+        return info is not None and info.has_index(index_name)
+
+    def input_sizes(self, cur, table: str, columns: Sequence[str]) -> list[Any] | None:
+        """
+        Parameter sizes for an INSERT into `columns` of `table` (Backend.input_sizes),
+        or None when the table or a column is unknown / the backend does not use them.
+        """
+        info = self.table(cur, table)
+        if info is None:
+            return None
+        picked = [info.column(c) for c in columns]
+        if any(c is None for c in picked):
+            return None
+        return get_backend().input_sizes(picked)
+
+    def invalidate(self, table: str | None = None) -> None:
+        """
+        Drops the cached schema of `table` (all schemas when None). Call after DDL.
+        """
+        with self._lock:
+            if table is None:
+                self._schemas.clear()
+            else:
+                schema, _name = split_table(table)
+                self._schemas.pop(schema.lower(), None)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "schemas": sorted(self._schemas),
+                "tables": sum(len(t) for t in self._schemas.values()),
+                "loads": self.loads,
+                "hits": self.hits,
+            }
+
+
+_catalogs: dict[str, Catalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog() -> Catalog:
+    """
+    Shared catalog for the active backend (one per process and backend).
+    """
+    name = get_backend().name
+    with _catalogs_lock:
+        cat = _catalogs.get(name)
+        if cat is None:
+            cat = _catalogs[name] = Catalog()
+        return cat
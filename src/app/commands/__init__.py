@@ -0,0 +1,397 @@
+# src/app/commands/__init__.py
+from __future__ import annotations
+
+import argparse
+from importlib import import_module
+from typing import Any, Callable, NamedTuple
+
+# Command registry for ops_cli.
+#
+# Each command declares its arguments here and names its handler as
+# "module:function". Building the parser imports nothing else; the handler
+# module (and everything it pulls in: backends, pandas, repos...) is only
+# imported when that command is dispatched. Keep this module stdlib-only
+# (NamedTuple rather than dataclasses: the latter costs ~15 ms of imports).
+
+
+class Arg(NamedTuple):
+    flags: tuple[str, ...]
+    kwargs: dict[str, Any]
+
+
+def arg(*flags: str, **kwargs: Any) -> Arg:
+    return Arg(flags=flags, kwargs=kwargs)
+
+
+class Command(NamedTuple):
+    name: str
+    help: str
+    handler: str  # "app.commands.people:cmd_add_person"
+    args: tuple[Arg, ...] = ()
+
+    def resolve(self) -> Callable[[argparse.Namespace], int]:
+        module, func = self.handler.split(":", 1)
+        return getattr(import_module(module), func)
+
+
+_CONFIRM_HELP = 'Confirmation string, e.g. "DROP_CREATE dbo.stage_people"'
+
+COMMANDS: list[Command] = [
+    Command("ping", "Smoke test command", "app.commands.basic:cmd_ping"),
+    Command("show_config", "Print loaded DB config (sanity check)", "app.commands.basic:cmd_show_config"),
+    Command("migrate", "Apply pending SQL migrations", "app.commands.basic:cmd_migrate"),
+    Command("count_raw", "Count rows in dbo.raw_orders", "app.commands.basic:cmd_count_raw"),
+    # people CRUD
+    Command(
+        "add_person",
+        "Add a person to dbo.people",
+        "app.commands.people:cmd_add_person",
+        (arg("--name", required=True, help="Full name"),),
+    ),
+    Command(
+        "list_people",
+        "List people from dbo.people",
+        "app.commands.people:cmd_list_people",
+        (arg("--top", type=int, default=20, help="How many rows to show"),),
+    ),
+    Command(
+        "find_person",
+        "Find people by name substring",
+        "app.commands.people:cmd_find_person",
+        (
+            arg("--like", required=True, help="Substring to search for"),
+            arg("--top", type=int, default=20, help="How many rows to show"),
+        ),
+    ),
+    Command(
+        "get_person",
+        "Get one person by id",
+        "app.commands.people:cmd_get_person",
+        (arg("--id", type=int, required=True, help="person_id to fetch"),),
+    ),
+    Command(
+        "update_person",
+        "Update a person's name by id",
+        "app.commands.people:cmd_update_person",
+        (
+            arg("--id", type=int, required=True, help="person_id to update"),
+            arg("--name", required=True, help="New full name"),
+        ),
+    ),
+    Command(
+        "delete_person",
+        "Delete person by id",
+        "app.commands.people:cmd_delete_person",
+        (arg("--id", type=int, required=True, help="person_id to delete"),),
+    ),
+    # people batch CRUD
+    Command(
+        "add_people",
+        "Add people to dbo.people from a file (one name per line)",
+        "app.commands.people:cmd_add_people",
+        (
+            arg("--file", required=True, help="Text file, one full name per line"),
+            arg("--chunk-size", type=int, default=1000, help="Rows per committed transaction"),
+        ),
+    ),
+    Command(
+        "update_people",
+        "Rename people from a CSV of person_id,full_name",
+        "app.commands.people:cmd_update_people",
+        (
+            arg("--file", required=True, help="CSV with person_id,full_name (header optional)"),
+            arg("--chunk-size", type=int, default=1000, help="Rows per committed transaction"),
+        ),
+    ),
+    Command(
+        "delete_people",
+        "Delete people by the ids listed in a file",
+        "app.commands.people:cmd_delete_people",
+        (
+            arg("--file", required=True, help="File of person_ids (whitespace or comma separated)"),
+            arg("--chunk-size", type=int, default=1000, help="Ids per committed transaction"),
+        ),
+    ),
+    # export / import
+    Command(
+        "export_people",
+        "Export dbo.people to CSV",
+        "app.commands.people:cmd_export_people",
+        (
+            arg("--out", required=True, help="Output CSV path (e.g. .\\exports\\people.csv)"),
+            arg("--top", type=int, default=0, help="If >0, export only top N"),
+        ),
+    ),
+    Command(
+        "import_people",
+        "Import dbo.people from CSV",
+        "app.commands.people:cmd_import_people",
+        (arg("--in", dest="in_path", required=True, help="Input CSV path (e.g. .\\exports\\people.csv)"),),
+    ),
+    Command(
+        "people_trigrams_rebuild",
+        "Rebuild dbo.people_name_trigrams (find_person index) from dbo.people",
+        "app.commands.people:cmd_people_trigrams_rebuild",
+        (arg("--batch-size", type=int, default=10_000, help="People per committed batch"),),
+    ),
+    # generic load csv -> staging
+    Command(
+        "load_csv",
+        "Load a CSV into a staging table (NVARCHAR)",
+        "app.commands.etl:cmd_load_csv",
+        (
+            arg("--csv", dest="csv_path", required=True, help="Path to CSV file"),
+            arg("--table", required=True, help="Target table (e.g. dbo.stage_people)"),
+            arg("--batch-size", type=int, default=2000, help="Rows per batch commit"),
+            arg("--drop-create", action="store_true", help="Drop & recreate table before load (requires confirm)"),
+            arg("--truncate", action="store_true", help="Truncate table before load (requires confirm)"),
+            arg("--delimiter", default=",", help="CSV delimiter (default ,)"),
+            arg("--quotechar", default='"', help='CSV quote char (default ")'),
+            arg("--skiprows", type=int, default=0, help="Rows to skip before header"),
+            arg("--match-mode", choices=["strict", "set"], default="strict", help="Column match mode when not recreating"),
+            arg("--require-confirm", dest="confirm", default=None, help=_CONFIRM_HELP),
+        ),
+    ),
+    # JSON lines -> raw payload table
+    Command(
+        "load_jsonl",
+        "Stream a JSONL file (optionally .gz/.bz2/.xz) into a JSON payload table",
+        "app.commands.etl:cmd_load_jsonl",
+        (
+            arg("--jsonl", dest="jsonl_path", required=True, help="Path to the JSONL file"),
+            arg("--table", default="dbo.raw_orders", help="Target table (default dbo.raw_orders)"),
+            arg("--column", default="payload_json", help="Payload column (default payload_json)"),
+            arg("--batch-size", type=int, default=2000, help="Lines per batch commit"),
+            arg("--compression", choices=["auto", "none", "gzip", "bz2", "xz"], default="auto", help="Default: by file suffix"),
+            arg("--no-resume", dest="resume", action="store_false", help="Start at byte 0 instead of the saved checkpoint"),
+            arg("--dataset", default=None, help="dataset_name for rejected lines (default: table name)"),
+        ),
+    ),
+    # generic table tools
+    Command(
+        "count_table",
+        "Count rows in any table (from partition stats unless --exact) and show its size",
+        "app.commands.basic:cmd_count_table",
+        (
+            arg("--table", required=True, help="Table name (e.g. dbo.stage_people)"),
+            arg("--exact", action="store_true", help="SELECT COUNT(*) instead of reading partition stats"),
+        ),
+    ),
+    Command(
+        "truncate_table",
+        "TRUNCATE a table (requires confirmation)",
+        "app.commands.basic:cmd_truncate_table",
+        (
+            arg("--table", required=True, help="Full table name, e.g. dbo.stage_people"),
+            arg("--require-confirm", dest="confirm", required=True, help='Must equal: "TRUNCATE <table>"'),
+            arg("--exact", action="store_true", help="COUNT(*) rows_before instead of reading partition stats"),
+        ),
+    ),
+    Command(
+        "clear_stage_people",
+        "Delete all rows from dbo.stage_people (TRUNCATE, or chunked deletes)",
+        "app.commands.basic:cmd_clear_stage_people",
+        (
+            arg("--chunk-size", type=int, default=None, help="DELETE this many rows per commit instead of TRUNCATE"),
+            arg("--exact", action="store_true", help="COUNT(*) the rows before TRUNCATE instead of reading partition stats"),
+        ),
+    ),
+    # old promoter path
+    Command(
+        "promote_people",
+        "Promote dbo.stage_people -> dbo.people_typed (with rejects)",
+        "app.commands.etl:cmd_promote_people",
+        (
+            arg(
+                "--from",
+                dest="from_table",
+                default="dbo.stage_people",
+                help="Staging table (default dbo.stage_people)",
+            ),
+        ),
+    ),
+    # spec-based typed table + transform
+    Command("ensure_people_final", "Create/ensure dbo.people_typed from PEOPLE spec", "app.commands.etl:cmd_ensure_people_final"),
+    Command(
+        "transform_people",
+        "Transform dbo.stage_people -> dbo.people_typed + dataset_rejects",
+        "app.commands.etl:cmd_transform_people",
+        (
+            arg("--source-file", default=None, help="Optional source filename to store in dataset_rejects"),
+            arg("--truncate-final", action="store_true", help="TRUNCATE final table before insert"),
+            arg("--truncate-rejects", action="store_true", help="Clear rejects for this dataset before insert"),
+            arg(
+                "--pk-mode",
+                choices=["server", "client"],
+                default="server",
+                help="Insert-if-missing: server NOT EXISTS probe, or client-side key bitmap (int PK only)",
+            ),
+            arg("--swap", action="store_true", help="Full reload into a shadow table, then swap it in atomically"),
+            arg(
+                "--reload-partitions",
+                action="store_true",
+                help="Replace only the date partitions present in the input (partitioned specs)",
+            ),
+        ),
+    ),
+    # any registered spec
+    Command(
+        "ensure_final",
+        "Create/ensure a spec's final table and indexes",
+        "app.commands.etl:cmd_ensure_final",
+        (arg("--spec", required=True, help="Dataset spec (e.g. orders)"),),
+    ),
+    Command(
+        "transform",
+        "Transform a spec's staging table -> final table + dataset_rejects",
+        "app.commands.etl:cmd_transform",
+        (
+            arg("--spec", required=True, help="Dataset spec (e.g. orders)"),
+            arg("--source-file", default=None, help="Optional source filename to store in dataset_rejects"),
+            arg("--batch-size", type=int, default=1000, help="Rows per batch commit"),
+            arg("--truncate-rejects", action="store_true", help="Clear rejects for this dataset before insert"),
+            arg("--pk-mode", choices=["server", "client"], default="server", help="Insert-if-missing mode (see transform_people)"),
+            arg("--pushdown", action="store_true", help="JSON payload specs: set-based OPENJSON transform on the server"),
+            arg("--key-column", default="id", help="With --pushdown: staging key to chunk by (default id)"),
+            arg("--chunk-rows", type=int, default=100_000, help="With --pushdown: key range per transaction"),
+            arg("--print-sql", action="store_true", help="With --pushdown: print the generated SQL and exit"),
+        ),
+    ),
+    # rejects inspection
+    Command(
+        "rejects_count",
+        "Count rejects for a dataset",
+        "app.commands.rejects:cmd_rejects_count",
+        (
+            arg("--dataset", required=True, help="Dataset name (e.g. people)"),
+            arg("--exact", action="store_true", help="COUNT(*) dataset_rejects instead of reading the summary"),
+        ),
+    ),
+    Command(
+        "rejects_summary",
+        "Reject counts by reason / day / source file from dbo.dataset_rejects_summary",
+        "app.commands.rejects:cmd_rejects_summary",
+        (
+            arg("--dataset", default=None, help="Dataset name (default: all)"),
+            arg("--by", choices=["reason", "day", "source"], default="reason", help="Grouping (default reason)"),
+            arg("--days", type=int, default=None, help="Only the last N days (UTC)"),
+            arg("--source-file", default=None, help="Only this source_file"),
+            arg("--rebuild", action="store_true", help="Recompute the summary from dataset_rejects first"),
+        ),
+    ),
+    Command(
+        "rejects_show",
+        "Show recent rejects for a dataset",
+        "app.commands.rejects:cmd_rejects_show",
+        (
+            arg("--dataset", required=True, help="Dataset name (e.g. people)"),
+            arg("--top", type=int, default=20, help="How many rows to show"),
+        ),
+    ),
+    Command(
+        "rejects_compress",
+        "Compress existing dataset_rejects payloads into raw_json_z (batched) and report the space saved",
+        "app.commands.rejects:cmd_rejects_compress",
+        (
+            arg("--dataset", default=None, help="Dataset name (default: all)"),
+            arg("--batch-size", type=int, default=5000, help="Rows per committed batch"),
+            arg("--report-only", action="store_true", help="Only print current raw_json / raw_json_z storage"),
+        ),
+    ),
+    Command("db_ping", "Connect to SQL Server and run SELECT 1", "app.commands.basic:cmd_db_ping"),
+    Command(
+        "rejects_export",
+        "Export <dataset>_rejects table to JSONL",
+        "app.commands.rejects:cmd_rejects_export",
+        (
+            arg("--dataset", required=True, help="Dataset name (e.g. people)"),
+            arg("--out", required=True, help="Output path (e.g. .\\exports\\people_rejects.jsonl)"),
+            arg("--top", type=int, default=0, help="If >0, export only top N"),
+        ),
+    ),
+    Command(
+        "rejects_export_csv",
+        "Export <dataset>_rejects table to CSV",
+        "app.commands.rejects:cmd_rejects_export_csv",
+        (
+            arg("--dataset", required=True, help="Dataset name (e.g. people)"),
+            arg("--out", required=True, help="Output path (e.g. .\\exports\\people_rejects.csv)"),
+            arg("--top", type=int, default=0, help="If >0, export only top N"),
+        ),
+    ),
+    # one-pass CSV -> typed table + rejects (no staging round trip)
+    Command(
+        "pipeline",
+        "Stream a CSV through a spec straight into its final table + dataset_rejects",
+        "app.commands.etl:cmd_pipeline",
+        (
+            arg("--spec", required=True, help="Dataset spec (e.g. people)"),
+            arg("--csv", dest="csv_path", required=True, help="Path to CSV file"),
+            arg("--source-file", default=None, help="source_file stored in dataset_rejects (default: CSV path)"),
+            arg("--batch-size", type=int, default=2000, help="Rows per batch commit"),
+            arg("--delimiter", default=",", help="CSV delimiter (default ,)"),
+            arg("--quotechar", default='"', help='CSV quote char (default ")'),
+            arg("--skiprows", type=int, default=0, help="Rows to skip before header"),
+            arg("--truncate-final", action="store_true", help="TRUNCATE final table before insert"),
+            arg("--truncate-rejects", action="store_true", help="Clear rejects for this dataset before insert"),
+            arg("--pk-mode", choices=["server", "client"], default="server", help="Insert-if-missing mode (see transform_people)"),
+            arg("--stage", action="store_true", help="Also keep a raw copy in the spec's staging table (requires confirm)"),
+            arg("--require-confirm", dest="confirm", default=None, help='With --stage: "DROP_CREATE <stg_table>"'),
+            arg("--swap", action="store_true", help="Full reload into a shadow table, then swap it in atomically"),
+            arg(
+                "--reload-partitions",
+                action="store_true",
+                help="Replace only the date partitions present in the input (partitioned specs)",
+            ),
+        ),
+    ),
+    # continuous ingestion
+    Command(
+        "serve",
+        "Watch a directory and ingest completed CSVs through the pipeline",
+        "app.commands.etl:cmd_serve",
+        (
+            arg("--watch", required=True, help="Drop directory to watch"),
+            arg("--spec", required=True, help="Dataset spec for every file"),
+            arg("--workers", type=int, default=4, help="Worker threads (one pooled connection each)"),
+            arg("--pattern", default="*.csv", help="Glob for files to pick up (default *.csv)"),
+            arg("--ready", choices=["stable", "done"], default="stable", help="stable size/mtime, or <file>.done marker"),
+            arg("--stable-seconds", type=float, default=5.0, help="With --ready stable: seconds without change"),
+            arg("--poll-seconds", type=float, default=2.0, help="Directory scan interval"),
+            arg("--batch-size", type=int, default=2000, help="Rows per batch commit"),
+            arg("--pk-mode", choices=["server", "client"], default="server", help="Insert-if-missing mode"),
+            arg("--processed-dir", default=None, help="Default <watch>/processed"),
+            arg("--failed-dir", default=None, help="Default <watch>/failed"),
+            arg("--once", action="store_true", help="Exit once the directory is drained"),
+        ),
+    ),
+    # end-to-end benchmark on synthetic data
+    Command(
+        "bench",
+        "Benchmark load/cast/transform/export on a synthetic CSV",
+        "app.commands.bench:cmd_bench",
+        (
+            arg("--spec", default="people", help="Dataset spec to generate data for"),
+            arg("--rows", type=int, default=100_000, help="Synthetic rows to generate"),
+            arg("--width", type=int, default=0, help="Total CSV columns (filler columns pad past the spec fields)"),
+            arg("--dirty-rate", type=float, default=0.02, help="Share of rows with one bad value (0..1)"),
+            arg("--date-formats", default="iso", help="Comma list: iso,iso_time,iso_minutes,iso_t"),
+            arg("--batch-size", type=int, default=2000, help="Batch size for load_csv / transform"),
+            arg("--seed", type=int, default=42),
+            arg("--phases", default=None, help="Comma list of phases to run (default all)"),
+            arg("--out", default=None, help="Result JSON path (default benchmarks/results/bench_<spec>_<ts>.json)"),
+            arg("--baseline", default=None, help="Earlier result JSON to compare rows/sec against"),
+            arg("--threshold", type=float, default=0.10, help="Allowed rows/sec drop vs baseline (0.10 = 10%%)"),
+        ),
+    ),
+]
+
+COMMANDS_BY_NAME: dict[str, Command] = {c.name: c for c in COMMANDS}
+
+
+def add_subparsers(p: argparse.ArgumentParser) -> None:
+    sub = p.add_subparsers(dest="cmd", required=True)
+    for c in COMMANDS:
+        sp = sub.add_parser(c.name, help=c.help)
+        for a in c.args:
+            sp.add_argument(*a.flags, **a.kwargs)
@@ -0,0 +1,73 @@
+# src/app/commands/basic.py
+from __future__ import annotations
+
+import argparse
+
+
+def cmd_ping(args: argparse.Namespace) -> int:
+    print("pong ✅")
+    return 0
+
+
+def cmd_show_config(args: argparse.Namespace) -> int:
+    from app.config import get_db_config
+
+    cfg = get_db_config()
+    print(cfg)
+    return 0
+
+
+def cmd_migrate(args: argparse.Namespace) -> int:
+    from app.migrations.runner import apply_migrations
+
+    n = apply_migrations()
+    print(f"migrate ✅ applied={n}")
+    return 0
+
+
+def cmd_count_raw(args: argparse.Namespace) -> int:
+    from app.raw_repo import count_raw_orders
+
+    n = count_raw_orders()
+    print(f"raw_orders ✅ count={n}")
+    return 0
+
+
+def cmd_db_ping(args: argparse.Namespace) -> int:
+    from app.db import get_conn
+
+    with get_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT 1;")
+        row = cur.fetchone()
+        conn.commit()
+
+    print(f"db ✅ ok={row[0]}")
+    return 0
+
+
+def cmd_count_table(args: argparse.Namespace) -> int:
+    from app.table_stats import get_table_stats
+
+    st = get_table_stats(args.table, exact=args.exact)
+    size = ""
+    if st.used_pages is not None:
+        size = f" used_pages={st.used_pages} used_mb={st.used_mb:.1f} reserved_mb={st.reserved_mb:.1f}"
+    print(f"table ✅ {args.table} count={st.rows} exact={int(st.exact)}{size}")
+    return 0
+
+
+def cmd_truncate_table(args: argparse.Namespace) -> int:
+    from app.table_tools import truncate_table
+
+    before = truncate_table(table=args.table, confirm=args.confirm, exact=args.exact)
+    print(f"table ✅ truncated={args.table} rows_before={before}")
+    return 0
+
+
+def cmd_clear_stage_people(args: argparse.Namespace) -> int:
+    from app.stage_repo import clear_stage_people
+
+    n = clear_stage_people(chunk_size=args.chunk_size, exact=args.exact)
+    print(f"stage_people ✅ cleared={n}")
+    return 0
@@ -0,0 +1,41 @@
+# src/app/commands/bench.py
+from __future__ import annotations
+
+import argparse
+
+from app.bench.suite import PHASES, compare_results, default_out_path, load_result, missing_tables, run_bench, write_result
+from app.specs import get_spec
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    missing = missing_tables()
+    if missing:
+        print(f"bench ❌ missing={','.join(missing)} run `ops migrate` first")
+        return 1
+    phases = [ph.strip() for ph in args.phases.split(",") if ph.strip()] if args.phases else list(PHASES)
+    result = run_bench(
+        get_spec(args.spec),
+        rows=args.rows,
+        width=args.width,
+        dirty_rate=args.dirty_rate,
+        date_formats=[f.strip() for f in args.date_formats.split(",") if f.strip()],
+        batch_size=args.batch_size,
+        seed=args.seed,
+        phases=phases,
+    )
+    path = write_result(result, args.out or default_out_path(args.spec))
+    print(f"bench ✅ total_seconds={result['total_seconds']} peak_rss_mb={result['peak_rss_mb']} out={path}")
+
+    if args.baseline:
+        rows = compare_results(result, load_result(args.baseline), threshold=args.threshold)
+        regressed = [r for r in rows if r["regressed"]]
+        for r in rows:
+            mark = "❌" if r["regressed"] else "✅"
+            print(
+                f"bench {mark} phase={r['phase']} rows_per_sec={r['rows_per_sec']} "
+                f"baseline={r['baseline_rows_per_sec']} ratio={r['ratio']}"
+            )
+        if regressed:
+            print(f"bench ❌ regressed={len(regressed)} threshold={args.threshold}")
+            return 1
+    return 0
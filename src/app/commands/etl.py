@@ -0,0 +1,152 @@
+# src/app/commands/etl.py
+from __future__ import annotations
+
+import argparse
+
+from app.specs import get_spec
+
+
+def cmd_load_csv(args: argparse.Namespace) -> int:
+    from app.loaders.csv_loader import load_csv
+
+    load_csv(
+        csv_path=args.csv_path,
+        table=args.table,
+        batch_size=args.batch_size,
+        drop_and_recreate=args.drop_create,
+        truncate=args.truncate,
+        delimiter=args.delimiter,
+        quotechar=args.quotechar,
+        skiprows=args.skiprows,
+        match_mode=args.match_mode,
+        confirm=args.confirm,
+    )
+    return 0
+
+
+def cmd_load_jsonl(args: argparse.Namespace) -> int:
+    from app.loaders.jsonl_loader import load_jsonl
+
+    load_jsonl(
+        path=args.jsonl_path,
+        table=args.table,
+        column=args.column,
+        batch_size=args.batch_size,
+        compression=args.compression,
+        resume=bool(args.resume),
+        dataset=args.dataset,
+    )
+    return 0
+
+
+def cmd_promote_people(args: argparse.Namespace) -> int:
+    from app.promoters.people_promoter import promote_people
+
+    good, bad = promote_people(args.from_table)
+    print(f"people ✅ promoted good={good} rejected={bad}")
+    return 0
+
+
+def cmd_ensure_people_final(args: argparse.Namespace) -> int:
+    from app.transform_schema import ensure_final_table_from_spec
+
+    ensure_final_table_from_spec(get_spec("people"))
+    return 0
+
+
+def cmd_transform_people(args: argparse.Namespace) -> int:
+    from app.transform_framework import transform_dataset
+
+    transform_dataset(
+        get_spec("people"),
+        source_file=args.source_file,
+        truncate_final=bool(args.truncate_final),
+        truncate_rejects=bool(args.truncate_rejects),
+        pk_mode=args.pk_mode,
+        swap=bool(args.swap),
+        reload_partitions=bool(args.reload_partitions),
+    )
+    return 0
+
+
+def cmd_ensure_final(args: argparse.Namespace) -> int:
+    from app.transform_schema import ensure_final_table_from_spec
+
+    ensure_final_table_from_spec(get_spec(args.spec))
+    return 0
+
+
+def cmd_transform(args: argparse.Namespace) -> int:
+    spec = get_spec(args.spec)
+    if args.print_sql:
+        from app.config import get_rejects_config
+        from app.json_pushdown import openjson_sql
+
+        compress = get_rejects_config().compress != "off"
+        for sql in openjson_sql(spec, key_column=args.key_column, compress=compress):
+            print(sql.strip() + "\n")
+        return 0
+    if args.pushdown:
+        from app.json_pushdown import pushdown_transform
+
+        pushdown_transform(
+            spec,
+            source_file=args.source_file,
+            key_column=args.key_column,
+            chunk_rows=args.chunk_rows,
+            truncate_rejects=bool(args.truncate_rejects),
+        )
+        return 0
+
+    from app.transform_framework import transform_dataset
+
+    transform_dataset(
+        spec,
+        source_file=args.source_file,
+        truncate_rejects=bool(args.truncate_rejects),
+        batch_size=args.batch_size,
+        pk_mode=args.pk_mode,
+    )
+    return 0
+
+
+def cmd_pipeline(args: argparse.Namespace) -> int:
+    from app.pipeline import run_pipeline
+
+    run_pipeline(
+        get_spec(args.spec),
+        csv_path=args.csv_path,
+        source_file=args.source_file,
+        batch_size=args.batch_size,
+        delimiter=args.delimiter,
+        quotechar=args.quotechar,
+        skiprows=args.skiprows,
+        truncate_final=bool(args.truncate_final),
+        truncate_rejects=bool(args.truncate_rejects),
+        pk_mode=args.pk_mode,
+        stage=bool(args.stage),
+        confirm=args.confirm,
+        swap=bool(args.swap),
+        reload_partitions=bool(args.reload_partitions),
+    )
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    from app.daemon import IngestDaemon, serve
+
+    daemon = IngestDaemon(
+        get_spec(args.spec),
+        args.watch,
+        workers=args.workers,
+        pattern=args.pattern,
+        ready=args.ready,
+        stable_seconds=args.stable_seconds,
+        poll_seconds=args.poll_seconds,
+        batch_size=args.batch_size,
+        pk_mode=args.pk_mode,
+        processed_dir=args.processed_dir,
+        failed_dir=args.failed_dir,
+    )
+    st = serve(daemon, once=bool(args.once))
+    return 1 if st["files_failed"] else 0
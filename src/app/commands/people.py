@@ -0,0 +1,166 @@
+# src/app/commands/people.py
+from __future__ import annotations
+
+import argparse
+import csv
+import re
+from pathlib import Path
+
+from app.people_repo import (
+    add_people,
+    add_person,
+    delete_people,
+    delete_person,
+    find_people,
+    get_person,
+    list_people,
+    update_people,
+    update_person_name,
+)
+
+
+def _print_people_rows(rows: list[tuple[int, str, str]]) -> None:
+    if not rows:
+        print("people ✅ empty")
+        return
+    print("person_id | full_name | created_at")
+    print("-" * 60)
+    for pid, name, created in rows:
+        print(f"{pid} | {name} | {created}")
+
+
+def cmd_add_person(args: argparse.Namespace) -> int:
+    new_id = add_person(args.name)
+    print(f"people ✅ inserted person_id={new_id}")
+    return 0
+
+
+def cmd_list_people(args: argparse.Namespace) -> int:
+    _print_people_rows(list_people(args.top))
+    return 0
+
+
+def cmd_find_person(args: argparse.Namespace) -> int:
+    rows = find_people(args.like, args.top)
+    if not rows:
+        print("people ✅ no matches")
+        return 0
+    _print_people_rows(rows)
+    return 0
+
+
+def cmd_get_person(args: argparse.Namespace) -> int:
+    row = get_person(args.id)
+    if row is None:
+        print(f"people ✅ not found id={args.id}")
+        return 0
+    pid, name, created = row
+    print("person_id | full_name | created_at")
+    print("-" * 60)
+    print(f"{pid} | {name} | {created}")
+    return 0
+
+
+def cmd_update_person(args: argparse.Namespace) -> int:
+    if args.id <= 0:
+        raise SystemExit("id must be a positive integer")
+    updated = update_person_name(args.id, args.name)
+    print(f"people ✅ updated={updated} id={args.id}")
+    return 0
+
+
+def cmd_delete_person(args: argparse.Namespace) -> int:
+    if args.id <= 0:
+        raise SystemExit("id must be a positive integer")
+    deleted = delete_person(args.id)
+    print(f"people ✅ deleted={deleted} id={args.id}")
+    return 0
+
+
+def cmd_export_people(args: argparse.Namespace) -> int:
+    from app.exporters.people_exporter import export_people_csv
+
+    top = args.top if args.top and args.top > 0 else None
+    path = export_people_csv(args.out, top=top)
+    print(f"people ✅ exported={path}")
+    return 0
+
+
+def cmd_import_people(args: argparse.Namespace) -> int:
+    from app.importers.people_importer import import_people_csv
+
+    stats = import_people_csv(args.in_path)
+    throttled = f" throttled={stats['throttled_seconds']}s" if stats["throttled_seconds"] else ""
+    print(f"people ✅ import read={stats['read']} inserted={stats['inserted']} skipped={stats['skipped']}{throttled}")
+    return 0
+
+
+def cmd_people_trigrams_rebuild(args: argparse.Namespace) -> int:
+    from app.people_search import rebuild_trigrams
+
+    stats = rebuild_trigrams(batch_size=args.batch_size)
+    print(f"people ✅ trigrams_rebuilt people={stats['people']} trigrams={stats['trigrams']}")
+    return 0
+
+
+# ---------- Batch (ids / names / pairs from a file) ----------
+def _open_input(path: str):
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"Input file not found: {p}")
+    return p.open("r", newline="", encoding="utf-8-sig")
+
+
+def _read_names(path: str) -> list[str]:
+    # one name per line; blank lines skipped
+    with _open_input(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def _read_ids(path: str) -> list[int]:
+    # ids separated by whitespace and/or commas
+    with _open_input(path) as f:
+        tokens = [t for t in re.split(r"[\s,]+", f.read()) if t]
+    try:
+        ids = [int(t) for t in tokens]
+    except ValueError as e:
+        raise SystemExit(f"not a person_id: {e}")
+    if any(i <= 0 for i in ids):
+        raise SystemExit("ids must be positive integers")
+    return ids
+
+
+def _read_pairs(path: str) -> list[tuple[int, str]]:
+    # CSV person_id,full_name; a header row is optional
+    pairs: list[tuple[int, str]] = []
+    with _open_input(path) as f:
+        for n, row in enumerate(csv.reader(f), start=1):
+            if not row or not "".join(row).strip():
+                continue
+            if n == 1 and row[0].strip().lower() == "person_id":
+                continue
+            if len(row) < 2 or not row[0].strip().isdigit() or not row[1].strip():
+                raise SystemExit(f"line {n}: expected person_id,full_name")
+            pairs.append((int(row[0]), row[1].strip()))
+    return pairs
+
+
+def cmd_add_people(args: argparse.Namespace) -> int:
+    ids = add_people(_read_names(args.file), chunk_size=args.chunk_size)
+    span = f" first_id={ids[0]} last_id={ids[-1]}" if ids else ""
+    print(f"people ✅ inserted={len(ids)}{span}")
+    return 0
+
+
+def cmd_delete_people(args: argparse.Namespace) -> int:
+    ids = _read_ids(args.file)
+    deleted = delete_people(ids, chunk_size=args.chunk_size)
+    print(f"people ✅ deleted={deleted} requested={len(ids)}")
+    return 0
+
+
+def cmd_update_people(args: argparse.Namespace) -> int:
+    pairs = _read_pairs(args.file)
+    updated = update_people(pairs, chunk_size=args.chunk_size)
+    print(f"people ✅ updated={updated} requested={len(pairs)}")
+    return 0
@@ -0,0 +1,88 @@
+# src/app/commands/rejects.py
+from __future__ import annotations
+
+import argparse
+
+
+def cmd_rejects_count(args: argparse.Namespace) -> int:
+    from app.rejects_repo import count_rejects_from
+
+    n, source = count_rejects_from(args.dataset, exact=args.exact)
+    print(f"rejects ✅ dataset={args.dataset} count={n} from={source}")
+    return 0
+
+
+def cmd_rejects_summary(args: argparse.Namespace) -> int:
+    from app.rejects_summary import read_summary, rebuild_summary
+
+    if args.rebuild:
+        n = rebuild_summary(args.dataset)
+        print(f"rejects_summary ✅ rebuilt dataset={args.dataset or '*'} rejects_scanned={n}")
+
+    rows = read_summary(args.dataset, by=args.by, days=args.days, source_file=args.source_file)
+    if not rows:
+        print(f"rejects_summary ✅ dataset={args.dataset or '*'} empty")
+        return 0
+
+    for r in rows:
+        print(
+            f"dataset={r['dataset']} {args.by}={r[args.by] if r[args.by] != '' else '-'} count={r['count']} "
+            f"days={r['first_day']}..{r['last_day']}"
+        )
+    return 0
+
+
+def cmd_rejects_show(args: argparse.Namespace) -> int:
+    from app.rejects_repo import list_rejects
+
+    rows = list_rejects(args.dataset, top=args.top)
+    if not rows:
+        print(f"rejects ✅ dataset={args.dataset} empty")
+        return 0
+
+    for r in rows:
+        print("-" * 60)
+        print(f"row_num={r['row_num']} source_file={r['source_file']}")
+        print(f"reasons={r['reasons']}")
+        print(f"raw={r['raw']}")
+    return 0
+
+
+def _mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.2f}"
+
+
+def cmd_rejects_compress(args: argparse.Namespace) -> int:
+    from app.reject_store import compress_existing, storage_report
+
+    if not args.report_only:
+        r = compress_existing(args.dataset, batch_size=args.batch_size)
+        saved = r["bytes_before"] - r["bytes_after"]
+        pct = 100.0 * saved / r["bytes_before"] if r["bytes_before"] else 0.0
+        print(
+            f"rejects_compress ✅ rows={r['rows']} batches={r['batches']} "
+            f"before_mb={_mb(r['bytes_before'])} after_mb={_mb(r['bytes_after'])} saved_pct={pct:.1f}"
+        )
+
+    st = storage_report(args.dataset)
+    print(
+        f"rejects_storage ✅ dataset={args.dataset or '*'} rows={st['rows']} compressed={st['compressed']} "
+        f"raw_json_mb={_mb(st['raw_json_bytes'])} raw_json_z_mb={_mb(st['raw_json_z_bytes'])}"
+    )
+    return 0
+
+
+def cmd_rejects_export(args: argparse.Namespace) -> int:
+    from app.exporters.rejects_exporter import export_rejects_jsonl
+
+    path = export_rejects_jsonl(dataset=args.dataset, out_path=args.out, top=args.top)
+    print(f"rejects ✅ exported={path}")
+    return 0
+
+
+def cmd_rejects_export_csv(args: argparse.Namespace) -> int:
+    from app.exporters.rejects_exporter import export_rejects_csv
+
+    path = export_rejects_csv(dataset=args.dataset, out_path=args.out, top=args.top)
+    print(f"rejects ✅ exported_csv={path}")
+    return 0
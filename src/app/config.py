@@ -2,9 +2,22 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from dotenv import load_dotenv
 
-load_dotenv()  # loads .env from project root if present
+_env_loaded = False
+
+
+def _load_env() -> None:
+    """
+    Loads .env from the project root (if present) on first config access,
+    so commands that never read config (ping, --help) skip python-dotenv.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
 
 @dataclass(frozen=True)
@@ -23,6 +36,7 @@ def _get_bool(name: str, default: bool = False) -> bool:
 
 
 def get_db_config() -> DbConfig:
+    _load_env()
     driver = os.getenv("MSSQL_DRIVER", "ODBC Driver 18 for SQL Server")
     server = os.getenv("MSSQL_SERVER", "")
     database = os.getenv("MSSQL_DATABASE", "")
@@ -35,3 +49,128 @@ def get_db_config() -> DbConfig:
 
     return DbConfig(driver=driver, server=server, database=database, trusted=trusted)
 
+
+@dataclass(frozen=True)
+class SqliteConfig:
+    path: str
+
+
+def get_backend_name() -> str:
+    """
+    OPS_DB_BACKEND: "mssql" (default) or "sqlite" (local stand-in for benchmarks/tests).
+    """
+    _load_env()
+    return os.getenv("OPS_DB_BACKEND", "mssql").strip().lower()
+
+
+def get_sqlite_config() -> SqliteConfig:
+    _load_env()
+    return SqliteConfig(path=os.getenv("OPS_SQLITE_PATH", "ops_etl.sqlite3"))
+
+
+@dataclass(frozen=True)
+class MetricsConfig:
+    report_dir: str | None  # JSON run reports
+    prom_dir: str | None  # Prometheus textfile collector directory
+    history: bool  # insert a row into dbo.etl_runs
+
+
+def _get_dir(name: str, default: str | None) -> str | None:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    v = v.strip()
+    return None if v.lower() in ("", "0", "off", "none", "false") else v
+
+
+def get_metrics_config() -> MetricsConfig:
+    """
+    OPS_METRICS_DIR       JSON run reports (default ./metrics; "off" disables)
+    OPS_METRICS_PROM_DIR  Prometheus textfile collector dir (default off)
+    OPS_METRICS_HISTORY   write dbo.etl_runs rows (default true)
+    """
+    _load_env()
+    return MetricsConfig(
+        report_dir=_get_dir("OPS_METRICS_DIR", "metrics"),
+        prom_dir=_get_dir("OPS_METRICS_PROM_DIR", None),
+        history=_get_bool("OPS_METRICS_HISTORY", True),
+    )
+
+
+@dataclass(frozen=True)
+class RejectsConfig:
+    compress: str  # "off" | "client" | "server"
+
+
+def get_rejects_config() -> RejectsConfig:
+    """
+    OPS_REJECTS_COMPRESS  how dbo.dataset_rejects stores raw_json (app.reject_store):
+                          off (default, NVARCHAR text) | client (gzip in Python) |
+                          server (COMPRESS() on SQL Server); 1/true = client
+    """
+    _load_env()
+    v = (os.getenv("OPS_REJECTS_COMPRESS") or "off").strip().lower()
+    if v in ("1", "true", "yes", "y", "on"):
+        v = "client"
+    elif v in ("", "0", "false", "no", "n", "none"):
+        v = "off"
+    if v not in ("off", "client", "server"):
+        raise RuntimeError(f"OPS_REJECTS_COMPRESS must be off|client|server (got {v})")
+    return RejectsConfig(compress=v)
+
+
+@dataclass(frozen=True)
+class PeopleCacheConfig:
+    enabled: bool
+    ttl_seconds: float
+    max_entries: int
+    max_page_rows: int
+
+
+def get_people_cache_config() -> PeopleCacheConfig:
+    """
+    OPS_PEOPLE_CACHE            in-process people_repo read cache (default off)
+    OPS_PEOPLE_CACHE_TTL        seconds an entry stays valid (default 30)
+    OPS_PEOPLE_CACHE_SIZE       max cached entries (default 10000)
+    OPS_PEOPLE_CACHE_PAGE_ROWS  list/find pages up to this many rows are cached (default 100)
+    """
+    _load_env()
+    return PeopleCacheConfig(
+        enabled=_get_bool("OPS_PEOPLE_CACHE", False),
+        ttl_seconds=float(os.getenv("OPS_PEOPLE_CACHE_TTL", "30")),
+        max_entries=int(os.getenv("OPS_PEOPLE_CACHE_SIZE", "10000")),
+        max_page_rows=int(os.getenv("OPS_PEOPLE_CACHE_PAGE_ROWS", "100")),
+    )
+
+
+@dataclass(frozen=True)
+class ThrottleConfig:
+    rows_per_sec: float | None
+    batches_per_sec: float | None
+    schedule: str | None
+    commit_target_ms: float | None
+
+
+def _get_limit(name: str) -> float | None:
+    v = (os.getenv(name) or "").strip().lower()
+    if v in ("", "0", "off", "none"):
+        return None
+    return float(v)
+
+
+def get_throttle_config() -> ThrottleConfig:
+    """
+    Write-rate ceilings for bulk runs (app.throttle); all off by default.
+    OPS_THROTTLE_ROWS_PER_SEC     max rows/sec
+    OPS_THROTTLE_BATCHES_PER_SEC  max batches (commits)/sec
+    OPS_THROTTLE_SCHEDULE         per time-of-day ceilings overriding the two above,
+                                  e.g. "07:00-19:00=20000/4,19:00-07:00=0" (0 = none)
+    OPS_THROTTLE_COMMIT_MS        back off while commits take longer than this
+    """
+    _load_env()
+    return ThrottleConfig(
+        rows_per_sec=_get_limit("OPS_THROTTLE_ROWS_PER_SEC"),
+        batches_per_sec=_get_limit("OPS_THROTTLE_BATCHES_PER_SEC"),
+        schedule=(os.getenv("OPS_THROTTLE_SCHEDULE") or "").strip() or None,
+        commit_target_ms=_get_limit("OPS_THROTTLE_COMMIT_MS"),
+    )
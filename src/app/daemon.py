@@ -0,0 +1,346 @@
+# src/app/daemon.py
+from __future__ import annotations
+
+import json
+import os
+import queue
+import signal
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from app.db import ConnectionPool, get_conn, set_pool
+from app.loaders.jsonl_loader import delete_checkpoint
+from app.pipeline import run_pipeline
+from app.transform_framework import DatasetSpec
+
+# Continuous ingestion: one long-lived process polls a drop directory, queues
+# completed files and runs each through the one-pass pipeline (app.pipeline)
+# on a worker thread with pooled connections.
+#
+# Files in <watch>/:
+#   processed/, failed/         finished files (failed ones get a .err next to them)
+#   .ops_manifest.jsonl         one line per finished file; restarts skip files already in it
+#   .ops_status.json            queue depth / throughput counters, rewritten every poll
+#
+# Each batch of a file commits its rows, rejects and a dbo.load_checkpoints row
+# (source_file = name:size:mtime) together, so a file interrupted by a crash
+# resumes after its last committed batch instead of rejecting rows twice. The
+# checkpoint is dropped once the file is in the manifest.
+
+MANIFEST_NAME = ".ops_manifest.jsonl"
+STATUS_NAME = ".ops_status.json"
+DONE_SUFFIX = ".done"
+
+
+def _file_key(p: Path) -> str:
+    st = p.stat()
+    return f"{p.name}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def _move(src: Path, dest_dir: Path) -> Path:
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    dest = dest_dir / src.name
+    if dest.exists():
+        dest = dest_dir / f"{src.stem}.{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}{src.suffix}"
+    os.replace(src, dest)
+    return dest
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class Manifest:
+    """
+    Append-only record of finished files, keyed by name + size + mtime.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._done: dict[str, dict[str, Any]] = {}
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                if line.strip():
+                    rec = json.loads(line)
+                    self._done[rec["key"]] = rec
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            return self._done.get(key)
+
+    def add(self, rec: dict[str, Any]) -> None:
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._done[rec["key"]] = rec
+
+
+class IngestDaemon:
+    """
+    Watches watch_dir for completed files and ingests them with `workers` threads.
+
+    ready="stable": a file is complete once its size and mtime are unchanged
+                    for stable_seconds.
+    ready="done":   a file is complete once "<file>.done" exists (the marker is
+                    moved along with it).
+    """
+
+    def __init__(
+        self,
+        spec: DatasetSpec,
+        watch_dir: str,
+        *,
+        workers: int = 4,
+        pattern: str = "*.csv",
+        ready: str = "stable",  # "stable" | "done"
+        stable_seconds: float = 5.0,
+        poll_seconds: float = 2.0,
+        batch_size: int = 2000,
+        pk_mode: str = "server",
+        processed_dir: str | None = None,
+        failed_dir: str | None = None,
+    ) -> None:
+        if ready not in ("stable", "done"):
+            raise RuntimeError(f"Unknown ready mode: {ready}")
+        self.spec = spec
+        self.watch = Path(watch_dir)
+        if not self.watch.is_dir():
+            raise RuntimeError(f"Watch directory not found: {watch_dir}")
+        self.workers = max(1, workers)
+        self.pattern = pattern
+        self.ready = ready
+        self.stable_seconds = stable_seconds
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self.pk_mode = pk_mode
+        self.processed_dir = Path(processed_dir) if processed_dir else self.watch / "processed"
+        self.failed_dir = Path(failed_dir) if failed_dir else self.watch / "failed"
+
+        self.manifest = Manifest(self.watch / MANIFEST_NAME)
+        self.pool = ConnectionPool(self.workers)
+        self.stop = threading.Event()
+
+        self._queue: queue.Queue[Path | None] = queue.Queue()
+        self._queued: set[str] = set()  # file names queued or in flight
+        self._seen: dict[str, tuple[int, int, float]] = {}  # name -> (size, mtime_ns, first seen unchanged)
+        self._lock = threading.Lock()
+        self._counters: dict[str, Any] = {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "files_ok": 0,
+            "files_failed": 0,
+            "files_skipped": 0,
+            "rows_total": 0,
+            "rows_good": 0,
+            "rows_bad": 0,
+            "busy_seconds": 0.0,
+            "in_flight": 0,
+        }
+        self._t0 = time.perf_counter()
+
+    # ----- discovery -----
+    def _is_ready(self, p: Path, now: float) -> bool:
+        if self.ready == "done":
+            return p.with_name(p.name + DONE_SUFFIX).exists()
+        st = p.stat()
+        sig = (st.st_size, st.st_mtime_ns)
+        prev = self._seen.get(p.name)
+        if prev is None or prev[:2] != sig:
+            self._seen[p.name] = (*sig, now)
+            return False
+        return now - prev[2] >= self.stable_seconds
+
+    def scan(self) -> int:
+        """
+        Queues every completed, not yet queued file. Returns how many were queued.
+        """
+        now = time.monotonic()
+        n = 0
+        files = [p for p in sorted(self.watch.glob(self.pattern)) if p.is_file()]
+        present = {p.name for p in files}
+        for name in [k for k in self._seen if k not in present]:
+            del self._seen[name]
+        for p in files:
+            if p.name in self._queued:
+                continue
+            try:
+                if not self._is_ready(p, now):
+                    continue
+            except FileNotFoundError:
+                continue
+            self._seen.pop(p.name, None)
+            with self._lock:
+                self._queued.add(p.name)
+            self._queue.put(p)
+            n += 1
+        return n
+
+    # ----- work -----
+    def _finish(self, p: Path, dest_dir: Path) -> None:
+        marker = p.with_name(p.name + DONE_SUFFIX)
+        _move(p, dest_dir)
+        if marker.exists():
+            _move(marker, dest_dir)
+
+    def _drop_checkpoint(self, key: str) -> None:
+        # a failed file keeps its checkpoint: moved back into watch/ it resumes
+        conn = get_conn()
+        try:
+            delete_checkpoint(conn.cursor(), self.spec.final_table, key)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def process(self, p: Path) -> None:
+        key = _file_key(p)
+        prev = self.manifest.get(key)
+        if prev is not None and prev["status"] == "ok":
+            # committed before a crash/restart, only the move was lost
+            self._finish(p, self.processed_dir)
+            with self._lock:
+                self._counters["files_skipped"] += 1
+            print(f"serve ✅ skipped (in manifest) file={p.name}")
+            return
+
+        t0 = time.perf_counter()
+        rec: dict[str, Any] = {"key": key, "file": p.name, "dataset": self.spec.name}
+        err_text = ""
+        try:
+            stats = run_pipeline(
+                self.spec,
+                csv_path=str(p),
+                source_file=p.name,
+                batch_size=self.batch_size,
+                pk_mode=self.pk_mode,
+                checkpoint_key=key,
+            )
+            rec.update(status="ok", **stats)
+        except Exception as e:
+            rec.update(status="failed", error=f"{type(e).__name__}: {e}")
+            err_text = traceback.format_exc()
+        elapsed = time.perf_counter() - t0
+        rec.update(seconds=round(elapsed, 3), finished_at=datetime.now().isoformat(timespec="seconds"))
+
+        self.manifest.add(rec)
+        if rec["status"] == "ok":
+            self._drop_checkpoint(key)
+            self._finish(p, self.processed_dir)
+        else:
+            self._finish(p, self.failed_dir)
+            (self.failed_dir / (p.name + ".err")).write_text(err_text, encoding="utf-8")
+
+        with self._lock:
+            c = self._counters
+            c["busy_seconds"] += elapsed
+            if rec["status"] == "ok":
+                c["files_ok"] += 1
+                c["rows_total"] += rec["total"]
+                c["rows_good"] += rec["good"]
+                c["rows_bad"] += rec["bad"]
+            else:
+                c["files_failed"] += 1
+        mark = "✅" if rec["status"] == "ok" else "❌"
+        print(f"serve {mark} file={p.name} status={rec['status']} seconds={rec['seconds']}")
+
+    def _worker(self) -> None:
+        while True:
+            p = self._queue.get()
+            if p is None:
+                return
+            with self._lock:
+                self._counters["in_flight"] += 1
+            try:
+                self.process(p)
+            except Exception:
+                # moving / manifest failures: leave the file for the next scan
+                traceback.print_exc()
+            finally:
+                with self._lock:
+                    self._counters["in_flight"] -= 1
+                    self._queued.discard(p.name)
+                self._queue.task_done()
+
+    # ----- status -----
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            c = dict(self._counters)
+        uptime = time.perf_counter() - self._t0
+        c.update(
+            queue_depth=self._queue.qsize(),
+            workers=self.workers,
+            uptime_seconds=round(uptime, 1),
+            busy_seconds=round(c["busy_seconds"], 3),
+            rows_per_sec=round(c["rows_total"] / uptime, 1) if uptime > 0 else 0.0,
+            files_per_min=round(60 * (c["files_ok"] + c["files_failed"]) / uptime, 2) if uptime > 0 else 0.0,
+            pool_opened=self.pool.opened,
+            pool_reused=self.pool.reused,
+            updated_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        return c
+
+    def write_status(self) -> None:
+        _atomic_write(self.watch / STATUS_NAME, json.dumps(self.status(), indent=2) + "\n")
+
+    # ----- main loop -----
+    def run(self, *, once: bool = False) -> dict[str, Any]:
+        """
+        Polls until stop is set (SIGINT/SIGTERM via serve()), or with once=True
+        until everything currently in the directory is processed.
+        """
+        set_pool(self.pool)
+        threads = [threading.Thread(target=self._worker, name=f"ingest-{i}", daemon=True) for i in range(self.workers)]
+        for t in threads:
+            t.start()
+        print(f"serve ✅ watching={self.watch} spec={self.spec.name} workers={self.workers} ready={self.ready}")
+        try:
+            while not self.stop.is_set():
+                self.scan()
+                self.write_status()
+                if once and self._queue.unfinished_tasks == 0 and not self._seen:
+                    break
+                self.stop.wait(self.poll_seconds)
+        finally:
+            # let in-flight files finish; queued ones are picked up again on restart
+            while True:
+                try:
+                    p = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if p is not None:
+                    self._queue.task_done()
+            for _ in threads:
+                self._queue.put(None)
+            for t in threads:
+                t.join()
+            set_pool(None)
+            self.pool.close_all()
+            self.write_status()
+        st = self.status()
+        print(
+            f"serve ✅ stopped files_ok={st['files_ok']} files_failed={st['files_failed']} "
+            f"rows={st['rows_total']} rows_per_sec={st['rows_per_sec']}"
+        )
+        return st
+
+
+def serve(daemon: IngestDaemon, *, once: bool = False) -> dict[str, Any]:
+    """
+    Runs the daemon with SIGINT/SIGTERM mapped to a graceful stop.
+    """
+
+    def _stop(_signum, _frame) -> None:
+        print("serve ✅ stopping (finishing in-flight files)")
+        daemon.stop.set()
+
+    signal.signal(signal.SIGINT, _stop)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, _stop)
+    return daemon.run(once=once)
@@ -1,24 +1,101 @@
 from __future__ import annotations
 
-import pyodbc
-from app.config import get_db_config
+import queue
 
+from app.backends import get_backend
 
-def get_conn():
-    cfg = get_db_config()
 
-    if not cfg.trusted:
-        raise RuntimeError("Non-trusted connection not implemented yet (set MSSQL_TRUSTED=true).")
+class ConnectionPool:
+    """
+    Keeps up to `size` idle connections for reuse (long-running processes like
+    `ops serve`), so each unit of work does not pay a fresh login.
+    Connections are opened on demand; extra ones are closed when returned to a full pool.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+        self.opened = 0
+        self.reused = 0
+
+    def get(self):
+        try:
+            conn = self._idle.get_nowait()
+            self.reused += 1
+            return conn
+        except queue.Empty:
+            self.opened += 1
+            return get_backend().connect()
+
+    def put(self, conn) -> None:
+        try:
+            # never hand out a connection with an open transaction
+            conn.rollback()
+        except Exception:
+            _close_quietly(conn)
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            _close_quietly(conn)
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                _close_quietly(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+class PooledConnection:
+    """
+    Connection proxy handed out by get_conn() while a pool is active:
+    close() returns the connection to the pool instead of closing it.
+    """
+
+    def __init__(self, pool: ConnectionPool, conn) -> None:
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name: str):
+        return getattr(self._conn, name)
 
-    conn_str = (
-        f"DRIVER={{{cfg.driver}}};"
-        f"SERVER={cfg.server};"
-        f"DATABASE={cfg.database};"
-        "Trusted_Connection=yes;"
-        "Encrypt=yes;"                  # ODBC 18 explicit
-        "TrustServerCertificate=yes;"   # dev-friendly TLS
-        "LoginTimeout=5;"
-    )
-    return pyodbc.connect(conn_str, autocommit=False)
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
 
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
 
+    def close(self) -> None:
+        if self._conn is not None:
+            self._pool.put(self._conn)
+            self._conn = None
+
+
+def _close_quietly(conn) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+_pool: ConnectionPool | None = None
+
+
+def set_pool(pool: ConnectionPool | None) -> None:
+    """
+    Routes get_conn() through pool (None = back to one connection per call).
+    """
+    global _pool
+    _pool = pool
+
+
+def get_conn():
+    """
+    Opens a connection on the configured backend (OPS_DB_BACKEND, default mssql),
+    or borrows one from the active pool (see set_pool).
+    """
+    if _pool is not None:
+        return PooledConnection(_pool, _pool.get())
+    return get_backend().connect()
@@ -6,7 +6,10 @@ import json
 import re
 from pathlib import Path
 
+from app.backends import get_backend
+from app.catalog import get_catalog
 from app.db import get_conn
+from app.reject_store import raw_text
 
 _SAFE_NAME = re.compile(r"^[A-Za-z0-9_]+$")
 
@@ -22,29 +25,48 @@ def _fetch_reject_rows(*, dataset: str, top: int = 0) -> tuple[list[str], list[t
     """
     Returns (columns, rows) from dbo.<dataset>_rejects.
     Orders by rejected_at DESC if present; else created_at DESC if present.
+    Datasets without their own rejects table (spec transforms) are read from
+    dbo.dataset_rejects.
     """
     table = _safe_table_for_dataset(dataset)
-    top_sql = f"TOP ({int(top)}) " if top and top > 0 else ""
+    backend = get_backend()
+    catalog = get_catalog()
+    q = backend.quote_ident
+    n = int(top) if top and top > 0 else None
 
     with get_conn() as conn:
         cur = conn.cursor()
 
-        # Verify table exists
-        cur.execute(
-            """
-            SELECT 1
-            FROM sys.tables t
-            JOIN sys.schemas s ON t.schema_id = s.schema_id
-            WHERE s.name='dbo' AND t.name = ?;
-            """,
-            f"{dataset}_rejects",
-        )
-        if cur.fetchone() is None:
-            raise RuntimeError(f"Rejects table not found: {table}")
-
-        # Discover columns
-        cur.execute(f"SELECT TOP (0) * FROM {table};")
-        cols = [d[0] for d in cur.description]
+        # Verify table exists; columns come from the same cached catalog read
+        info = catalog.table(cur, table)
+        if info is None:
+            shared = catalog.table(cur, "dbo.dataset_rejects")
+            if shared is None:
+                raise RuntimeError(f"Rejects table not found: {table}")
+            cols = shared.column_names
+            cur.execute(
+                f"""
+                SELECT {backend.top_sql(n)}{", ".join(q(c) for c in cols)} FROM dbo.dataset_rejects
+                WHERE dataset_name = ?
+                ORDER BY reject_id DESC{backend.limit_sql(n)};
+                """,
+                (dataset,),
+            )
+            rows = [tuple(r) for r in cur.fetchall()]
+            if "raw_json_z" not in cols:
+                return cols, rows
+            # compressed payloads (app.reject_store) are exported as plain raw_json
+            j, jz = cols.index("raw_json"), cols.index("raw_json_z")
+            out_cols = [c for k, c in enumerate(cols) if k != jz]
+            out_rows = []
+            for r in rows:
+                r = list(r)
+                r[j] = raw_text(r[j], r[jz])
+                del r[jz]
+                out_rows.append(tuple(r))
+            return out_cols, out_rows
+
+        cols = info.column_names
 
         cols_l = {c.lower(): c for c in cols}
         if "rejected_at" in cols_l:
@@ -55,12 +77,21 @@ def _fetch_reject_rows(*, dataset: str, top: int = 0) -> tuple[list[str], list[t
             order_col = None
 
         order_sql = f" ORDER BY {order_col} DESC" if order_col else ""
-        cur.execute(f"SELECT {top_sql} * FROM {table}{order_sql};")
+        select_sql = ", ".join(q(c) for c in cols)
+        cur.execute(f"SELECT {backend.top_sql(n)}{select_sql} FROM {table}{order_sql}{backend.limit_sql(n)};")
         rows = [tuple(r) for r in cur.fetchall()]
 
     return cols, rows
 
 
+def _cell(v):
+    if hasattr(v, "isoformat"):
+        return v.isoformat(sep=" ")
+    if isinstance(v, (bytes, bytearray)):
+        return v.hex()
+    return v
+
+
 def export_rejects_jsonl(*, dataset: str, out_path: str, top: int = 0) -> str:
     cols, rows = _fetch_reject_rows(dataset=dataset, top=top)
 
@@ -71,7 +102,7 @@ def export_rejects_jsonl(*, dataset: str, out_path: str, top: int = 0) -> str:
         for r in rows:
             obj = {}
             for k, v in zip(cols, r):
-                obj[k] = v.isoformat(sep=" ") if hasattr(v, "isoformat") else v
+                obj[k] = _cell(v)
             f.write(json.dumps(obj, ensure_ascii=False) + "\n")
 
     return str(out)
@@ -87,7 +118,7 @@ def export_rejects_csv(*, dataset: str, out_path: str, top: int = 0) -> str:
         w = csv.writer(f)
         w.writerow(cols)
         for r in rows:
-            w.writerow([v.isoformat(sep=" ") if hasattr(v, "isoformat") else v for v in r])
+            w.writerow([_cell(v) for v in r])
 
     return str(out)
 
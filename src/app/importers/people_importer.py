@@ -2,15 +2,18 @@ from __future__ import annotations
 
 from pathlib import Path
 import csv
+import time
 
 from app.people_repo import add_person_if_missing
+from app.throttle import RateGovernor
 
 
-def import_people_csv(in_path: str) -> dict[str, int]:
+def import_people_csv(in_path: str) -> dict[str, int | float]:
     """
     Imports people from a CSV with headers: person_id, full_name, created_at
     Inserts by full_name (skips duplicates by name).
-    Returns counts: {"read": x, "inserted": y, "skipped": z}
+    Returns counts: {"read": x, "inserted": y, "skipped": z, "throttled_seconds": s}
+    Write rate is capped by the OPS_THROTTLE_* settings (app.throttle).
     """
     p = Path(in_path)
     if not p.exists():
@@ -19,6 +22,7 @@ def import_people_csv(in_path: str) -> dict[str, int]:
     read = 0
     inserted = 0
     skipped = 0
+    governor = RateGovernor.from_config()
 
     with p.open("r", newline="", encoding="utf-8") as f:
         r = csv.DictReader(f)
@@ -32,10 +36,14 @@ def import_people_csv(in_path: str) -> dict[str, int]:
                 skipped += 1
                 continue
 
+            governor.wait(1)
+            t0 = time.perf_counter()
             did_insert, _new_id = add_person_if_missing(name)
+            # one row per transaction: the call's time stands in for commit latency
+            governor.observe_commit(time.perf_counter() - t0)
             if did_insert:
                 inserted += 1
             else:
                 skipped += 1
 
-    return {"read": read, "inserted": inserted, "skipped": skipped}
+    return {"read": read, "inserted": inserted, "skipped": skipped, "throttled_seconds": round(governor.slept, 3)}
@@ -0,0 +1,33 @@
+# src/app/json_codec.py
+from __future__ import annotations
+
+import json
+from typing import Any
+
+# JSON parsing for the hot paths (JSONL loading, payload shredding).
+#
+# orjson, when installed, parses several times faster than the stdlib and
+# returns the same plain dicts / lists. Input it refuses but json accepts
+# (NaN / Infinity, ints beyond 64 bits) falls through to json, so the
+# result never depends on whether orjson is installed.
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: str | bytes) -> Any:
+    """
+    json.loads, through orjson when available. Raises ValueError on invalid JSON.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def backend_name() -> str:
+    return "orjson" if orjson is not None else "json"
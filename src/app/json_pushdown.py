@@ -0,0 +1,302 @@
+# src/app/json_pushdown.py
+from __future__ import annotations
+
+import time
+
+from app.backends import get_backend
+from app.catalog import TableInfo, get_catalog
+from app.db import get_conn
+from app.json_shred import is_json_path
+from app.metrics import RunMetrics
+from app.reject_store import resolve_compress
+from app.rejects_summary import REASON_MAX, apply_summary, clear_summary, utc_today
+from app.throttle import RateGovernor
+from app.transform_framework import (
+    INT_WIDTHS,
+    DEFAULT_MONEY_PRECISION,
+    DEFAULT_MONEY_SCALE,
+    DEFAULT_STR_LENGTH,
+    DatasetSpec,
+    FieldRule,
+    column_rule,
+)
+from app.transform_schema import sql_type
+
+# Set-based variant of transform_dataset for JSON payload specs on SQL Server:
+# OPENJSON ... WITH (...) shreds a key range of the staging table server-side
+# into a temp table, then one INSERT ... SELECT fills the final table and one
+# fills dbo.dataset_rejects. No row crosses the network, which is what large
+# backfills need.
+#
+# Reasons are built in the transform's order and spelling (required, overflow,
+# range_min/max, allowed). Casts are TRY_CONVERT based: $ and thousands
+# separators are stripped like the Python casts, but dates only parse in the
+# formats SQL Server knows. Cross rules can't be pushed down. Rejects carry
+# the payload as raw_json and HASHBYTES(SHA2_256) of it as row_hash, the same
+# values transform_dataset writes for payload specs (transform_framework.payload_hash);
+# row_num is the staging key here and the read position there. Per-reason
+# counts come back in a small GROUP BY for dbo.dataset_rejects_summary.
+
+SHRED_TABLE = "#ops_shred"
+_REAL_MAX = "3.4028234663852886E38"
+
+
+def _check(spec: DatasetSpec) -> None:
+    if not spec.payload_column:
+        raise RuntimeError(f"JSON pushdown needs a payload spec ({spec.name} has no payload_column)")
+    if spec.cross:
+        names = [c.name for c in spec.cross]
+        raise RuntimeError(f"{spec.name}: cross rules can't be pushed down to SQL ({names}); use transform_dataset")
+
+
+def _path(fr: FieldRule) -> str:
+    src = fr.source.strip()
+    p = src if is_json_path(src) else f'$."{src}"'
+    return p.replace("'", "''")
+
+
+def _typed_expr(fr: FieldRule, col: str) -> str:
+    """
+    Typed value of raw NVARCHAR column `col`, NULL when empty or not convertible.
+    Ints / money stay wide here so overflow can be told apart from garbage.
+    """
+    v = f"NULLIF(LTRIM(RTRIM({col})), N'')"
+    kind = fr.cast.lower()
+    if kind == "str":
+        return v
+    if kind == "int":
+        # exact through DECIMAL; FLOAT only for exponent notation / more than 28 digits
+        x = f"REPLACE({v}, N',', N'')"
+        return (
+            f"COALESCE(TRY_CONVERT(DECIMAL(38,0), ROUND(TRY_CONVERT(DECIMAL(38,10), {x}), 0, 1)), "
+            f"TRY_CONVERT(DECIMAL(38,0), ROUND(TRY_CONVERT(FLOAT, {x}), 0, 1)))"
+        )
+    if kind == "float":
+        return f"TRY_CONVERT(FLOAT, REPLACE({v}, N',', N''))"
+    if kind == "money":
+        s = DEFAULT_MONEY_SCALE if fr.scale is None else fr.scale
+        return f"TRY_CONVERT(DECIMAL(38,{s}), REPLACE(REPLACE({v}, N'$', N''), N',', N''))"
+    if kind == "date":
+        return f"TRY_CONVERT(DATETIME2(7), {v})"
+    raise RuntimeError(f"Unknown cast kind for SQL type: {fr.cast}")
+
+
+def _reasons_expr(spec: DatasetSpec, alias: str, final: TableInfo | None = None) -> str:
+    """
+    CONCAT_WS('|', ...) of the failed rules over the typed columns alias.<field>
+    ('' = good row), in BatchValidator order. final: see BatchValidator.
+    """
+    backend = get_backend()
+
+    def q(name: str) -> str:
+        return f"{alias}.{backend.quote_ident(name)}"
+
+    by_name = {fr.field: fr for fr in spec.fields}
+    parts: list[str] = []
+
+    required = [fr.field for fr in spec.fields if fr.required] + list(dict.fromkeys(spec.required or []))
+    for f in required:
+        cond = f"{q(f)} IS NULL" if f in by_name else "1 = 1"
+        parts.append(f"CASE WHEN {cond} THEN N'required:{f}' END")
+
+    for fr in spec.fields:
+        c = q(fr.field)
+        kind = fr.cast.lower()
+        col = None if final is None else final.column(fr.field)
+        if col is not None:
+            fr = column_rule(fr, col)
+        cond = None
+        if kind == "str":
+            n = DEFAULT_STR_LENGTH if fr.length is None else fr.length
+            if n >= 0:
+                cond = f"LEN({c}) > {n}"
+        elif kind == "int":
+            _t, lo, hi = INT_WIDTHS[fr.width or 4]
+            cond = f"({c} < {lo} OR {c} > {hi})"
+        elif kind == "money":
+            p = fr.precision or DEFAULT_MONEY_PRECISION
+            s = DEFAULT_MONEY_SCALE if fr.scale is None else fr.scale
+            cond = f"ABS({c}) >= POWER(CAST(10 AS DECIMAL(38,0)), {p - s})"
+        elif kind == "float" and fr.width == 4:
+            cond = f"ABS({c}) > {_REAL_MAX}"
+        if cond is not None:
+            parts.append(f"CASE WHEN {cond} THEN N'overflow:{fr.field}' END")
+
+    for rr in spec.ranges or []:
+        if rr.field not in by_name:
+            continue
+        c = q(rr.field)
+        if rr.min is not None:
+            parts.append(f"CASE WHEN {c} < {rr.min} THEN N'range_min:{rr.field}' END")
+        if rr.max is not None:
+            parts.append(f"CASE WHEN {c} > {rr.max} THEN N'range_max:{rr.field}' END")
+
+    for ar in spec.allowed or []:
+        if ar.field not in by_name:
+            continue
+        values = ", ".join("N'" + str(x).lower().replace("'", "''") + "'" for x in sorted(ar.allowed))
+        c = f"LOWER(LTRIM(RTRIM(CONVERT(NVARCHAR(4000), {q(ar.field)}))))"
+        parts.append(f"CASE WHEN {q(ar.field)} IS NOT NULL AND {c} NOT IN ({values}) THEN N'allowed:{ar.field}' END")
+
+    if not parts:
+        return "N''"
+    # CONCAT_WS needs at least two arguments
+    return f"CONCAT_WS(N'|', {', '.join(parts)}, NULL)"
+
+
+def openjson_sql(
+    spec: DatasetSpec, *, key_column: str = "id", compress: bool = False, final: TableInfo | None = None
+) -> list[str]:
+    """
+    The statements run per key range (parameters: lo, hi for the shred;
+    dataset_name, source_file for the rejects), in order:
+      1. shred staging rows with lo < key <= hi into #ops_shred (typed columns + reasons)
+      2. insert good rows missing from the final table (first field = PK, first row wins)
+      3. insert rejects
+      4. reject counts per reason ("*" = rejected rows) for the summary
+      5. drop #ops_shred
+    compress=True stores reject payloads as raw_json_z = COMPRESS(payload) (app.reject_store).
+    final: the existing final table, whose columns set the overflow limits (see BatchValidator).
+    """
+    _check(spec)
+    backend = get_backend()
+    q = backend.quote_ident
+    payload = q(spec.payload_column)
+    key = q(key_column)
+    fields = [fr.field for fr in spec.fields]
+
+    with_sql = ",\n            ".join(f"{q('r_' + fr.field)} NVARCHAR(MAX) '{_path(fr)}'" for fr in spec.fields)
+    typed_sql = ",\n        ".join(f"{_typed_expr(fr, 'j.' + q('r_' + fr.field))} AS {q(fr.field)}" for fr in spec.fields)
+    shred = f"""
+    SELECT s.{key} AS __row_id, COALESCE(CONVERT(NVARCHAR(MAX), s.{payload}), N'') AS __payload, t.*,
+           CASE WHEN ISJSON(s.{payload}) = 1 THEN {_reasons_expr(spec, "t", final)} ELSE N'invalid_json' END AS __reasons
+    INTO {SHRED_TABLE}
+    FROM {backend.full_table(spec.stg_table)} s
+    OUTER APPLY (
+        SELECT
+        {typed_sql}
+        FROM OPENJSON(CASE WHEN ISJSON(s.{payload}) = 1 THEN s.{payload} END)
+        WITH (
+            {with_sql}
+        ) j
+    ) t
+    WHERE s.{key} > ? AND s.{key} <= ?;
+    """
+    cols_sql = ", ".join(q(f) for f in fields)
+    conv_sql = ", ".join(f"CONVERT({sql_type(fr)}, g.{q(fr.field)})" for fr in spec.fields)
+    pk = q(fields[0])
+    insert_final = f"""
+    INSERT INTO {backend.full_table(spec.final_table)} ({cols_sql})
+    SELECT {conv_sql}
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY {pk} ORDER BY __row_id) AS __rn
+        FROM {SHRED_TABLE}
+        WHERE __reasons = N''
+    ) g
+    WHERE g.__rn = 1
+      AND NOT EXISTS (SELECT 1 FROM {backend.full_table(spec.final_table)} f WHERE f.{pk} = g.{pk});
+    """
+    raw_cols, raw_vals = ("raw_json, raw_json_z", "N'', COMPRESS(__payload)") if compress else ("raw_json", "__payload")
+    insert_rejects = f"""
+    INSERT INTO dbo.dataset_rejects(dataset_name, source_file, row_num, row_hash, reject_reasons, {raw_cols})
+    SELECT ?, ?, __row_id, HASHBYTES('SHA2_256', __payload), __reasons, {raw_vals}
+    FROM {SHRED_TABLE}
+    WHERE __reasons <> N'';
+    """
+    reject_counts = f"""
+    SELECT x.reason, COUNT(DISTINCT x.__row_id)
+    FROM (
+        SELECT __row_id, N'*' AS reason FROM {SHRED_TABLE} WHERE __reasons <> N''
+        UNION ALL
+        SELECT t.__row_id, s.value
+        FROM {SHRED_TABLE} t
+        CROSS APPLY STRING_SPLIT(t.__reasons, N'|') s
+        WHERE t.__reasons <> N''
+    ) x
+    GROUP BY x.reason;
+    """
+    drop = f"DROP TABLE {SHRED_TABLE};"
+    return [shred, insert_final, insert_rejects, reject_counts, drop]
+
+
+def pushdown_transform(
+    spec: DatasetSpec,
+    *,
+    source_file: str | None = None,
+    key_column: str = "id",
+    chunk_rows: int = 100_000,
+    truncate_rejects: bool = False,
+) -> dict[str, int]:
+    """
+    Set-based spec.stg_table (JSON payloads) -> spec.final_table + dbo.dataset_rejects,
+    one transaction per `chunk_rows` range of the staging key column.
+    Rerunnable: final rows are insert-if-missing by the first field.
+    """
+    _check(spec)
+    backend = get_backend()
+    if not backend.supports_openjson:
+        raise RuntimeError(f"JSON pushdown needs SQL Server OPENJSON (backend={backend.name}); use transform_dataset")
+    q = backend.quote_ident
+
+    metrics = RunMetrics("json_pushdown", dataset=spec.name, source=source_file or spec.stg_table)
+    governor = RateGovernor.from_config(metrics=metrics)
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        compress = resolve_compress(cur) != "off"
+        shred, insert_final, insert_rejects, reject_counts, drop = openjson_sql(
+            spec, key_column=key_column, compress=compress, final=get_catalog().table(cur, spec.final_table)
+        )
+        if truncate_rejects:
+            cur.execute("DELETE FROM dbo.dataset_rejects WHERE dataset_name = ?;", (spec.name,))
+            clear_summary(cur, spec.name)
+            conn.commit()
+
+        cur.execute(f"SELECT MIN({q(key_column)}), MAX({q(key_column)}) FROM {backend.full_table(spec.stg_table)};")
+        lo, hi = cur.fetchone()
+        total = good = bad = 0
+        if lo is not None:
+            start = int(lo) - 1
+            while start < int(hi):
+                end = start + chunk_rows
+                # key range, not row count: gaps make it an upper bound
+                governor.wait(chunk_rows)
+                with metrics.phase("shred"):
+                    cur.execute(shred, (start, end))
+                    n = cur.rowcount
+                with metrics.phase("write"):
+                    cur.execute(insert_final)
+                    g = cur.rowcount
+                    cur.execute(insert_rejects, (spec.name, source_file))
+                    b = cur.rowcount
+                    if b:
+                        cur.execute(reject_counts)
+                        day = utc_today()
+                        apply_summary(
+                            cur,
+                            {(spec.name, source_file or "", str(r)[:REASON_MAX], day): int(n) for r, n in cur.fetchall()},
+                        )
+                    cur.execute(drop)
+                t_commit = time.perf_counter()
+                with metrics.phase("commit"):
+                    conn.commit()
+                governor.observe_commit(time.perf_counter() - t_commit)
+                total += n
+                good += g
+                bad += b
+                metrics.count("batches")
+                print(f"pushdown... {total}")
+                start = end
+
+        metrics.count("rows_read", total)
+        metrics.count("rows_good", good)
+        metrics.count("rows_bad", bad)
+        metrics.count("rows_skipped", total - good - bad)
+        print(
+            f"json_pushdown ✅ dataset={spec.name} total={total} good={good} bad={bad} skipped={total - good - bad}"
+        )
+        metrics.finish()
+        return {"total": total, "good": good, "bad": bad, "skipped": total - good - bad}
+    finally:
+        conn.close()
+        metrics.close()
@@ -0,0 +1,124 @@
+# src/app/json_shred.py
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Iterable, Sequence
+
+from app.json_codec import loads
+
+# Field extraction from JSON payload columns (DatasetSpec.payload_column).
+#
+# FieldRule.source is a JSON path in SQL Server's syntax: $.order_id,
+# $.customer.id, $.lines[0].sku, $."key with spaces" (a plain name means $.name).
+# All paths of a spec are compiled into one tree, so each payload is parsed
+# once and walked once however many fields it feeds.
+
+_PATH_STEP = re.compile(r'\.(?:"((?:[^"\\]|\\.)*)"|([^.\[\]"\s]+))|\[(\d+)\]')
+
+
+def is_json_path(source: str) -> bool:
+    return source.strip().startswith("$")
+
+
+def parse_json_path(path: str) -> tuple[str | int, ...]:
+    """
+    "$.lines[0].sku" -> ("lines", 0, "sku"). A name without "$" is a top-level key.
+    """
+    s = path.strip()
+    if s.startswith("lax "):
+        s = s[4:].lstrip()
+    if not s.startswith("$"):
+        return (s,)
+    out: list[str | int] = []
+    pos = 1
+    while pos < len(s):
+        m = _PATH_STEP.match(s, pos)
+        if m is None:
+            raise RuntimeError(f"Unsupported JSON path: {path} (expected $.key, $.\"key\", $.key[0] ...)")
+        if m.group(3) is not None:
+            out.append(int(m.group(3)))
+        elif m.group(1) is not None:
+            out.append(m.group(1).replace('\\"', '"'))
+        else:
+            out.append(m.group(2))
+        pos = m.end()
+    return tuple(out)
+
+
+def _scalar(v: Any) -> Any:
+    # objects / arrays stay JSON text, booleans keep their JSON spelling
+    if isinstance(v, (dict, list)):
+        return json.dumps(v, ensure_ascii=False, separators=(",", ":"))
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    return v
+
+
+# tree node: (indexes of the fields whose path ends here, {step: child node})
+_Node = tuple[list[int], dict[Any, Any]]
+
+
+def _walk(node: _Node, value: Any, out: list[Any]) -> None:
+    leaves, children = node
+    for j in leaves:
+        out[j] = _scalar(value)
+    for step, child in children.items():
+        if type(step) is int:
+            if isinstance(value, list) and step < len(value):
+                _walk(child, value[step], out)
+        elif isinstance(value, dict):
+            v = value.get(step)
+            if v is not None:
+                _walk(child, v, out)
+
+
+class JsonShredder:
+    """
+    Compiled set of JSON paths; extract() returns one value per path
+    (None where the path is missing or null).
+    """
+
+    __slots__ = ("paths", "_root", "_n")
+
+    def __init__(self, paths: Sequence[str]) -> None:
+        self.paths = list(paths)
+        self._n = len(self.paths)
+        self._root: _Node = ([], {})
+        for j, p in enumerate(self.paths):
+            node = self._root
+            for step in parse_json_path(p):
+                node = node[1].setdefault(step, ([], {}))
+            node[0].append(j)
+
+    def extract(self, payload: str | bytes | None) -> tuple | None:
+        """
+        Values for every path, or None if the payload is not valid JSON. A NULL
+        payload counts as invalid, like ISJSON(NULL) in the pushdown (app.json_pushdown).
+        """
+        if payload is None:
+            return None
+        try:
+            doc = loads(payload)
+        except ValueError:
+            return None
+        out: list[Any] = [None] * self._n
+        _walk(self._root, doc, out)
+        return tuple(out)
+
+    def shred(self, payloads: Iterable[Any], first_row_num: int = 1) -> tuple[list[tuple], list[int], list[tuple[int, Any]]]:
+        """
+        (value tuples, their row numbers, [(row_num, payload)] of the invalid payloads).
+        Row numbers count every payload, valid or not, from first_row_num.
+        """
+        rows: list[tuple] = []
+        nums: list[int] = []
+        bad: list[tuple[int, Any]] = []
+        for k, payload in enumerate(payloads, first_row_num):
+            vals = self.extract(payload)
+            if vals is None:
+                bad.append((k, payload))
+            else:
+                rows.append(vals)
+                nums.append(k)
+        return rows, nums, bad
@@ -3,10 +3,16 @@ from __future__ import annotations
 
 import csv
 import re
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
+
+from app.backends import get_backend
+from app.catalog import get_catalog
 from app.db import get_conn
+from app.metrics import RunMetrics
+from app.throttle import RateGovernor
 
 
 def normalize_col(name: str) -> str:
@@ -57,55 +63,30 @@ def require_confirm(action: str, table: str, confirm: str | None) -> None:
 
 
 def table_exists(cur, full_table: str) -> bool:
-    schema, name = parse_table(full_table)
-    cur.execute(
-        """
-        SELECT 1
-        FROM sys.tables t
-        JOIN sys.schemas s ON s.schema_id = t.schema_id
-        WHERE s.name = ? AND t.name = ?;
-        """,
-        (schema, name),
-    )
-    return cur.fetchone() is not None
+    return get_catalog().table_exists(cur, full_table)
 
 
 def get_table_columns(cur, full_table: str) -> list[str]:
-    schema, name = parse_table(full_table)
-    cur.execute(
-        """
-        SELECT c.name
-        FROM sys.columns c
-        JOIN sys.tables t ON t.object_id = c.object_id
-        JOIN sys.schemas s ON s.schema_id = t.schema_id
-        WHERE s.name = ? AND t.name = ?
-        ORDER BY c.column_id;
-        """,
-        (schema, name),
-    )
-    return [r[0] for r in cur.fetchall()]
+    return get_catalog().columns(cur, full_table)
 
 
 def create_staging_table(cur, full_table: str, columns: list[str]) -> None:
-    schema, name = parse_table(full_table)
-    full = f"{schema}.{name}"
-    cols_sql = ",\n    ".join([f"[{c}] NVARCHAR(4000) NULL" for c in columns])
+    backend = get_backend()
+    full = backend.full_table(full_table)
+    cols_sql = ",\n    ".join([f"{backend.quote_ident(c)} NVARCHAR(4000) NULL" for c in columns])
 
     sql = f"""
-    IF OBJECT_ID('{full}','U') IS NOT NULL
-        DROP TABLE {full};
-
     CREATE TABLE {full} (
         {cols_sql}
     );
     """
+    cur.execute(backend.drop_table_if_exists_sql(full_table))
     cur.execute(sql)
+    get_catalog().invalidate(full_table)
 
 
 def truncate_table(cur, full_table: str) -> None:
-    schema, name = parse_table(full_table)
-    full = f"{schema}.{name}"
-    cur.execute(f"TRUNCATE TABLE {full};")
+    cur.execute(get_backend().truncate_sql(full_table))
 
 
 def iter_csv_rows(
@@ -167,6 +148,9 @@ def load_csv(
     """
     header, rows = iter_csv_rows(csv_path, delimiter=delimiter, quotechar=quotechar, skiprows=skiprows)
 
+    metrics = RunMetrics("load_csv", dataset=table, source=csv_path)
+    governor = RateGovernor.from_config(metrics=metrics)
+    backend = get_backend()
     conn = get_conn()
     try:
         cur = conn.cursor()
@@ -209,12 +193,25 @@ def load_csv(
                 raise RuntimeError(f"Unknown match_mode: {match_mode}")
 
         placeholders = ",".join(["?"] * len(header))
-        cols_sql = ",".join([f"[{c}]" for c in header])
+        cols_sql = ",".join([backend.quote_ident(c) for c in header])
         sql = f"INSERT INTO {table} ({cols_sql}) VALUES ({placeholders});"
+        sizes = get_catalog().input_sizes(cur, table, header)
 
         batch: list[list[str]] = []
         total = 0
 
+        def flush() -> None:
+            governor.wait(len(batch))
+            with metrics.phase("write"):
+                backend.bulk_insert(cur, sql, batch, sizes=sizes)
+            t_commit = time.perf_counter()
+            with metrics.phase("commit"):
+                conn.commit()
+            governor.observe_commit(time.perf_counter() - t_commit)
+            metrics.count("batches")
+
+        # "read" = time spent pulling rows out of the CSV between flushes
+        t_read = time.perf_counter()
         for row in rows:
             # pad/trim row to header length
             if len(row) < len(header):
@@ -225,17 +222,23 @@ def load_csv(
             batch.append(row)
 
             if len(batch) >= batch_size:
-                cur.executemany(sql, batch)
-                conn.commit()
+                metrics.add_time("read", time.perf_counter() - t_read)
+                flush()
                 total += len(batch)
                 print(f"loaded... {total}")
                 batch = []
+                t_read = time.perf_counter()
+        metrics.add_time("read", time.perf_counter() - t_read)
 
         if batch:
-            cur.executemany(sql, batch)
-            conn.commit()
+            flush()
             total += len(batch)
 
+        metrics.count("rows_read", total)
+        metrics.count("rows_good", total)
+        metrics.count("bytes_read", Path(csv_path).stat().st_size)
         print(f"load_csv ✅ table={table} rows={total} cols={len(header)}")
+        metrics.finish()
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+        metrics.close()
\ No newline at end of file
@@ -0,0 +1,276 @@
+# src/app/loaders/jsonl_loader.py
+from __future__ import annotations
+
+import bz2
+import gzip
+import hashlib
+import json
+import lzma
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO
+
+from app.backends import get_backend
+from app.catalog import get_catalog
+from app.db import get_conn
+from app.json_codec import loads
+from app.metrics import RunMetrics
+from app.reject_store import RejectInserter
+from app.throttle import RateGovernor
+from app.transform_framework import row_hash
+
+# Newline-delimited JSON -> one payload column per line (dbo.raw_orders.payload_json).
+#
+# Lines are streamed as bytes, parsed once to validate them and stored as the
+# original text (no re-serialize). Lines that aren't a JSON object go to
+# dbo.dataset_rejects (counted in dbo.dataset_rejects_summary). After each
+# batch the byte offset reached is saved in dbo.load_checkpoints in the same
+# transaction, so a rerun of the same file resumes right after the last
+# committed line.
+#
+# The checkpoint also keeps a SHA-256 of the file's first HEAD_BYTES
+# (decompressed) bytes, or of all of them while the offset is smaller. Appending
+# to the file keeps that head; a different file dropped under the same name
+# (a daily orders.jsonl) doesn't, and is refused instead of being resumed
+# mid-file.
+
+CHECKPOINT_TABLE = "dbo.load_checkpoints"
+HEAD_BYTES = 64 * 1024
+
+_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".bz2": "bz2", ".xz": "xz", ".lzma": "xz"}
+
+
+def resolve_compression(path: str, compression: str = "auto") -> str:
+    """
+    compression: "auto" (by suffix: .gz, .bz2, .xz) | "none" | "gzip" | "bz2" | "xz".
+    """
+    if compression == "auto":
+        return _SUFFIXES.get(Path(path).suffix.lower(), "none")
+    if compression != "none" and compression not in _OPENERS:
+        raise RuntimeError(f"Unknown compression: {compression} (expected auto|none|gzip|bz2|xz)")
+    return compression
+
+
+def open_jsonl(path: str, compression: str = "auto") -> IO[bytes]:
+    """
+    Binary stream of the (decompressed) file.
+    """
+    p = Path(path)
+    if not p.exists():
+        raise RuntimeError(f"JSONL not found: {path}")
+    compression = resolve_compression(path, compression)
+    if compression == "none":
+        return p.open("rb")
+    return _OPENERS[compression](p, "rb")
+
+
+def read_checkpoint(cur, table: str, source: str) -> tuple[int, int, int, int | None, bytes | None] | None:
+    """
+    (byte_offset, line_num, rows_loaded, head_bytes, head_sha256) saved for
+    table + source, or None. The head is None for checkpoints saved before
+    migration 014.
+    """
+    cur.execute(
+        f"""
+        SELECT byte_offset, line_num, rows_loaded, head_bytes, head_sha256
+        FROM {CHECKPOINT_TABLE} WHERE target_table = ? AND source_file = ?;
+        """,
+        (table, source),
+    )
+    r = cur.fetchone()
+    if r is None:
+        return None
+    return (int(r[0]), int(r[1]), int(r[2]), None if r[3] is None else int(r[3]), None if r[4] is None else bytes(r[4]))
+
+
+def save_checkpoint(
+    cur, table: str, source: str, byte_offset: int, line_num: int, rows_loaded: int, head: bytes = b""
+) -> None:
+    """
+    Upserts the checkpoint; runs in the caller's transaction (no commit).
+    head: the file's first min(byte_offset, HEAD_BYTES) bytes.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    head_sha = hashlib.sha256(head).digest()
+    cur.execute(
+        f"""
+        UPDATE {CHECKPOINT_TABLE}
+        SET byte_offset = ?, line_num = ?, rows_loaded = ?, updated_at = ?, head_bytes = ?, head_sha256 = ?
+        WHERE target_table = ? AND source_file = ?;
+        """,
+        (byte_offset, line_num, rows_loaded, now, len(head), head_sha, table, source),
+    )
+    if cur.rowcount == 0:
+        cur.execute(
+            f"""
+            INSERT INTO {CHECKPOINT_TABLE}(target_table, source_file, byte_offset, line_num, rows_loaded, updated_at, head_bytes, head_sha256)
+            VALUES (?,?,?,?,?,?,?,?);
+            """,
+            (table, source, byte_offset, line_num, rows_loaded, now, len(head), head_sha),
+        )
+
+
+def delete_checkpoint(cur, table: str, source: str) -> None:
+    """
+    Drops the checkpoint for table + source; runs in the caller's transaction (no commit).
+    """
+    cur.execute(f"DELETE FROM {CHECKPOINT_TABLE} WHERE target_table = ? AND source_file = ?;", (table, source))
+
+
+def _check_line(line: bytes) -> tuple[str, str | None]:
+    """
+    (text, None) for a JSON object line, else (text, reason).
+    """
+    try:
+        text = line.decode("utf-8")
+    except UnicodeDecodeError:
+        return line.decode("utf-8", "replace"), "invalid_utf8"
+    if not text.startswith("{"):
+        return text, "not_object"
+    try:
+        loads(text)
+    except ValueError:
+        return text, "invalid_json"
+    return text, None
+
+
+def load_jsonl(
+    *,
+    path: str,
+    table: str = "dbo.raw_orders",
+    column: str = "payload_json",
+    batch_size: int = 2000,
+    compression: str = "auto",
+    resume: bool = True,
+    dataset: str | None = None,
+) -> dict[str, int]:
+    """
+    Streams a JSONL file (optionally gzip/bz2/xz) into table.column, one row per line.
+
+    Blank lines are skipped. Lines that aren't valid UTF-8 JSON objects are written
+    to dbo.dataset_rejects (dataset defaults to the table name, row_num = line number)
+    with reason invalid_utf8 / not_object / invalid_json.
+
+    resume=True continues from the offset in dbo.load_checkpoints for (table, file),
+    if any, and refuses a file whose first bytes differ from the checkpointed one;
+    resume=False starts at byte 0 (and overwrites the checkpoint). Rejects record
+    the resolved path as source_file, like the checkpoint.
+    Offsets count decompressed bytes, so resuming a compressed file re-reads
+    (but does not re-insert) the part already loaded.
+    """
+    source = str(Path(path).resolve())
+    dataset = dataset or table.split(".")[-1]
+    backend = get_backend()
+    catalog = get_catalog()
+    metrics = RunMetrics("load_jsonl", dataset=table, source=path)
+    governor = RateGovernor.from_config(metrics=metrics)
+    conn = get_conn()
+    f = None
+    try:
+        cur = conn.cursor()
+        info = catalog.table(cur, table)
+        if info is None:
+            raise RuntimeError(f"Table does not exist: {table}")
+        if info.column(column) is None:
+            raise RuntimeError(f"Column {column} not found in {table} (columns={info.column_names})")
+
+        offset = line_num = loaded = 0
+        saved_head: tuple[int, bytes] | None = None
+        if resume:
+            saved = read_checkpoint(cur, table, source)
+            if saved is not None:
+                offset, line_num, loaded = saved[:3]
+                if saved[4] is not None:
+                    saved_head = (saved[3], saved[4])
+        start_offset = offset
+
+        compression = resolve_compression(path, compression)
+        f = open_jsonl(path, compression)
+        # first min(offset, HEAD_BYTES) bytes; grows below while reading
+        head = f.read(min(offset, HEAD_BYTES)) if offset else b""
+        if offset:
+            changed = False
+            if saved_head is not None:
+                n, sha = saved_head
+                changed = len(head) < n or hashlib.sha256(head[:n]).digest() != sha
+            if compression == "none" and offset > Path(path).stat().st_size:
+                changed = True
+            if changed:
+                raise RuntimeError(
+                    f"{path} is not the file checkpointed at offset {offset} for {table} (its first bytes "
+                    "or size differ); rerun with resume=False (--no-resume) to load it from the start"
+                )
+            f.seek(offset)
+
+        sql = f"INSERT INTO {table} ({backend.quote_ident(column)}) VALUES (?);"
+        sizes = catalog.input_sizes(cur, table, [column])
+        rejects = RejectInserter(cur)
+
+        good: list[tuple[str]] = []
+        bad: list[tuple] = []
+        n_good = n_bad = 0
+
+        def flush() -> None:
+            nonlocal n_good, n_bad, loaded
+            governor.wait(len(good) + len(bad))
+            with metrics.phase("write"):
+                if good:
+                    backend.bulk_insert(cur, sql, good, sizes=sizes)
+                rejects.insert(cur, bad)
+                loaded += len(good)
+                save_checkpoint(cur, table, source, offset, line_num, loaded, head)
+            t_commit = time.perf_counter()
+            with metrics.phase("commit"):
+                conn.commit()
+            governor.observe_commit(time.perf_counter() - t_commit)
+            metrics.count("batches")
+            n_good += len(good)
+            n_bad += len(bad)
+
+        # "read" = reading + validating lines between flushes
+        t_read = time.perf_counter()
+        for line in f:
+            offset += len(line)
+            line_num += 1
+            if len(head) < HEAD_BYTES:
+                head += line[: HEAD_BYTES - len(head)]
+            s = line.strip()
+            if not s:
+                continue
+            text, reason = _check_line(s)
+            if reason is None:
+                good.append((text,))
+            else:
+                raw = {"line": text}
+                bad.append((dataset, source, line_num, row_hash(raw), reason, json.dumps(raw, ensure_ascii=False)))
+
+            if len(good) + len(bad) >= batch_size:
+                metrics.add_time("read", time.perf_counter() - t_read)
+                flush()
+                print(f"loaded... {n_good}")
+                good = []
+                bad = []
+                t_read = time.perf_counter()
+        metrics.add_time("read", time.perf_counter() - t_read)
+
+        # the last flush also records the final offset (even with nothing left to insert)
+        if good or bad or offset != start_offset or not resume:
+            flush()
+
+        metrics.count("rows_read", n_good + n_bad)
+        metrics.count("rows_good", n_good)
+        metrics.count("rows_bad", n_bad)
+        metrics.count("bytes_read", offset - start_offset)
+        print(
+            f"load_jsonl ✅ table={table} rows={n_good} bad={n_bad} lines={line_num} "
+            f"resumed_at={start_offset} bytes={offset - start_offset}"
+        )
+        metrics.finish()
+        return {"rows": n_good, "bad": n_bad, "lines": line_num, "offset": offset}
+    finally:
+        if f is not None:
+            f.close()
+        conn.close()
+        metrics.close()
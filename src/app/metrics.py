@@ -0,0 +1,244 @@
+# src/app/metrics.py
+from __future__ import annotations
+
+import json
+import os
+import re
+import socket
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from app.catalog import get_catalog
+from app.config import get_metrics_config
+from app.db import get_conn
+from app.throttle import RateGovernor
+
+# One RunMetrics per command run (load_csv, transform_dataset, pipeline, promote_people).
+# At the end of the run it emits, each optional via config (see get_metrics_config):
+#   - a JSON report:                 <OPS_METRICS_DIR>/<command>_<started>_<run_id>.json
+#   - a Prometheus textfile:         <OPS_METRICS_PROM_DIR>/ops_etl_<command>_<dataset>.prom
+#   - a history row in dbo.etl_runs  (migration 009)
+# Emitting never fails the run itself.
+
+COUNTERS = ("rows_read", "rows_good", "rows_bad", "rows_skipped", "batches", "bytes_read", "retries")
+
+
+class RunMetrics:
+    """
+    Per-phase timings and counters for one run.
+
+        m = RunMetrics("transform_dataset", dataset="people")
+        with m.phase("read"):
+            rows = cur.fetchmany(n)
+        m.count("rows_read", len(rows))
+        ...
+        m.finish()         # status ok, emits the report
+        m.close()          # in finally: emits status=failed if finish() was never reached
+    """
+
+    def __init__(self, command: str, *, dataset: str | None = None, source: str | None = None) -> None:
+        self.run_id = uuid.uuid4().hex
+        self.command = command
+        self.dataset = dataset
+        self.source = source
+        self.started_at = datetime.now(timezone.utc)
+        self.phases: dict[str, float] = {}
+        self.counters: dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self.report: dict[str, Any] | None = None
+        self.governor: RateGovernor | None = None  # set by RateGovernor(metrics=...)
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - t0)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def finish(self, *, status: str = "ok", error: str | None = None) -> dict[str, Any]:
+        if self.report is not None:
+            return self.report
+
+        seconds = time.perf_counter() - self._t0
+        rows = self.counters.get("rows_read", 0)
+        self.report = {
+            "run_id": self.run_id,
+            "command": self.command,
+            "dataset": self.dataset,
+            "source": self.source,
+            "status": status,
+            "error": error,
+            "host": socket.gethostname(),
+            "started_at": self.started_at.isoformat(timespec="milliseconds"),
+            "finished_at": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "seconds": round(seconds, 4),
+            "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+            "phases": {k: round(v, 4) for k, v in self.phases.items()},
+            "counters": dict(self.counters),
+            "throttle": None if self.governor is None or not self.governor.enabled else self.governor.stats(),
+        }
+        _emit(self.report)
+        return self.report
+
+    def close(self) -> None:
+        """
+        Call from finally: records the run as failed if finish() was not reached.
+        """
+        if self.report is not None:
+            return
+        exc = sys.exc_info()[1]
+        self.finish(status="failed", error=None if exc is None else f"{type(exc).__name__}: {exc}"[:2000])
+
+
+# ---------- sinks ----------
+def _emit(report: dict[str, Any]) -> None:
+    cfg = get_metrics_config()
+    written: list[str] = []
+    for name, sink, target in (
+        ("json", _write_json, cfg.report_dir),
+        ("prom", _write_prom, cfg.prom_dir),
+        ("history", _write_history, "dbo.etl_runs" if cfg.history else None),
+    ):
+        if not target:
+            continue
+        try:
+            out = sink(report, target)
+            if out:
+                written.append(f"{name}={out}")
+        except Exception as e:
+            print(f"metrics ❌ {name} sink failed: {type(e).__name__}: {e}")
+
+    c = report["counters"]
+    t = report.get("throttle")
+    throttled = f"throttled={t['slept_seconds']}s rows_per_sec_limit={t['rows_per_sec_limit']} " if t else ""
+    mark = "✅" if report["status"] == "ok" else "❌"
+    print(
+        f"metrics {mark} {report['command']} status={report['status']} seconds={report['seconds']} "
+        f"rows={c['rows_read']} rows_per_sec={report['rows_per_sec']} " + throttled + " ".join(written)
+    )
+
+
+def _write_json(report: dict[str, Any], report_dir: str) -> str:
+    d = Path(report_dir)
+    d.mkdir(parents=True, exist_ok=True)
+    stamp = report["started_at"][:19].replace(":", "").replace("-", "")
+    p = d / f"{report['command']}_{stamp}_{report['run_id'][:8]}.json"
+    p.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return str(p)
+
+
+def _prom_escape(v: Any) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _write_prom(report: dict[str, Any], prom_dir: str) -> str:
+    """
+    node_exporter textfile collector format; one file per command + dataset, replaced atomically.
+    """
+    labels = f'command="{_prom_escape(report["command"])}",dataset="{_prom_escape(report["dataset"] or "")}"'
+    finished = datetime.fromisoformat(report["finished_at"]).timestamp()
+    lines = [
+        "# HELP ops_etl_last_run_seconds Wall time of the last run.",
+        "# TYPE ops_etl_last_run_seconds gauge",
+        f"ops_etl_last_run_seconds{{{labels}}} {report['seconds']}",
+        "# HELP ops_etl_last_run_success 1 if the last run finished ok.",
+        "# TYPE ops_etl_last_run_success gauge",
+        f"ops_etl_last_run_success{{{labels}}} {1 if report['status'] == 'ok' else 0}",
+        "# HELP ops_etl_last_run_timestamp_seconds Unix time the last run finished.",
+        "# TYPE ops_etl_last_run_timestamp_seconds gauge",
+        f"ops_etl_last_run_timestamp_seconds{{{labels}}} {finished:.3f}",
+        "# HELP ops_etl_last_run_rows_per_second Rows read per second in the last run.",
+        "# TYPE ops_etl_last_run_rows_per_second gauge",
+        f"ops_etl_last_run_rows_per_second{{{labels}}} {report['rows_per_sec'] or 0}",
+        "# HELP ops_etl_last_run_phase_seconds Time per phase in the last run.",
+        "# TYPE ops_etl_last_run_phase_seconds gauge",
+    ]
+    for phase, s in report["phases"].items():
+        lines.append(f'ops_etl_last_run_phase_seconds{{{labels},phase="{_prom_escape(phase)}"}} {s}')
+    lines += [
+        "# HELP ops_etl_last_run_count Counters of the last run (rows, batches, bytes, retries).",
+        "# TYPE ops_etl_last_run_count gauge",
+    ]
+    for k, v in report["counters"].items():
+        lines.append(f'ops_etl_last_run_count{{{labels},counter="{_prom_escape(k)}"}} {v}')
+    throttle = report.get("throttle")
+    if throttle:
+        lines += [
+            "# HELP ops_etl_last_run_throttle_seconds Time the last run slept to stay under its write-rate ceilings.",
+            "# TYPE ops_etl_last_run_throttle_seconds gauge",
+            f"ops_etl_last_run_throttle_seconds{{{labels}}} {throttle['slept_seconds']}",
+            "# HELP ops_etl_last_run_throttle_rows_per_second_limit Effective rows/sec ceiling at the end of the last run (0 = none).",
+            "# TYPE ops_etl_last_run_throttle_rows_per_second_limit gauge",
+            f"ops_etl_last_run_throttle_rows_per_second_limit{{{labels}}} {throttle['rows_per_sec_limit'] or 0}",
+            "# HELP ops_etl_last_run_throttle_factor Commit-latency backoff factor at the end of the last run (1 = none).",
+            "# TYPE ops_etl_last_run_throttle_factor gauge",
+            f"ops_etl_last_run_throttle_factor{{{labels}}} {throttle['factor']}",
+        ]
+
+    d = Path(prom_dir)
+    d.mkdir(parents=True, exist_ok=True)
+    key = re.sub(r"[^A-Za-z0-9_]", "_", f"{report['command']}_{report['dataset'] or ''}").strip("_")
+    p = d / f"ops_etl_{key}.prom"
+    # unique tmp name: concurrent runs (ops serve workers) may write the same file
+    tmp = p.with_name(f"{p.name}.{report['run_id'][:8]}.tmp")
+    tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    os.replace(tmp, p)
+    return str(p)
+
+
+INSERT_RUN_SQL = """
+INSERT INTO dbo.etl_runs(
+    run_id, command, dataset, source, status, error, host, started_at, finished_at, seconds,
+    rows_read, rows_good, rows_bad, rows_skipped, batches, bytes_read, retries, rows_per_sec, phases_json
+)
+VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?);
+"""
+
+
+def _write_history(report: dict[str, Any], table: str) -> str | None:
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        if not get_catalog().table_exists(cur, table):
+            return None  # not migrated yet; JSON / textfile still cover this run
+        c = report["counters"]
+        cur.execute(
+            INSERT_RUN_SQL,
+            (
+                report["run_id"],
+                report["command"],
+                report["dataset"],
+                report["source"],
+                report["status"],
+                report["error"],
+                report["host"],
+                datetime.fromisoformat(report["started_at"]).replace(tzinfo=None),
+                datetime.fromisoformat(report["finished_at"]).replace(tzinfo=None),
+                report["seconds"],
+                c["rows_read"],
+                c["rows_good"],
+                c["rows_bad"],
+                c["rows_skipped"],
+                c["batches"],
+                c["bytes_read"],
+                c["retries"],
+                report["rows_per_sec"],
+                json.dumps(report["phases"]),
+            ),
+        )
+        conn.commit()
+        return table
+    finally:
+        conn.close()
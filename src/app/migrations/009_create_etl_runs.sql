@@ -0,0 +1,28 @@
+IF OBJECT_ID('dbo.etl_runs','U') IS NULL
+BEGIN
+    CREATE TABLE dbo.etl_runs (
+        run_id        CHAR(32)       NOT NULL PRIMARY KEY,
+        command       NVARCHAR(100)  NOT NULL,
+        dataset       NVARCHAR(200)  NULL,
+        source        NVARCHAR(500)  NULL,
+        status        NVARCHAR(20)   NOT NULL,
+        error         NVARCHAR(2000) NULL,
+        host          NVARCHAR(200)  NULL,
+        started_at    DATETIME2(3)   NOT NULL,
+        finished_at   DATETIME2(3)   NOT NULL,
+        seconds       FLOAT          NOT NULL,
+        rows_read     BIGINT         NOT NULL DEFAULT 0,
+        rows_good     BIGINT         NOT NULL DEFAULT 0,
+        rows_bad      BIGINT         NOT NULL DEFAULT 0,
+        rows_skipped  BIGINT         NOT NULL DEFAULT 0,
+        batches       INT            NOT NULL DEFAULT 0,
+        bytes_read    BIGINT         NOT NULL DEFAULT 0,
+        retries       INT            NOT NULL DEFAULT 0,
+        rows_per_sec  FLOAT          NULL,
+        phases_json   NVARCHAR(MAX)  NULL
+    );
+
+    CREATE INDEX IX_etl_runs_command_started
+        ON dbo.etl_runs(command, started_at);
+END
+GO
@@ -0,0 +1,13 @@
+IF OBJECT_ID('dbo.load_checkpoints','U') IS NULL
+BEGIN
+    CREATE TABLE dbo.load_checkpoints (
+        target_table  NVARCHAR(128)  NOT NULL,
+        source_file   NVARCHAR(300)  NOT NULL,
+        byte_offset   BIGINT         NOT NULL,
+        line_num      BIGINT         NOT NULL,
+        rows_loaded   BIGINT         NOT NULL,
+        updated_at    DATETIME2(0)   NOT NULL DEFAULT SYSUTCDATETIME(),
+        CONSTRAINT PK_load_checkpoints PRIMARY KEY (target_table, source_file)
+    );
+END
+GO
@@ -0,0 +1,29 @@
+IF OBJECT_ID('dbo.dataset_rejects_summary','U') IS NULL
+BEGIN
+    CREATE TABLE dbo.dataset_rejects_summary (
+        dataset_name  NVARCHAR(100)  NOT NULL,
+        source_file   NVARCHAR(500)  NOT NULL,  -- '' when the rejects have none
+        reason        NVARCHAR(200)  NOT NULL,  -- one reject_reasons token; '*' = rejected rows
+        reject_day    DATE           NOT NULL,  -- UTC
+        reject_count  BIGINT         NOT NULL,
+        updated_at    DATETIME2(0)   NOT NULL DEFAULT SYSUTCDATETIME(),
+        CONSTRAINT PK_dataset_rejects_summary PRIMARY KEY (dataset_name, source_file, reason, reject_day)
+    );
+END
+GO
+-- backfill from the rejects already stored
+IF NOT EXISTS (SELECT 1 FROM dbo.dataset_rejects_summary)
+BEGIN
+    INSERT INTO dbo.dataset_rejects_summary(dataset_name, source_file, reason, reject_day, reject_count)
+    SELECT r.dataset_name, COALESCE(r.source_file, N''), N'*', CAST(r.created_at AS DATE), COUNT_BIG(*)
+    FROM dbo.dataset_rejects r
+    GROUP BY r.dataset_name, COALESCE(r.source_file, N''), CAST(r.created_at AS DATE);
+
+    INSERT INTO dbo.dataset_rejects_summary(dataset_name, source_file, reason, reject_day, reject_count)
+    SELECT r.dataset_name, COALESCE(r.source_file, N''), LEFT(s.value, 200), CAST(r.created_at AS DATE), COUNT_BIG(DISTINCT r.reject_id)
+    FROM dbo.dataset_rejects r
+    CROSS APPLY STRING_SPLIT(r.reject_reasons, N'|') s
+    WHERE s.value <> N''
+    GROUP BY r.dataset_name, COALESCE(r.source_file, N''), LEFT(s.value, 200), CAST(r.created_at AS DATE);
+END
+GO
@@ -0,0 +1,8 @@
+-- opt-in compressed reject payloads (OPS_REJECTS_COMPRESS, app.reject_store):
+-- raw_json_z = COMPRESS(raw_json) (gzip of the NVARCHAR bytes), raw_json = N''.
+-- Existing rows are compressed by `ops rejects_compress`, in committed batches.
+IF COL_LENGTH('dbo.dataset_rejects', 'raw_json_z') IS NULL
+BEGIN
+    ALTER TABLE dbo.dataset_rejects ADD raw_json_z VARBINARY(MAX) NULL;
+END
+GO
@@ -0,0 +1,32 @@
+-- trigram index for find_people substring search (app.people_search), kept in
+-- sync by people_repo writes. Trigrams are taken from LOWER(full_name).
+IF OBJECT_ID('dbo.people_name_trigrams','U') IS NULL
+BEGIN
+    CREATE TABLE dbo.people_name_trigrams (
+        trigram    NCHAR(3)  NOT NULL,
+        person_id  BIGINT    NOT NULL,
+        CONSTRAINT PK_people_name_trigrams PRIMARY KEY (trigram, person_id)
+    );
+
+    CREATE INDEX IX_people_name_trigrams_person
+        ON dbo.people_name_trigrams(person_id);
+END
+GO
+-- backfill the people already stored (`ops people_trigrams_rebuild` redoes it in batches).
+-- Windows are UTF-16 units; ones holding a surrogate (55296-57343) are skipped,
+-- like people_search.name_trigrams.
+IF NOT EXISTS (SELECT 1 FROM dbo.people_name_trigrams)
+BEGIN
+    WITH n AS (
+        SELECT TOP (200) ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) AS i
+        FROM sys.all_columns
+    )
+    INSERT INTO dbo.people_name_trigrams(trigram, person_id)
+    SELECT DISTINCT SUBSTRING(LOWER(p.full_name), n.i, 3), p.person_id
+    FROM dbo.people p
+    JOIN n ON n.i <= DATALENGTH(p.full_name) / 2 - 2
+    WHERE UNICODE(SUBSTRING(p.full_name, n.i, 1)) NOT BETWEEN 55296 AND 57343
+      AND UNICODE(SUBSTRING(p.full_name, n.i + 1, 1)) NOT BETWEEN 55296 AND 57343
+      AND UNICODE(SUBSTRING(p.full_name, n.i + 2, 1)) NOT BETWEEN 55296 AND 57343;
+END
+GO
@@ -0,0 +1,8 @@
+-- identity of the file a checkpoint belongs to (app.loaders.jsonl_loader):
+-- SHA-256 of its first head_bytes (decompressed) bytes. A file replaced under the
+-- same name (a daily orders.jsonl) no longer resumes at the old byte offset.
+IF COL_LENGTH('dbo.load_checkpoints', 'head_sha256') IS NULL
+BEGIN
+    ALTER TABLE dbo.load_checkpoints ADD head_bytes BIGINT NULL, head_sha256 VARBINARY(32) NULL;
+END
+GO
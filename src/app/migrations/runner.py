@@ -2,30 +2,13 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import pyodbc
-
-from app.config import get_db_config
+from app.backends import get_backend
+from app.catalog import get_catalog
+from app.db import get_conn
 
 MIGRATIONS_DIR = Path(__file__).parent
 
 
-def get_conn():
-    cfg = get_db_config()
-
-    if cfg.trusted:
-        conn_str = (
-            f"DRIVER={{{cfg.driver}}};"
-            f"SERVER={cfg.server};"
-            f"DATABASE={cfg.database};"
-            "Trusted_Connection=yes;"
-            "TrustServerCertificate=yes;"
-        )
-    else:
-        raise RuntimeError("Non-trusted connection not implemented yet (set MSSQL_TRUSTED=true).")
-
-    return pyodbc.connect(conn_str, autocommit=False)
-
-
 def _split_go_batches(sql: str) -> list[str]:
     parts: list[str] = []
     buf: list[str] = []
@@ -63,8 +46,15 @@ def list_migration_files() -> list[Path]:
 
 
 def apply_migrations() -> int:
+    backend = get_backend()
     conn = get_conn()
     try:
+        if not backend.supports_migrations:
+            # the .sql files are T-SQL; other backends create the same core tables themselves
+            created = backend.apply_schema(conn)
+            print(f"applied ✅ {backend.name} schema objects_created={created}")
+            return created
+
         ensure_migrations_table(conn)
         conn.commit()
 
@@ -99,5 +89,7 @@ def apply_migrations() -> int:
         return applied_count
     finally:
         conn.close()
+        # migrations are DDL: cached table/column/index lookups are stale now
+        get_catalog().invalidate()
 
 
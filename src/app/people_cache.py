@@ -0,0 +1,185 @@
+# src/app/people_cache.py
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+# Optional in-process read-through cache for people_repo (OPS_PEOPLE_CACHE=1,
+# or set_people_cache() from tools that import the repo).
+#
+# get_person results (misses included) and small list_people / find_people pages
+# share one LRU with a TTL and an entry bound. Writes through people_repo
+# (add_person, add_person_if_missing and so the CSV importer, update_person_name,
+# delete_person) invalidate after their commit: the person's by-id entry and every
+# page, since any insert / rename / delete can change any page. Each invalidation
+# bumps a generation; a read that started before it doesn't store what it read,
+# so a lookup racing a write can't put the pre-write row back.
+#
+# Writes from other processes are only seen once the TTL expires.
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU: at most max_entries, each valid for ttl seconds.
+    """
+
+    def __init__(self, *, max_entries: int = 10_000, ttl: float = 30.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at, value), least recently used first
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    def get(self, key: Any, default: Any = _MISSING) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[0] <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Any, value: Any, *, generation: int | None = None) -> bool:
+        """
+        Stores value unless an invalidation happened since `generation` was read.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                self.stale_puts += 1
+                return False
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, keys: tuple[Any, ...] = (), *, where: Callable[[Any], bool] | None = None) -> None:
+        """
+        Drops `keys` and every key matching `where`; always bumps the generation.
+        """
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            for k in keys:
+                self._data.pop(k, None)
+            if where is not None:
+                for k in [k for k in self._data if where(k)]:
+                    del self._data[k]
+
+    def clear(self) -> None:
+        self.invalidate(where=lambda _k: True)
+
+    @property
+    def hit_rate(self) -> float:
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hit_rate, 4),
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_puts": self.stale_puts,
+            }
+
+
+def _is_page(key: Any) -> bool:
+    return key[0] != "id"
+
+
+class PeopleCache:
+    """
+    people_repo's view of a TTLCache. Keys: ("id", person_id), ("list", top),
+    ("find", like, top).
+    """
+
+    def __init__(self, *, max_entries: int = 10_000, ttl: float = 30.0, max_page_rows: int = 100) -> None:
+        self.cache = TTLCache(max_entries=max_entries, ttl=ttl)
+        self.max_page_rows = max_page_rows
+
+    def person(self, person_id: int, load: Callable[[], Any]) -> Any:
+        key = ("id", person_id)
+        generation = self.cache.generation
+        v = self.cache.get(key)
+        if v is _MISSING:
+            v = load()
+            self.cache.put(key, v, generation=generation)
+        return v
+
+    def page(self, key: tuple[Any, ...], top: int, load: Callable[[], list[Any]]) -> list[Any]:
+        if top > self.max_page_rows:
+            return load()
+        generation = self.cache.generation
+        v = self.cache.get(key)
+        if v is _MISSING:
+            v = tuple(load())
+            self.cache.put(key, v, generation=generation)
+        return list(v)
+
+    def people_changed(self, *person_ids: int) -> None:
+        """
+        Call after committing inserts / updates / deletes of these people.
+        """
+        self.cache.invalidate(tuple(("id", int(i)) for i in person_ids), where=_is_page)
+
+    def stats(self) -> dict[str, Any]:
+        return self.cache.stats()
+
+
+_cache: PeopleCache | None = None
+_configured = False
+_cache_lock = threading.Lock()
+
+
+def set_people_cache(cache: PeopleCache | None) -> None:
+    """
+    Installs (or with None removes) the process-wide cache, overriding OPS_PEOPLE_CACHE.
+    """
+    global _cache, _configured
+    with _cache_lock:
+        _cache = cache
+        _configured = True
+
+
+def get_people_cache() -> PeopleCache | None:
+    """
+    The process-wide cache, or None when caching is off (the default).
+    """
+    global _cache, _configured
+    if _configured:
+        return _cache
+    with _cache_lock:
+        if not _configured:
+            from app.config import get_people_cache_config
+
+            cfg = get_people_cache_config()
+            if cfg.enabled:
+                _cache = PeopleCache(max_entries=cfg.max_entries, ttl=cfg.ttl_seconds, max_page_rows=cfg.max_page_rows)
+            _configured = True
+        return _cache
@@ -1,6 +1,21 @@
 from __future__ import annotations
 
+from typing import Iterable, Sequence
+
+from app.backends import get_backend
 from app.db import get_conn
+from app.people_cache import get_people_cache
+from app.people_search import TRIGRAM_TABLE, index_people, search_sql, unindex_people
+
+# Reads go through the optional in-process cache (app.people_cache, off by
+# default); writes invalidate it after they commit. Writes also maintain the
+# name trigram index (app.people_search) in their own transaction.
+
+
+def _people_changed(*person_ids: int) -> None:
+    cache = get_people_cache()
+    if cache is not None:
+        cache.people_changed(*person_ids)
 
 
 def add_person(full_name: str) -> int:
@@ -12,11 +27,13 @@ def add_person(full_name: str) -> int:
     try:
         cur = conn.cursor()
         cur.execute(
-            "INSERT INTO dbo.people(full_name) OUTPUT INSERTED.person_id VALUES (?);",
+            get_backend().insert_returning_sql("dbo.people", ["full_name"], "person_id"),
             (full_name,),
         )
         person_id = int(cur.fetchone()[0])
+        index_people(cur, [(person_id, full_name)])
         conn.commit()
+        _people_changed(person_id)
         return person_id
     finally:
         conn.close()
@@ -26,16 +43,23 @@ def list_people(top: int = 20) -> list[tuple[int, str, str]]:
     """
     Returns rows: (person_id, full_name, created_at_iso)
     """
+    cache = get_people_cache()
+    if cache is not None:
+        return cache.page(("list", top), top, lambda: _list_people(top))
+    return _list_people(top)
+
+
+def _list_people(top: int) -> list[tuple[int, str, str]]:
+    backend = get_backend()
     conn = get_conn()
     try:
         cur = conn.cursor()
         cur.execute(
-            """
-            SELECT TOP (?) person_id, full_name, created_at
+            f"""
+            SELECT {backend.top_sql(top)}person_id, full_name, created_at
             FROM dbo.people
-            ORDER BY person_id DESC;
-            """,
-            (top,),
+            ORDER BY person_id DESC{backend.limit_sql(top)};
+            """
         )
         rows: list[tuple[int, str, str]] = []
         for person_id, full_name, created_at in cur.fetchall():
@@ -50,19 +74,19 @@ def find_people(like: str, top: int = 20) -> list[tuple[int, str, str]]:
     Search by substring on full_name.
     Returns rows: (person_id, full_name, created_at_iso)
     """
+    cache = get_people_cache()
+    if cache is not None:
+        return cache.page(("find", like, top), top, lambda: _find_people(like, top))
+    return _find_people(like, top)
+
+
+def _find_people(like: str, top: int) -> list[tuple[int, str, str]]:
     conn = get_conn()
     try:
         cur = conn.cursor()
-        pattern = f"%{like}%"
-        cur.execute(
-            """
-            SELECT TOP (?) person_id, full_name, created_at
-            FROM dbo.people
-            WHERE full_name LIKE ?
-            ORDER BY person_id DESC;
-            """,
-            (top, pattern),
-        )
+        # trigram candidates + exact LIKE; plain scan for patterns under 3 chars
+        sql, params = search_sql(like, top)
+        cur.execute(sql, params)
         rows: list[tuple[int, str, str]] = []
         for person_id, full_name, created_at in cur.fetchall():
             rows.append((int(person_id), str(full_name), created_at.isoformat(sep=" ")))
@@ -81,7 +105,10 @@ def delete_person(person_id: int) -> int:
         cur = conn.cursor()
         cur.execute("DELETE FROM dbo.people WHERE person_id = ?;", (person_id,))
         deleted = int(cur.rowcount)
+        if deleted:
+            unindex_people(cur, [person_id])
         conn.commit()
+        _people_changed(person_id)
         return deleted
     finally:
         conn.close()
@@ -90,6 +117,13 @@ def get_person(person_id: int) -> tuple[int, str, str] | None:
     """
     Returns (person_id, full_name, created_at_iso) or None if not found.
     """
+    cache = get_people_cache()
+    if cache is not None:
+        return cache.person(person_id, lambda: _get_person(person_id))
+    return _get_person(person_id)
+
+
+def _get_person(person_id: int) -> tuple[int, str, str] | None:
     conn = get_conn()
     try:
         cur = conn.cursor()
@@ -122,7 +156,11 @@ def update_person_name(person_id: int, full_name: str) -> int:
             (full_name, person_id),
         )
         updated = int(cur.rowcount)
+        if updated:
+            unindex_people(cur, [person_id])
+            index_people(cur, [(person_id, full_name)])
         conn.commit()
+        _people_changed(person_id)
         return updated
     finally:
         conn.close()
@@ -150,14 +188,114 @@ def add_person_if_missing(full_name: str) -> tuple[bool, int | None]:
             return (False, None)
 
         cur.execute(
-            "INSERT INTO dbo.people(full_name) OUTPUT INSERTED.person_id VALUES (?);",
+            get_backend().insert_returning_sql("dbo.people", ["full_name"], "person_id"),
             (full_name,),
         )
         person_id = int(cur.fetchone()[0])
+        index_people(cur, [(person_id, full_name)])
         conn.commit()
+        _people_changed(person_id)
         return (True, person_id)
     finally:
         conn.close()
 
-      
 
+# ---------- Batch ----------
+# One connection per call and one transaction per chunk of chunk_size rows, so a
+# failure leaves the earlier chunks committed. Ids / pairs go through a temp table
+# joined against dbo.people instead of one statement per row.
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    if size <= 0:
+        raise RuntimeError(f"chunk_size must be positive, got {size}")
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _fill_temp(cur, name: str, columns_sql: str, insert_cols: str, rows: Sequence[tuple]) -> str:
+    backend = get_backend()
+    tmp = backend.temp_table_name(name)
+    for stmt in backend.create_temp_table_sql(name, columns_sql):
+        cur.execute(stmt)
+    placeholders = ", ".join("?" for _ in rows[0])
+    backend.bulk_insert(cur, f"INSERT INTO {tmp}({insert_cols}) VALUES ({placeholders});", rows)
+    return tmp
+
+
+def add_people(names: Sequence[str], *, chunk_size: int = 1000) -> list[int]:
+    """
+    Inserts names into dbo.people (duplicates included, like add_person).
+    Returns the new person_ids in the order of names.
+    """
+    backend = get_backend()
+    ids: list[int] = []
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        for chunk in _chunks(list(names), chunk_size):
+            new_ids = [int(i) for i in backend.insert_many_returning(cur, "dbo.people", "full_name", chunk, "person_id")]
+            index_people(cur, zip(new_ids, chunk))
+            conn.commit()
+            _people_changed(*new_ids)
+            ids.extend(new_ids)
+        return ids
+    finally:
+        conn.close()
+
+
+def delete_people(person_ids: Sequence[int], *, chunk_size: int = 1000) -> int:
+    """
+    Deletes people by id (unknown ids are ignored).
+    Returns number of rows deleted.
+    """
+    unique = list(dict.fromkeys(int(i) for i in person_ids))
+    deleted = 0
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        for chunk in _chunks(unique, chunk_size):
+            tmp = _fill_temp(cur, "people_batch_ids", "person_id BIGINT NOT NULL PRIMARY KEY", "person_id", [(i,) for i in chunk])
+            cur.execute(f"DELETE FROM dbo.people WHERE person_id IN (SELECT person_id FROM {tmp});")
+            n = int(cur.rowcount)
+            if n:
+                cur.execute(f"DELETE FROM {TRIGRAM_TABLE} WHERE person_id IN (SELECT person_id FROM {tmp});")
+            conn.commit()
+            _people_changed(*chunk)
+            deleted += n
+        return deleted
+    finally:
+        conn.close()
+
+
+def update_people(pairs: Iterable[tuple[int, str]], *, chunk_size: int = 1000) -> int:
+    """
+    Sets full_name for each (person_id, full_name) pair; the last pair wins for a
+    repeated id and unknown ids are ignored.
+    Returns rows updated.
+    """
+    backend = get_backend()
+    latest = {int(pid): name for pid, name in pairs}
+    updated = 0
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        for chunk in _chunks(list(latest.items()), chunk_size):
+            tmp = _fill_temp(
+                cur,
+                "people_batch_names",
+                f"person_id BIGINT NOT NULL PRIMARY KEY, full_name {backend.nvarchar_sql(200)} NOT NULL",
+                "person_id, full_name",
+                chunk,
+            )
+            cur.execute(backend.update_from_sql("dbo.people", tmp, "person_id", ["full_name"]))
+            n = int(cur.rowcount)
+            if n:
+                # re-index only the ids that exist
+                cur.execute(f"DELETE FROM {TRIGRAM_TABLE} WHERE person_id IN (SELECT person_id FROM {tmp});")
+                cur.execute(f"SELECT s.person_id, s.full_name FROM {tmp} s JOIN dbo.people p ON p.person_id = s.person_id;")
+                index_people(cur, [(int(pid), str(name)) for pid, name in cur.fetchall()])
+            conn.commit()
+            _people_changed(*(pid for pid, _name in chunk))
+            updated += n
+        return updated
+    finally:
+        conn.close()
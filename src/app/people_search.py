@@ -0,0 +1,153 @@
+# src/app/people_search.py
+from __future__ import annotations
+
+from typing import Any, Iterable, Sequence
+
+from app.backends import get_backend
+from app.db import get_conn
+
+# Trigram index behind find_people.
+#
+# `full_name LIKE '%x%'` can't seek, so a plain search scans dbo.people.
+# dbo.people_name_trigrams holds one (trigram, person_id) row per distinct
+# 3-character window of LOWER(full_name). A search for x (3+ characters, no LIKE
+# wildcards) intersects the posting lists of x's trigrams, each one PK range
+# seek already in person_id order, and runs the exact LIKE only on those
+# candidates, so results match the scan. Shorter patterns and patterns with
+# % _ [ still scan.
+#
+# Trigrams are lower-cased to line up with the case-insensitive collation.
+# They are counted in UTF-16 units like SUBSTRING / NCHAR(3) on SQL Server, and
+# windows holding a surrogate (a character outside the BMP, an emoji) are left
+# out: every indexed trigram is 3 BMP characters on both sides, and patterns
+# with such characters scan instead.
+# people_repo writes keep the table in sync in the same transaction as the
+# people rows; rebuild_trigrams() recreates it from scratch.
+
+PEOPLE_TABLE = "dbo.people"
+TRIGRAM_TABLE = "dbo.people_name_trigrams"
+MIN_PATTERN = 3
+MAX_PATTERN_TRIGRAMS = 4
+_LIKE_SPECIAL = ("%", "_", "[")
+
+
+def _has_astral(s: str) -> bool:
+    # takes two UTF-16 units (a surrogate pair) on SQL Server
+    return any(ord(c) > 0xFFFF for c in s)
+
+
+def name_trigrams(name: str) -> set[str]:
+    s = (name or "").lower()
+    grams = {s[i : i + 3] for i in range(len(s) - 2)}
+    if _has_astral(s):
+        grams = {g for g in grams if not _has_astral(g)}
+    return grams
+
+
+def can_use_index(like: str) -> bool:
+    return len(like) >= MIN_PATTERN and not any(c in like for c in _LIKE_SPECIAL) and not _has_astral(like)
+
+
+def index_people(cur, people: Iterable[tuple[int, str]], *, table: str = TRIGRAM_TABLE) -> int:
+    """
+    Inserts the trigrams of (person_id, full_name) pairs; no commit. Returns rows written.
+    """
+    rows = [(t, int(pid)) for pid, name in people for t in name_trigrams(name)]
+    if rows:
+        get_backend().bulk_insert(cur, f"INSERT INTO {table}(trigram, person_id) VALUES (?, ?);", rows)
+    return len(rows)
+
+
+def unindex_people(cur, person_ids: Sequence[int], *, table: str = TRIGRAM_TABLE) -> None:
+    """
+    Deletes the trigrams of these people; no commit.
+    """
+    if person_ids:
+        cur.executemany(f"DELETE FROM {table} WHERE person_id = ?;", [(int(i),) for i in person_ids])
+
+
+def pattern_trigrams(like: str, limit: int = MAX_PATTERN_TRIGRAMS) -> list[str]:
+    """
+    Trigrams to look up for a search: non-overlapping windows covering the pattern
+    (plus the last one), at most `limit`. The LIKE recheck makes up for the rest.
+    """
+    s = like.lower()
+    starts = list(range(0, len(s) - 2, 3))
+    if starts[-1] != len(s) - 3:
+        starts.append(len(s) - 3)
+    return list(dict.fromkeys(s[i : i + 3] for i in starts))[:limit]
+
+
+def search_sql(
+    like: str,
+    top: int,
+    *,
+    people_table: str = PEOPLE_TABLE,
+    trigram_table: str = TRIGRAM_TABLE,
+    use_index: bool = True,
+) -> tuple[str, tuple[Any, ...]]:
+    """
+    (sql, params) for find_people: newest `top` people whose full_name contains `like`.
+    """
+    backend = get_backend()
+    order = f" ORDER BY {{id}} DESC{backend.limit_sql(top)};"
+    pattern = f"%{like}%"
+    if not (use_index and can_use_index(like)):
+        return (
+            f"SELECT {backend.top_sql(top)}person_id, full_name, created_at FROM {people_table}"
+            f" WHERE full_name LIKE ?{order.format(id='person_id')}",
+            (pattern,),
+        )
+    # posting lists joined on person_id, walked newest first: the engine can stop
+    # after `top` matches instead of materializing a common trigram's whole list
+    first, *rest = pattern_trigrams(like)
+    joins = "".join(
+        f" JOIN {trigram_table} t{k} ON t{k}.trigram = ? AND t{k}.person_id = t0.person_id"
+        for k in range(1, len(rest) + 1)
+    )
+    sql = (
+        f"SELECT {backend.top_sql(top)}p.person_id, p.full_name, p.created_at"
+        f" FROM {trigram_table} t0{joins}"
+        f" JOIN {people_table} p ON p.person_id = t0.person_id"
+        f" WHERE t0.trigram = ? AND p.full_name LIKE ?{order.format(id='t0.person_id')}"
+    )
+    return sql, (*rest, first, pattern)
+
+
+def rebuild_trigrams(
+    *,
+    people_table: str = PEOPLE_TABLE,
+    trigram_table: str = TRIGRAM_TABLE,
+    batch_size: int = 10_000,
+) -> dict[str, int]:
+    """
+    Empties the trigram table and re-indexes every person, one committed batch at a
+    time. Searches miss the people not re-indexed yet while it runs.
+    """
+    backend = get_backend()
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute(backend.truncate_sql(trigram_table))
+        conn.commit()
+
+        select_sql = f"""
+        SELECT {backend.top_sql(batch_size)}person_id, full_name FROM {people_table}
+        WHERE person_id > ?
+        ORDER BY person_id{backend.limit_sql(batch_size)};
+        """
+        last = 0
+        people = trigrams = 0
+        while True:
+            cur.execute(select_sql, (last,))
+            rows = [(int(pid), str(name)) for pid, name in cur.fetchall()]
+            if not rows:
+                break
+            trigrams += index_people(cur, rows, table=trigram_table)
+            conn.commit()
+            people += len(rows)
+            last = rows[-1][0]
+            print(f"indexed... {people}")
+        return {"people": people, "trigrams": trigrams}
+    finally:
+        conn.close()
@@ -0,0 +1,206 @@
+# src/app/pipeline.py
+from __future__ import annotations
+
+import itertools
+import time
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable
+
+from app.backends import get_backend
+from app.catalog import get_catalog
+from app.db import get_conn
+from app.loaders.csv_loader import create_staging_table, iter_csv_rows, require_confirm
+from app.loaders.jsonl_loader import read_checkpoint, save_checkpoint
+from app.metrics import RunMetrics
+from app.transform_framework import (
+    BatchValidator,
+    DatasetSpec,
+    FinalWriter,
+    batch_casters,
+    batch_periods,
+    make_batch,
+    print_memo_stats,
+)
+from app.transform_schema import (
+    check_reload_partitions,
+    create_shadow_table,
+    drop_shadow_table,
+    ensure_partition_boundaries,
+    swap_in_shadow,
+    switch_in_partitions,
+)
+
+
+def run_pipeline(
+    spec: DatasetSpec,
+    *,
+    csv_path: str,
+    source_file: str | None = None,
+    batch_size: int = 2000,
+    delimiter: str = ",",
+    quotechar: str = '"',
+    skiprows: int = 0,
+    truncate_final: bool = False,
+    truncate_rejects: bool = False,
+    pk_mode: str = "server",  # "server" | "client"
+    stage: bool = False,
+    confirm: str | None = None,
+    swap: bool = False,
+    reload_partitions: bool = False,
+    checkpoint_key: str | None = None,
+) -> dict[str, int]:
+    """
+    One pass CSV -> spec.final_table + dbo.dataset_rejects, no staging round trip.
+
+    Header columns (normalized like load_csv) are mapped to FieldRule.source,
+    rows are cast / validated in RowBatches with the transform's rule engine
+    and written through the same FinalWriter. row_num is the data record
+    number in the file (1 = first row after the header).
+
+    stage=True also writes every raw CSV row to spec.stg_table (audit copy);
+    the staging table is recreated, so it requires confirm: "DROP_CREATE <stg_table>".
+
+    swap=True is a full reload through a shadow table, like transform_dataset(swap=True);
+    reload_partitions=True replaces only the periods in the file, like
+    transform_dataset(reload_partitions=True).
+
+    checkpoint_key: the number of data rows committed is saved in dbo.load_checkpoints
+    (target_table=spec.final_table, source_file=checkpoint_key) in the same
+    transaction as each batch, and a rerun with the same key skips those rows
+    instead of rejecting them twice. The key must identify the file's content
+    (the serve daemon passes name:size:mtime). Not with swap / reload_partitions /
+    truncate_final, which restart from scratch anyway.
+
+    Assumes spec.final_table exists (see ensure_final_table_from_spec).
+    """
+    if swap and truncate_final:
+        raise RuntimeError("swap already replaces the final table; don't combine it with truncate_final")
+    if checkpoint_key is not None and (swap or reload_partitions or truncate_final or stage):
+        raise RuntimeError("checkpoint_key resumes into the final table; don't combine it with swap, reload_partitions, truncate_final or stage")
+    if reload_partitions:
+        check_reload_partitions(spec, swap=swap, truncate_final=truncate_final)
+    header, rows = iter_csv_rows(csv_path, delimiter=delimiter, quotechar=quotechar, skiprows=skiprows)
+    source_file = source_file or csv_path
+
+    pos = {c.lower(): i for i, c in enumerate(header)}
+    missing = [fr.source for fr in spec.fields if fr.source.lower() not in pos]
+    if missing:
+        raise RuntimeError(f"CSV is missing columns for spec {spec.name}: {missing} (CSV columns={header})")
+    picks = [pos[fr.source.lower()] for fr in spec.fields]
+    width = len(header)
+
+    if stage:
+        require_confirm("DROP_CREATE", spec.stg_table, confirm)
+
+    backend = get_backend()
+    metrics = RunMetrics("pipeline", dataset=spec.name, source=source_file)
+    conn = get_conn()
+    shadow = None
+    periods: set[date] | None = set() if reload_partitions else None
+    try:
+        if swap or reload_partitions:
+            shadow = create_shadow_table(spec, conn)
+        validator = BatchValidator(spec, get_catalog().table(conn.cursor(), shadow or spec.final_table))
+        writer = FinalWriter(
+            spec if shadow is None else replace(spec, final_table=shadow),
+            conn,
+            validator,
+            source_file=source_file,
+            truncate_final=truncate_final or shadow is not None,
+            truncate_rejects=truncate_rejects,
+            pk_mode=pk_mode,
+            metrics=metrics,
+        )
+        cur = conn.cursor()
+
+        stage_sql = None
+        stage_sizes = None
+        if stage:
+            create_staging_table(cur, spec.stg_table, header)
+            conn.commit()
+            cols_sql = ",".join([backend.quote_ident(c) for c in header])
+            stage_sql = f"INSERT INTO {spec.stg_table} ({cols_sql}) VALUES ({','.join(['?'] * width)});"
+            stage_sizes = get_catalog().input_sizes(cur, spec.stg_table, header)
+
+        total = 0
+        loaded = 0
+        if checkpoint_key is not None:
+            saved = read_checkpoint(cur, spec.final_table, checkpoint_key)
+            if saved is not None:
+                _offset, total, loaded, _head_len, _head_sha = saved
+                rows = itertools.islice(rows, total, None)
+                print(f"pipeline ✅ resuming dataset={spec.name} csv={csv_path} after_row={total}")
+        resumed = total
+        casters: list[Callable[[Any], Any]] | None = None
+        buf: list[list[str]] = []
+
+        def flush() -> None:
+            nonlocal total, casters, periods
+            # pad/trim to header length, like load_csv
+            full = [r + [""] * (width - len(r)) if len(r) < width else r[:width] for r in buf]
+            picked = [tuple(r[i] for i in picks) for r in full]
+            if casters is None:
+                # first batch doubles as the cardinality sample for memo=None fields
+                casters = batch_casters(spec, sample=picked)
+            batch = make_batch(
+                spec, picked, validator=validator, first_row_num=total + 1, casters=casters, metrics=metrics
+            )
+            total += batch.n
+            metrics.count("rows_read", batch.n)
+            if stage_sql is not None:
+                with metrics.phase("stage"):
+                    backend.bulk_insert(cur, stage_sql, full, sizes=stage_sizes)
+            if periods is not None:
+                new = batch_periods(spec, batch) - periods
+                if new:
+                    with metrics.phase("split"):
+                        ensure_partition_boundaries(spec, conn, new)
+                    periods |= new
+            # commits the staging rows too, so staging and final stay in step;
+            # the checkpoint goes in the same transaction
+            writer.write(batch, on_commit=None if checkpoint_key is None else save_progress)
+
+        def save_progress(c) -> None:
+            # byte_offset stays 0: CSV rows are re-parsed from the top and skipped
+            save_checkpoint(c, spec.final_table, checkpoint_key, 0, total, loaded + writer.good)
+
+        # "read" = time spent pulling rows out of the CSV between flushes
+        t_read = time.perf_counter()
+        for row in rows:
+            buf.append(row)
+            if len(buf) >= batch_size:
+                metrics.add_time("read", time.perf_counter() - t_read)
+                flush()
+                buf = []
+                t_read = time.perf_counter()
+        metrics.add_time("read", time.perf_counter() - t_read)
+        if buf:
+            flush()
+        metrics.count("bytes_read", Path(csv_path).stat().st_size)
+
+        swapped = ""
+        if shadow is not None:
+            if periods is None:
+                swap_seconds = swap_in_shadow(spec, conn, shadow, metrics=metrics)
+                swapped = f" swapped=1 swap_seconds={swap_seconds:.3f}"
+            else:
+                switch_seconds = switch_in_partitions(spec, conn, shadow, periods, metrics=metrics)
+                swapped = f" partitions={len(periods)} switch_seconds={switch_seconds:.3f}"
+            shadow = None
+
+        print_memo_stats(casters)
+        print(
+            f"pipeline ✅ dataset={spec.name} csv={csv_path} total={total} "
+            f"good={writer.good} bad={writer.bad} skipped={writer.skipped} staged={total if stage else 0} "
+            f"resumed={resumed}{swapped}"
+        )
+        metrics.finish()
+        return {"total": total, "good": writer.good, "bad": writer.bad, "skipped": writer.skipped}
+    finally:
+        if shadow is not None:
+            # failed before the swap: the final table was never touched
+            drop_shadow_table(spec, conn)
+        conn.close()
+        metrics.close()
@@ -0,0 +1,138 @@
+# src/app/pk_index.py
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+from app.backends import get_backend
+
+# Roaring-style layout: keys are split into a high part (k >> 16) selecting a
+# container and a low 16-bit part stored inside it. Sparse containers are a
+# sorted array('H') (2 bytes/key); once a container passes ARRAY_MAX keys it
+# is converted to a fixed 8 KiB bitmap (1 bit per possible low value).
+#
+# Memory for N keys (container payload only, excluding dict overhead):
+#   dense ids (e.g. IDENTITY 1..N):  ceil(N / 65536) * 8 KiB
+#       100M keys -> 1,526 bitmaps -> ~12.5 MB
+#   sparse ids (<= 4096 per 65,536 range): ~2 bytes/key
+#       100M keys -> ~200 MB worst case
+# For comparison a sorted array('q') needs 800 MB for 100M keys and a Python
+# set of ints needs several GB. See benchmarks/pk_bitmap.py.
+
+ARRAY_MAX = 4096
+_BITMAP_BYTES = 65536 // 8
+
+
+class KeyBitmap:
+    """
+    Compact set of integer keys (compressed bitmap, roaring-style).
+    Supports add / membership only; that is all insert-if-missing needs.
+    """
+
+    __slots__ = ("_containers", "_count")
+
+    def __init__(self, keys: Iterable[int] | None = None) -> None:
+        self._containers: dict[int, array | bytearray] = {}
+        self._count = 0
+        if keys is not None:
+            self.update(keys)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, int):
+            return False
+        c = self._containers.get(key >> 16)
+        if c is None:
+            return False
+        lo = key & 0xFFFF
+        if type(c) is bytearray:
+            return bool(c[lo >> 3] & (1 << (lo & 7)))
+        i = bisect_left(c, lo)
+        return i < len(c) and c[i] == lo
+
+    def add(self, key: int) -> bool:
+        """
+        Adds key. Returns True if it was not present before.
+        """
+        hi = key >> 16
+        lo = key & 0xFFFF
+        c = self._containers.get(hi)
+
+        if c is None:
+            self._containers[hi] = array("H", (lo,))
+            self._count += 1
+            return True
+
+        if type(c) is bytearray:
+            byte = lo >> 3
+            bit = 1 << (lo & 7)
+            if c[byte] & bit:
+                return False
+            c[byte] |= bit
+            self._count += 1
+            return True
+
+        i = bisect_left(c, lo)
+        if i < len(c) and c[i] == lo:
+            return False
+        if len(c) >= ARRAY_MAX:
+            bm = bytearray(_BITMAP_BYTES)
+            for v in c:
+                bm[v >> 3] |= 1 << (v & 7)
+            bm[lo >> 3] |= 1 << (lo & 7)
+            self._containers[hi] = bm
+        else:
+            c.insert(i, lo)
+        self._count += 1
+        return True
+
+    def update(self, keys: Iterable[int]) -> None:
+        add = self.add
+        for k in keys:
+            add(k)
+
+    def __iter__(self) -> Iterator[int]:
+        for hi in sorted(self._containers):
+            c = self._containers[hi]
+            base = hi << 16
+            if type(c) is bytearray:
+                for byte, bits in enumerate(c):
+                    if bits:
+                        for b in range(8):
+                            if bits & (1 << b):
+                                yield base | (byte << 3) | b
+            else:
+                for lo in c:
+                    yield base | lo
+
+    def nbytes(self) -> int:
+        """
+        Approximate payload size of all containers in bytes.
+        """
+        total = 0
+        for c in self._containers.values():
+            if type(c) is bytearray:
+                total += len(c)
+            else:
+                total += c.itemsize * len(c)
+        return total
+
+
+def load_existing_keys(cur, table: str, column: str, *, fetch_size: int = 50_000) -> KeyBitmap:
+    """
+    Streams every key in table.column into a KeyBitmap.
+    Keys are fetched in chunks so the result set is never held in memory.
+    """
+    keys = KeyBitmap()
+    col = get_backend().quote_ident(column)
+    cur.execute(f"SELECT {col} FROM {table} WHERE {col} IS NOT NULL;")
+    while True:
+        chunk = cur.fetchmany(fetch_size)
+        if not chunk:
+            break
+        for (k,) in chunk:
+            keys.add(int(k))
+    return keys
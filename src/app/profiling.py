@@ -0,0 +1,218 @@
+# src/app/profiling.py
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+# Opt-in profiling around one ops command (global flags, see ops_cli):
+#   --profile cpu        cProfile -> <out>/<cmd>_<ts>.pstats + top-N summary (.txt)
+#   --profile mem        tracemalloc -> peak traced memory + top source lines (.txt)
+#   --sample-interval S  stack sampler thread -> folded stacks (.folded, flamegraph.pl /
+#                        speedscope input) + top-N functions; cheap enough for long runs
+
+
+def _stamp_path(out_dir: str, label: str, suffix: str) -> Path:
+    d = Path(out_dir)
+    d.mkdir(parents=True, exist_ok=True)
+    return d / f"{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}"
+
+
+def _fmt_frame(code_file: str, lineno: int, name: str) -> str:
+    return f"{name} ({Path(code_file).name}:{lineno})"
+
+
+def _func_key(frame: str) -> str:
+    # "name (file.py:12)" -> "name (file.py)"
+    return frame.rsplit(":", 1)[0] + ")"
+
+
+# ---------- cpu ----------
+def profile_cpu(fn: Callable[[], int], *, out_dir: str, label: str, top: int = 25) -> int:
+    prof = cProfile.Profile()
+    try:
+        return prof.runcall(fn)
+    finally:
+        stats_path = _stamp_path(out_dir, label, ".pstats")
+        prof.dump_stats(str(stats_path))
+
+        buf = io.StringIO()
+        st = pstats.Stats(prof, stream=buf)
+        st.sort_stats("cumulative").print_stats(top)
+        st.sort_stats("tottime").print_stats(top)
+        txt_path = stats_path.with_suffix(".txt")
+        txt_path.write_text(buf.getvalue(), encoding="utf-8")
+
+        print(f"profile ✅ cpu pstats={stats_path} summary={txt_path}")
+        print(f"{'cum s':>9} {'own s':>9} {'calls':>10}  function")
+        rows = sorted(st.stats.items(), key=lambda kv: kv[1][3], reverse=True)[:top]
+        for (file, line, name), (_cc, ncalls, tottime, cumtime, _callers) in rows:
+            print(f"{cumtime:9.3f} {tottime:9.3f} {ncalls:10d}  {_fmt_frame(file, line, name)}")
+
+
+# ---------- mem ----------
+class _PeakSnapshots(threading.Thread):
+    """
+    Polls traced memory and keeps the snapshot taken at the highest level seen,
+    so allocations can be attributed at (close to) the peak, not just at exit.
+    """
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(name="profile-mem", daemon=True)
+        self.interval = interval
+        self.stop = threading.Event()
+        self.best: tracemalloc.Snapshot | None = None
+        self.best_size = 0
+
+    def run(self) -> None:
+        while not self.stop.wait(self.interval):
+            cur, _peak = tracemalloc.get_traced_memory()
+            # 5% hysteresis: snapshots are not free
+            if cur > self.best_size * 1.05:
+                self.best = tracemalloc.take_snapshot()
+                self.best_size = cur
+
+
+def _top_lines(snap: tracemalloc.Snapshot, top: int) -> list[str]:
+    snap = snap.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ]
+    )
+    out = [f"{'KiB':>10} {'blocks':>9}  line"]
+    for s in snap.statistics("lineno")[:top]:
+        fr = s.traceback[0]
+        out.append(f"{s.size / 1024:10.1f} {s.count:9d}  {fr.filename}:{fr.lineno}")
+    return out
+
+
+def profile_mem(fn: Callable[[], int], *, out_dir: str, label: str, top: int = 25, interval: float = 0.5) -> int:
+    tracemalloc.start()
+    poller = _PeakSnapshots(interval)
+    poller.start()
+    try:
+        return fn()
+    finally:
+        poller.stop.set()
+        poller.join()
+        end = tracemalloc.take_snapshot()
+        _cur, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        at_peak = _top_lines(poller.best, top) if poller.best is not None else None
+        at_exit = _top_lines(end, top)
+        lines = [f"peak traced memory: {peak / (1024 * 1024):.1f} MiB", ""]
+        if at_peak is not None:
+            lines += [f"top lines at highest sample ({poller.best_size / (1024 * 1024):.1f} MiB):", *at_peak, ""]
+        lines += ["top lines still allocated at exit:", *at_exit]
+
+        txt_path = _stamp_path(out_dir, label, "_mem.txt")
+        txt_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        print(f"profile ✅ mem peak_mib={peak / (1024 * 1024):.1f} report={txt_path}")
+        print("\n".join(at_peak if at_peak is not None else at_exit))
+
+
+# ---------- sampling ----------
+class StackSampler(threading.Thread):
+    """
+    Samples the target thread's Python stack every `interval` seconds.
+    stacks: Counter of root-first frame tuples.
+    """
+
+    def __init__(self, interval: float, thread_id: int | None = None) -> None:
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.main_thread().ident
+        self.stop = threading.Event()
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.samples = 0
+
+    def run(self) -> None:
+        while not self.stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: list[str] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(_fmt_frame(code.co_filename, frame.f_lineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+                self.samples += 1
+
+    def folded(self) -> str:
+        return "".join(f"{';'.join(s)} {n}\n" for s, n in self.stacks.most_common())
+
+    def top(self, n: int) -> tuple[list[tuple[str, int]], Counter[str]]:
+        """
+        (top-n frames by self samples, inclusive samples per function).
+        Self samples are per line; inclusive ones ignore the line, so a function
+        counts once per sample however many of its lines are on the stack.
+        """
+        own: Counter[str] = Counter()
+        incl: Counter[str] = Counter()
+        for s, k in self.stacks.items():
+            own[s[-1]] += k
+            for fn in {_func_key(fr) for fr in s}:
+                incl[fn] += k
+        return own.most_common(n), incl
+
+
+def sample_stacks(fn: Callable[[], int], *, out_dir: str, label: str, interval: float, top: int = 25) -> int:
+    sampler = StackSampler(interval)
+    sampler.start()
+    t0 = time.perf_counter()
+    try:
+        return fn()
+    finally:
+        sampler.stop.set()
+        sampler.join()
+        elapsed = time.perf_counter() - t0
+
+        path = _stamp_path(out_dir, label, ".folded")
+        path.write_text(sampler.folded(), encoding="utf-8")
+        print(f"profile ✅ samples={sampler.samples} interval={interval}s seconds={elapsed:.1f} folded={path}")
+        own, incl = sampler.top(top)
+        total = max(1, sampler.samples)
+        print(f"{'self %':>7} {'incl %':>7}  frame")
+        for fr, k in own:
+            print(f"{100 * k / total:7.1f} {100 * incl[_func_key(fr)] / total:7.1f}  {fr}")
+
+
+def run_profiled(
+    fn: Callable[[], int],
+    *,
+    label: str,
+    mode: str | None = None,  # None | "cpu" | "mem"
+    sample_interval: float | None = None,
+    out_dir: str = "profiles",
+    top: int = 25,
+) -> int:
+    """
+    Runs fn under the requested profilers (sampling wraps cpu/mem when both are given).
+    """
+    if mode not in (None, "cpu", "mem"):
+        raise RuntimeError(f"Unknown profile mode: {mode}")
+    if sample_interval is not None and sample_interval <= 0:
+        raise RuntimeError("--sample-interval must be > 0")
+
+    def call() -> int:
+        if mode == "cpu":
+            return profile_cpu(fn, out_dir=out_dir, label=label, top=top)
+        if mode == "mem":
+            return profile_mem(fn, out_dir=out_dir, label=label, top=top)
+        return fn()
+
+    if sample_interval is not None:
+        return sample_stacks(call, out_dir=out_dir, label=label, interval=sample_interval, top=top)
+    return call()
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import time
 from typing import Any
 
 from app.db import get_conn
+from app.metrics import RunMetrics
 
 
 def _as_int(v: Any) -> int | None:
@@ -30,16 +32,21 @@ def promote_people(from_table: str = "dbo.stage_people") -> tuple[int, int]:
     Promote rows from staging (all NVARCHAR) into typed table (UPSERT).
     Returns (good, rejected).
     """
+    metrics = RunMetrics("promote_people", dataset="people", source=from_table)
     conn = get_conn()
     try:
         cur = conn.cursor()
 
-        cur.execute(f"SELECT person_id, full_name, created_at FROM {from_table};")
-        rows = cur.fetchall()
+        with metrics.phase("read"):
+            cur.execute(f"SELECT person_id, full_name, created_at FROM {from_table};")
+            rows = cur.fetchall()
+        metrics.count("rows_read", len(rows))
 
         good = 0
         bad = 0
 
+        # row-by-row: validation and the per-row MERGE are timed together as "write"
+        t_write = time.perf_counter()
         for person_id, full_name, created_at in rows:
             raw_pid = "" if person_id is None else str(person_id)
             raw_name = "" if full_name is None else str(full_name)
@@ -90,9 +97,17 @@ def promote_people(from_table: str = "dbo.stage_people") -> tuple[int, int]:
                 bad += 1
                 _reject(cur, raw_pid, raw_name, raw_created, "created_at not parseable to DATETIME2")
 
-        conn.commit()
+        metrics.add_time("write", time.perf_counter() - t_write)
+
+        with metrics.phase("commit"):
+            conn.commit()
+        metrics.count("batches")
+        metrics.count("rows_good", good)
+        metrics.count("rows_bad", bad)
+        metrics.finish()
         return good, bad
     finally:
         conn.close()
+        metrics.close()
 
 
@@ -0,0 +1,197 @@
+# src/app/reject_store.py
+from __future__ import annotations
+
+import gzip
+from typing import Any, Sequence
+
+from app.backends import get_backend
+from app.catalog import get_catalog
+from app.config import get_rejects_config
+from app.db import get_conn
+from app.rejects_summary import apply_summary, summary_counts
+
+# How dbo.dataset_rejects stores the raw row.
+#
+# raw_json is NVARCHAR(MAX), UTF-16 on the server, and for wide staging rows the
+# rejects table outgrows the final tables. With OPS_REJECTS_COMPRESS=client or
+# server the payload goes to raw_json_z instead (raw_json = ''), as gzip of the
+# UTF-16LE text: byte for byte what SQL Server's COMPRESS(raw_json) returns, so
+# rows written by either mode, by the rejects_compress backfill and by the JSON
+# pushdown all read back the same way, and ad-hoc queries can use
+# CAST(DECOMPRESS(raw_json_z) AS NVARCHAR(MAX)). Readers call raw_text().
+
+REJECTS_TABLE = "dbo.dataset_rejects"
+COMPRESS_MODES = ("off", "client", "server")
+
+REJECT_COLUMNS = ("dataset_name", "source_file", "row_num", "row_hash", "reject_reasons", "raw_json")
+
+INSERT_REJECT_SQL = """
+INSERT INTO dbo.dataset_rejects(dataset_name, source_file, row_num, row_hash, reject_reasons, raw_json)
+VALUES (?,?,?,?,?,?);
+"""
+
+
+def compress_raw(text: str) -> bytes:
+    # mtime=0 keeps the output deterministic, like COMPRESS()
+    return gzip.compress(text.encode("utf-16-le"), compresslevel=6, mtime=0)
+
+
+def decompress_raw(blob: bytes) -> str:
+    return gzip.decompress(bytes(blob)).decode("utf-16-le")
+
+
+def raw_text(raw_json: Any, raw_json_z: Any = None) -> str:
+    """
+    The stored raw row as JSON text, from whichever column holds it.
+    """
+    if raw_json_z is not None:
+        return decompress_raw(raw_json_z)
+    return "" if raw_json is None else str(raw_json)
+
+
+def has_compressed_column(cur) -> bool:
+    info = get_catalog().table(cur, REJECTS_TABLE)
+    return info is not None and info.column("raw_json_z") is not None
+
+
+def resolve_compress(cur, compress: str | None = None) -> str:
+    """
+    compress (default OPS_REJECTS_COMPRESS) checked against the backend and schema.
+    """
+    mode = get_rejects_config().compress if compress is None else compress
+    if mode not in COMPRESS_MODES:
+        raise RuntimeError(f"Unknown reject compression: {mode} (expected {'|'.join(COMPRESS_MODES)})")
+    backend = get_backend()
+    if mode == "server" and not backend.supports_compress:
+        raise RuntimeError(f"Server-side COMPRESS() is not available on backend={backend.name}; use client")
+    if mode != "off" and not has_compressed_column(cur):
+        raise RuntimeError(f"{REJECTS_TABLE} has no raw_json_z column; run `ops migrate` first")
+    return mode
+
+
+class RejectInserter:
+    """
+    Inserts dataset_rejects parameter rows (REJECT_COLUMNS order) plus their
+    dbo.dataset_rejects_summary counts on the caller's cursor; the caller commits.
+    """
+
+    def __init__(self, cur, *, compress: str | None = None) -> None:
+        self.mode = resolve_compress(cur, compress)
+        self._backend = get_backend()
+        if self.mode == "off":
+            self._sql, cols = INSERT_REJECT_SQL, REJECT_COLUMNS
+        else:
+            value = "COMPRESS(?)" if self.mode == "server" else "?"
+            self._sql = f"""
+            INSERT INTO dbo.dataset_rejects(dataset_name, source_file, row_num, row_hash, reject_reasons, raw_json, raw_json_z)
+            VALUES (?,?,?,?,?,'',{value});
+            """
+            # COMPRESS(?) takes the text, so it binds like raw_json
+            cols = REJECT_COLUMNS if self.mode == "server" else REJECT_COLUMNS[:-1] + ("raw_json_z",)
+        self._sizes = get_catalog().input_sizes(cur, REJECTS_TABLE, cols)
+
+    def insert(self, cur, rows: Sequence[tuple]) -> None:
+        if not rows:
+            return
+        params = rows
+        if self.mode == "client":
+            params = [r[:5] + (compress_raw(r[5]),) for r in rows]
+        self._backend.set_input_sizes(cur, self._sizes)
+        cur.executemany(self._sql, params)
+        self._backend.set_input_sizes(cur, None)
+        apply_summary(cur, summary_counts(rows))
+
+
+# ---------- Backfill ----------
+def storage_report(dataset_name: str | None = None) -> dict[str, int]:
+    """
+    Rows / compressed rows and bytes stored in raw_json and raw_json_z.
+    """
+    backend = get_backend()
+    where = "" if dataset_name is None else " WHERE dataset_name = ?"
+    params: tuple = () if dataset_name is None else (dataset_name,)
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        has_z = has_compressed_column(cur)
+        z = "raw_json_z" if has_z else "NULL"
+        cur.execute(
+            f"""
+            SELECT COUNT(*),
+                   COALESCE(SUM(CASE WHEN {z} IS NULL THEN 0 ELSE 1 END), 0),
+                   COALESCE(SUM({backend.datalength_sql("raw_json")}), 0),
+                   COALESCE(SUM({backend.datalength_sql(z)}), 0)
+            FROM {REJECTS_TABLE}{where};
+            """,
+            params,
+        )
+        rows, compressed, text_bytes, z_bytes = (int(v) for v in cur.fetchone())
+        return {"rows": rows, "compressed": compressed, "raw_json_bytes": text_bytes, "raw_json_z_bytes": z_bytes}
+    finally:
+        conn.close()
+
+
+def compress_existing(dataset_name: str | None = None, *, batch_size: int = 5000) -> dict[str, int]:
+    """
+    Moves raw_json of existing rejects into raw_json_z, one committed batch at a time
+    (server-side COMPRESS() where available). Rerunnable: only rows without
+    raw_json_z are touched. Returns rows, batches and the bytes before / after
+    (before = the NVARCHAR text as UTF-16).
+    """
+    backend = get_backend()
+    ds_sql = "" if dataset_name is None else " AND dataset_name = ?"
+    ds_params: tuple = () if dataset_name is None else (dataset_name,)
+    n = batches = before = after = 0
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        if not has_compressed_column(cur):
+            raise RuntimeError(f"{REJECTS_TABLE} has no raw_json_z column; run `ops migrate` first")
+
+        if backend.supports_compress:
+            sql = f"""
+            UPDATE TOP (?) {REJECTS_TABLE}
+            SET raw_json_z = COMPRESS(raw_json), raw_json = N''
+            OUTPUT DATALENGTH(deleted.raw_json), DATALENGTH(inserted.raw_json_z)
+            WHERE raw_json_z IS NULL{ds_sql};
+            """
+            while True:
+                cur.execute(sql, (batch_size,) + ds_params)
+                sizes = cur.fetchall()
+                conn.commit()
+                if not sizes:
+                    break
+                n += len(sizes)
+                batches += 1
+                before += sum(int(a or 0) for a, _b in sizes)
+                after += sum(int(b or 0) for _a, b in sizes)
+                print(f"compressed... {n}")
+        else:
+            select_sql = f"""
+            SELECT {backend.top_sql(batch_size)}reject_id, raw_json FROM {REJECTS_TABLE}
+            WHERE raw_json_z IS NULL AND reject_id > ?{ds_sql}
+            ORDER BY reject_id{backend.limit_sql(batch_size)};
+            """
+            update_sql = f"UPDATE {REJECTS_TABLE} SET raw_json_z = ?, raw_json = '' WHERE reject_id = ?;"
+            last = -1
+            while True:
+                cur.execute(select_sql, (last,) + ds_params)
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                params = []
+                for reject_id, text in rows:
+                    text = "" if text is None else str(text)
+                    z = compress_raw(text)
+                    before += len(text.encode("utf-16-le"))
+                    after += len(z)
+                    params.append((z, reject_id))
+                cur.executemany(update_sql, params)
+                conn.commit()
+                last = int(rows[-1][0])
+                n += len(rows)
+                batches += 1
+                print(f"compressed... {n}")
+        return {"rows": n, "batches": batches, "bytes_before": before, "bytes_after": after}
+    finally:
+        conn.close()
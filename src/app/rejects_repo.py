@@ -4,10 +4,29 @@ from __future__ import annotations
 import json
 from typing import Any
 
+from app.backends import get_backend
 from app.db import get_conn
+from app.reject_store import has_compressed_column, raw_text
+from app.rejects_summary import SUMMARY_TABLE, count_from_summary
 
 
-def count_rejects(dataset_name: str) -> int:
+def count_rejects(dataset_name: str, *, exact: bool = False) -> int:
+    """
+    Rejected rows for a dataset, see count_rejects_from.
+    """
+    return count_rejects_from(dataset_name, exact=exact)[0]
+
+
+def count_rejects_from(dataset_name: str, *, exact: bool = False) -> tuple[int, str]:
+    """
+    (rejected rows, table counted). Reads dbo.dataset_rejects_summary, which
+    drifts if rejects are deleted by hand (rejects_summary --rebuild);
+    exact=True, or a database without the summary table, counts dbo.dataset_rejects.
+    """
+    if not exact:
+        n = count_from_summary(dataset_name)
+        if n is not None:
+            return n, SUMMARY_TABLE
     conn = get_conn()
     try:
         cur = conn.cursor()
@@ -15,33 +34,46 @@ def count_rejects(dataset_name: str) -> int:
             "SELECT COUNT(*) FROM dbo.dataset_rejects WHERE dataset_name = ?;",
             (dataset_name,),
         )
-        return int(cur.fetchone()[0])
+        return int(cur.fetchone()[0]), "dbo.dataset_rejects"
     finally:
         conn.close()
 
 
+def _parse_raw(text: str) -> Any:
+    # invalid_json payloads are stored as they came in
+    if not text:
+        return {}
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
 def list_rejects(dataset_name: str, top: int = 20) -> list[dict[str, Any]]:
+    backend = get_backend()
     conn = get_conn()
     try:
         cur = conn.cursor()
+        z = "raw_json_z" if has_compressed_column(cur) else "NULL"
         cur.execute(
-            """
-            SELECT TOP (?) row_num, reject_reasons, raw_json, source_file
+            f"""
+            SELECT {backend.top_sql(top)}row_num, reject_reasons, raw_json, {z}, source_file
             FROM dbo.dataset_rejects
             WHERE dataset_name = ?
-            ORDER BY reject_id DESC;
+            ORDER BY reject_id DESC{backend.limit_sql(top)};
             """,
-            (top, dataset_name),
+            (dataset_name,),
         )
 
         out: list[dict[str, Any]] = []
-        for row_num, reasons, raw_json, source_file in cur.fetchall():
+        for row_num, reasons, raw_json, raw_json_z, source_file in cur.fetchall():
+            text = raw_text(raw_json, raw_json_z)
             out.append(
                 {
                     "row_num": int(row_num),
                     "reasons": str(reasons),
                     "source_file": None if source_file is None else str(source_file),
-                    "raw": json.loads(raw_json) if raw_json else {},
+                    "raw": _parse_raw(text),
                 }
             )
         return out
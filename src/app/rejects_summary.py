@@ -0,0 +1,180 @@
+# src/app/rejects_summary.py
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from app.backends import get_backend
+from app.catalog import get_catalog
+from app.db import get_conn
+
+# dbo.dataset_rejects_summary: reject counts per (dataset, source_file, reason, UTC day),
+# maintained by every writer of dbo.dataset_rejects in the same transaction as
+# its reject inserts. reason is one token of reject_reasons ("required:email");
+# reason "*" counts rejected rows, so totals don't double count rows with
+# several reasons. rejects_count / rejects_summary read it instead of scanning
+# the reject rows.
+
+SUMMARY_TABLE = "dbo.dataset_rejects_summary"
+ALL_REASONS = "*"
+REASON_MAX = 200
+
+# (dataset_name, source_file, reason, reject_day) -> rejected rows
+SummaryKey = tuple[str, str, str, date]
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def summary_counts(reject_rows: Iterable[tuple], day: date | None = None) -> Counter[SummaryKey]:
+    """
+    Counts for dataset_rejects parameter tuples (REJECT_COLUMNS order:
+    dataset_name, source_file, row_num, row_hash, reject_reasons, raw_json).
+    """
+    day = day or utc_today()
+    counts: Counter[SummaryKey] = Counter()
+    for r in reject_rows:
+        dataset, source = r[0], r[1] or ""
+        counts[(dataset, source, ALL_REASONS, day)] += 1
+        for reason in set(str(r[4]).split("|")):
+            if reason:
+                counts[(dataset, source, reason[:REASON_MAX], day)] += 1
+    return counts
+
+
+def apply_summary(cur, counts: Counter[SummaryKey] | dict[SummaryKey, int]) -> None:
+    """
+    Adds counts to the summary; runs in the caller's transaction (no commit).
+    Clear input sizes first if the cursor has some set (backend.set_input_sizes).
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    sql = get_backend().upsert_add_sql(
+        SUMMARY_TABLE, ["dataset_name", "source_file", "reason", "reject_day"], "reject_count", ["updated_at"]
+    )
+    # one atomic upsert per key, in key order so concurrent writers lock rows in the same order
+    rows = [(*key, n, now) for key, n in sorted(counts.items()) if n]
+    if rows:
+        cur.executemany(sql, rows)
+
+
+def clear_summary(cur, dataset_name: str) -> None:
+    """
+    Goes with DELETE FROM dbo.dataset_rejects WHERE dataset_name = ? (no commit).
+    """
+    cur.execute(f"DELETE FROM {SUMMARY_TABLE} WHERE dataset_name = ?;", (dataset_name,))
+
+
+def rebuild_summary(dataset_name: str | None = None, *, batch_size: int = 5000) -> int:
+    """
+    Recomputes the summary (one dataset or all) from dbo.dataset_rejects, e.g. after
+    rejects were deleted by hand. Streams the reject rows; returns rows scanned.
+    """
+    where = "" if dataset_name is None else " WHERE dataset_name = ?"
+    params: tuple = () if dataset_name is None else (dataset_name,)
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            f"SELECT dataset_name, source_file, NULL, NULL, reject_reasons, created_at FROM dbo.dataset_rejects{where};",
+            params,
+        )
+        counts: Counter[SummaryKey] = Counter()
+        n = 0
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            n += len(rows)
+            for r in rows:
+                day = r[5].date() if isinstance(r[5], datetime) else r[5]
+                counts.update(summary_counts([r], day))
+
+        cur.execute(f"DELETE FROM {SUMMARY_TABLE}{where};", params)
+        apply_summary(cur, counts)
+        conn.commit()
+        return n
+    finally:
+        conn.close()
+
+
+def count_from_summary(dataset_name: str) -> int | None:
+    """
+    Rejected rows of a dataset per the summary; None when the summary table
+    doesn't exist (migration 011 not applied).
+    """
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        if not get_catalog().table_exists(cur, SUMMARY_TABLE):
+            return None
+        cur.execute(
+            f"SELECT COALESCE(SUM(reject_count), 0) FROM {SUMMARY_TABLE} WHERE dataset_name = ? AND reason = ?;",
+            (dataset_name, ALL_REASONS),
+        )
+        return int(cur.fetchone()[0])
+    finally:
+        conn.close()
+
+
+_GROUPS = {
+    "reason": "reason",
+    "day": "reject_day",
+    "source": "source_file",
+}
+
+
+def read_summary(
+    dataset_name: str | None = None,
+    *,
+    by: str = "reason",
+    days: int | None = None,
+    source_file: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Summary rows grouped by dataset + `by` ("reason" | "day" | "source"),
+    largest first (by day: oldest first).
+    days: only the last N UTC days (today included). Grouping by day or source
+    counts rejected rows (reason "*"); by reason gives the reason histogram.
+    """
+    if by not in _GROUPS:
+        raise RuntimeError(f"Unknown summary grouping: {by} (expected {'|'.join(_GROUPS)})")
+    key = _GROUPS[by]
+    where: list[str] = []
+    params: list[Any] = []
+    if dataset_name is not None:
+        where.append("dataset_name = ?")
+        params.append(dataset_name)
+    if source_file is not None:
+        where.append("source_file = ?")
+        params.append(source_file)
+    if days is not None:
+        where.append("reject_day >= ?")
+        params.append(utc_today() - timedelta(days=max(days, 1) - 1))
+    if by == "reason":
+        where.append("reason <> ?")
+    else:
+        where.append("reason = ?")
+    params.append(ALL_REASONS)
+    order = key if by == "day" else f"SUM(reject_count) DESC, {key}"
+
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            f"""
+            SELECT dataset_name, {key}, SUM(reject_count), MIN(reject_day), MAX(reject_day)
+            FROM {SUMMARY_TABLE}
+            WHERE {" AND ".join(where)}
+            GROUP BY dataset_name, {key}
+            ORDER BY dataset_name, {order};
+            """,
+            tuple(params),
+        )
+        return [
+            {"dataset": str(ds), by: k, "count": int(n), "first_day": first, "last_day": last}
+            for ds, k, n, first, last in cur.fetchall()
+        ]
+    finally:
+        conn.close()
@@ -0,0 +1,154 @@
+# src/app/row_batch.py
+from __future__ import annotations
+
+from array import array
+from typing import Any, Callable, Iterator, Sequence
+
+# Typed storage per cast kind. Kinds not listed keep a plain list column
+# (str / money / date values are objects either way).
+_ARRAY_CODES = {"int": "q", "float": "d"}
+_ARRAY_FILL = {"int": 0, "float": 0.0}
+
+
+class RowBatch:
+    """
+    Column-oriented batch of staging rows.
+
+    raw[j]    -> raw values of source column j (tuple, as fetched)
+    cols[j]   -> typed values of field j (array('q') / array('d') / list)
+    valid[j]  -> bytearray mask, 1 where cols[j][i] is not NULL
+    reasons   -> per-row reject bitmask (0 = good row)
+    row_nums  -> 1-based row number of each row in its source
+
+    No per-row dicts are created unless a caller asks for one
+    (typed_row / raw_row), which the transform only does for rejects
+    and per-row CrossRules.
+    """
+
+    __slots__ = ("fields", "sources", "kinds", "raw", "cols", "valid", "reasons", "row_nums", "n")
+
+    def __init__(
+        self,
+        *,
+        fields: list[str],
+        sources: list[str],
+        kinds: list[str],
+        raw: list[Sequence[Any]],
+        cols: list[Any],
+        valid: list[bytearray],
+        row_nums: array,
+        reason_bits: int = 64,
+    ) -> None:
+        self.fields = fields
+        self.sources = sources
+        self.kinds = kinds
+        self.raw = raw
+        self.cols = cols
+        self.valid = valid
+        self.row_nums = row_nums
+        self.n = len(row_nums)
+        # unsigned 64-bit masks when they fit, arbitrary-size ints otherwise
+        self.reasons: Any = array("Q", bytes(8 * self.n)) if reason_bits <= 64 else [0] * self.n
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Sequence[Any]],
+        *,
+        fields: list[str],
+        sources: list[str],
+        kinds: list[str],
+        casters: list[Callable[[Any], Any]],
+        interners: list[Callable[[Any], Any] | None] | None = None,
+        first_row_num: int = 1,
+        row_nums: Sequence[int] | None = None,
+        reason_bits: int = 64,
+    ) -> RowBatch:
+        """
+        Transposes row tuples into columns and casts each column in one pass.
+        interners[j], when given, maps raw values of column j to shared objects
+        after casting (see app.cast_memo.CastMemo.canonical).
+        row_nums overrides the consecutive numbering from first_row_num.
+        """
+        n = len(rows)
+        if n:
+            raw = [tuple(c) for c in zip(*rows)]
+        else:
+            raw = [() for _ in sources]
+
+        cols: list[Any] = []
+        valid: list[bytearray] = []
+        for j, kind in enumerate(kinds):
+            cast = casters[j]
+            typed = [cast(v) for v in raw[j]]
+            valid.append(bytearray(v is not None for v in typed))
+            cols.append(_pack(kind, typed))
+            canon = interners[j] if interners else None
+            if canon is not None:
+                raw[j] = tuple(map(canon, raw[j]))
+
+        return cls(
+            fields=fields,
+            sources=sources,
+            kinds=kinds,
+            raw=raw,
+            cols=cols,
+            valid=valid,
+            row_nums=array("q", range(first_row_num, first_row_num + n) if row_nums is None else row_nums),
+            reason_bits=reason_bits,
+        )
+
+    def __len__(self) -> int:
+        return self.n
+
+    # ----- access -----
+    def value(self, j: int, i: int) -> Any:
+        return self.cols[j][i] if self.valid[j][i] else None
+
+    def column(self, j: int) -> list[Any]:
+        """
+        Typed column j as a list with None for NULLs.
+        """
+        col = self.cols[j]
+        mask = self.valid[j]
+        if all(mask):
+            return list(col)
+        return [v if ok else None for v, ok in zip(col, mask)]
+
+    def typed_row(self, i: int) -> dict[str, Any]:
+        return {f: self.value(j, i) for j, f in enumerate(self.fields)}
+
+    def raw_row(self, i: int) -> dict[str, Any]:
+        return {s: self.raw[j][i] for j, s in enumerate(self.sources)}
+
+    # ----- reasons -----
+    def flag(self, i: int, bit: int) -> None:
+        self.reasons[i] |= 1 << bit
+
+    def good_rows(self, order: list[int]) -> Iterator[tuple]:
+        """
+        Yields typed value tuples (in column order `order`) for rows without reasons.
+        """
+        views = [self.column(j) for j in order]
+        reasons = self.reasons
+        for i, vals in enumerate(zip(*views)):
+            if not reasons[i]:
+                yield vals
+
+    def rejected(self) -> Iterator[int]:
+        reasons = self.reasons
+        for i in range(self.n):
+            if reasons[i]:
+                yield i
+
+
+def _pack(kind: str, typed: list[Any]) -> Any:
+    code = _ARRAY_CODES.get(kind)
+    if code is None:
+        return typed
+    fill = _ARRAY_FILL[kind]
+    try:
+        return array(code, [fill if v is None else v for v in typed])
+    except (OverflowError, TypeError):
+        # e.g. int beyond 64 bits: keep the exact values, let validation / the server decide
+        return typed
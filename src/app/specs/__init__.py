@@ -0,0 +1,18 @@
+# src/app/specs/__init__.py
+from __future__ import annotations
+
+from app.specs.orders_spec import ORDERS_SPEC
+from app.specs.people_spec import PEOPLE_SPEC
+from app.transform_framework import DatasetSpec
+
+SPECS: dict[str, DatasetSpec] = {
+    PEOPLE_SPEC.name: PEOPLE_SPEC,
+    ORDERS_SPEC.name: ORDERS_SPEC,
+}
+
+
+def get_spec(name: str) -> DatasetSpec:
+    spec = SPECS.get(name.strip().lower())
+    if spec is None:
+        raise RuntimeError(f"Unknown spec: {name} (known: {', '.join(sorted(SPECS))})")
+    return spec
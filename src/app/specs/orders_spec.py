@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from app.transform_framework import (
+    DatasetSpec,
+    FieldRule,
+    IndexSpec,
+)
+
+# dbo.raw_orders.payload_json (one order document per row, see load_jsonl) -> dbo.orders_typed
+ORDERS_SPEC = DatasetSpec(
+    name="orders",
+    stg_table="dbo.raw_orders",
+    final_table="dbo.orders_typed",
+    payload_column="payload_json",
+    fields=[
+        FieldRule(field="order_id", source="$.order_id", cast="int", required=True, width=8),
+        FieldRule(field="status", source="$.status", cast="str", length=50),
+        FieldRule(field="customer_id", source="$.customer.id", cast="int", width=8),
+        FieldRule(field="total", source="$.total", cast="money"),
+        FieldRule(field="created_at", source="$.created_at", cast="date", precision=0),
+    ],
+    indexes=[
+        IndexSpec(
+            name="IX_orders_typed_order_id",
+            columns=["order_id"],
+            unique=True,
+        ),
+    ],
+)
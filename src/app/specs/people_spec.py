@@ -12,9 +12,10 @@ PEOPLE_SPEC = DatasetSpec(
     stg_table="dbo.stage_people",
     final_table="dbo.people_typed",
     fields=[
-        FieldRule(field="person_id", source="person_id", cast="int", required=True),
-        FieldRule(field="full_name", source="full_name", cast="str", required=True),
-        FieldRule(field="created_at", source="created_at", cast="date", required=False),
+        # types match migrations/007_create_people_typed.sql
+        FieldRule(field="person_id", source="person_id", cast="int", required=True, width=8),
+        FieldRule(field="full_name", source="full_name", cast="str", required=True, length=200),
+        FieldRule(field="created_at", source="created_at", cast="date", required=False, precision=0),
     ],
     indexes=[
         IndexSpec(
@@ -1,16 +1,11 @@
 from __future__ import annotations
 
-from app.db import get_conn
+from app.table_stats import get_table_stats
 
 
-def count_table(table: str) -> int:
+def count_table(table: str, *, exact: bool = False) -> int:
     """
     Counts rows in a table (expects a safe table name like dbo.stage_people).
+    Approximate from engine metadata unless exact (see app.table_stats).
     """
-    conn = get_conn()
-    try:
-        cur = conn.cursor()
-        cur.execute(f"SELECT COUNT(*) FROM {table};")
-        return int(cur.fetchone()[0])
-    finally:
-        conn.close()
+    return get_table_stats(table, exact=exact).rows
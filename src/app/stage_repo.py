@@ -1,20 +1,42 @@
 from __future__ import annotations
 
+from app.backends import get_backend
 from app.db import get_conn
+from app.table_stats import get_table_stats, invalidate_table_stats
 
+STAGE_PEOPLE = "dbo.stage_people"
 
-def clear_stage_people() -> int:
+
+def clear_stage_people(*, chunk_size: int | None = None, exact: bool = False) -> int:
     """
-    Deletes all rows from dbo.stage_people.
-    Returns rows deleted.
+    Deletes all rows from dbo.stage_people: TRUNCATE (minimally logged) by default,
+    or with chunk_size DELETEs of that many rows, each committed, for when TRUNCATE
+    isn't allowed or the log should drain between chunks.
+    Returns rows deleted (for TRUNCATE, the table's row count before, from
+    metadata unless exact).
     """
+    backend = get_backend()
     conn = get_conn()
     try:
         cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM dbo.stage_people;")
-        n = int(cur.fetchone()[0])
-        cur.execute("DELETE FROM dbo.stage_people;")
-        conn.commit()
+        if chunk_size is None:
+            n = get_table_stats(STAGE_PEOPLE, exact=exact, cur=cur).rows
+            cur.execute(backend.truncate_sql(STAGE_PEOPLE))
+            conn.commit()
+        else:
+            if chunk_size <= 0:
+                raise RuntimeError(f"chunk_size must be positive, got {chunk_size}")
+            sql = backend.delete_batch_sql(STAGE_PEOPLE)
+            n = 0
+            while True:
+                cur.execute(sql, (chunk_size,))
+                deleted = int(cur.rowcount)
+                conn.commit()
+                n += deleted
+                if deleted < chunk_size:
+                    break
+                print(f"cleared... {n}")
+        invalidate_table_stats(STAGE_PEOPLE)
         return n
     finally:
         conn.close()
@@ -0,0 +1,95 @@
+# src/app/table_stats.py
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+
+from app.backends import get_backend
+from app.db import get_conn
+
+# Row counts and sizes for count_table / truncate_table / clear_stage_people.
+#
+# SELECT COUNT(*) on a 500M-row staging table scans it. By default rows come
+# from engine metadata instead (Backend.table_size: sys.dm_db_partition_stats on
+# SQL Server), which is approximate while other sessions are writing but free.
+# exact=True, or a backend / login without that metadata, falls back to COUNT(*).
+#
+# Results are cached for the rest of the run, like the catalog. Code that
+# empties or reloads a table calls invalidate_table_stats(table) after committing.
+
+
+@dataclass(frozen=True)
+class TableStats:
+    table: str
+    rows: int
+    exact: bool  # rows from COUNT(*) rather than metadata
+    used_pages: int | None
+    reserved_pages: int | None
+    page_bytes: int | None
+
+    @property
+    def used_mb(self) -> float | None:
+        if self.used_pages is None or self.page_bytes is None:
+            return None
+        return self.used_pages * self.page_bytes / (1024 * 1024)
+
+    @property
+    def reserved_mb(self) -> float | None:
+        if self.reserved_pages is None or self.page_bytes is None:
+            return None
+        return self.reserved_pages * self.page_bytes / (1024 * 1024)
+
+
+_cache: dict[str, TableStats] = {}
+_lock = threading.Lock()
+
+
+def invalidate_table_stats(table: str | None = None) -> None:
+    """
+    Forgets the cached stats of `table` (or of every table).
+    """
+    with _lock:
+        if table is None:
+            _cache.clear()
+        else:
+            _cache.pop(table.lower(), None)
+
+
+def read_table_stats(cur, table: str, *, exact: bool = False) -> TableStats:
+    """
+    Uncached stats on the caller's cursor.
+    """
+    try:
+        size = get_backend().table_size(cur, table)
+    except Exception:
+        # e.g. no VIEW DATABASE STATE permission: COUNT(*) still works
+        size = None
+    rows, used, reserved, page_bytes = size if size is not None else (None, None, None, None)
+    if exact or rows is None:
+        cur.execute(f"SELECT COUNT(*) FROM {table};")
+        return TableStats(table, int(cur.fetchone()[0]), True, used, reserved, page_bytes)
+    return TableStats(table, rows, False, used, reserved, page_bytes)
+
+
+def get_table_stats(table: str, *, exact: bool = False, cur=None) -> TableStats:
+    """
+    Cached stats of `table`; an exact request ignores a cached approximate result.
+    Uses `cur` when given, else its own connection.
+    """
+    key = table.lower()
+    with _lock:
+        hit = _cache.get(key)
+    if hit is not None and (hit.exact or not exact):
+        return hit
+
+    if cur is not None:
+        stats = read_table_stats(cur, table, exact=exact)
+    else:
+        conn = get_conn()
+        try:
+            stats = read_table_stats(conn.cursor(), table, exact=exact)
+        finally:
+            conn.close()
+    with _lock:
+        _cache[key] = stats
+    return stats
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from app.backends import get_backend
 from app.db import get_conn
+from app.table_stats import get_table_stats, invalidate_table_stats
 
 
 def _require_confirm(action: str, table: str, confirm: str | None) -> None:
@@ -18,10 +20,10 @@ def _require_confirm(action: str, table: str, confirm: str | None) -> None:
         )
 
 
-def truncate_table(*, table: str, confirm: str | None) -> int:
+def truncate_table(*, table: str, confirm: str | None, exact: bool = False) -> int:
     """
     TRUNCATE the given table (fast delete all rows).
-    Returns rows_before (count before truncate).
+    Returns rows_before (from metadata, or COUNT(*) when exact).
     Requires: --require-confirm "TRUNCATE <table>"
     """
     conn = get_conn()
@@ -30,11 +32,11 @@ def truncate_table(*, table: str, confirm: str | None) -> int:
 
         _require_confirm("TRUNCATE", table, confirm)
 
-        cur.execute(f"SELECT COUNT(*) FROM {table};")
-        before = int(cur.fetchone()[0])
+        before = get_table_stats(table, exact=exact, cur=cur).rows
 
-        cur.execute(f"TRUNCATE TABLE {table};")
+        cur.execute(get_backend().truncate_sql(table))
         conn.commit()
+        invalidate_table_stats(table)
         return before
     finally:
         conn.close()
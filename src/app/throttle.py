@@ -0,0 +1,230 @@
+# src/app/throttle.py
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import time as dtime
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from app.metrics import RunMetrics
+
+# Write-rate ceilings for bulk runs (load_csv, load_jsonl, transform_dataset /
+# pipeline through FinalWriter, json_pushdown, import_people), so backfills can
+# run during business hours without saturating the log.
+#
+# Each run builds one RateGovernor from config (get_throttle_config). Before
+# writing a batch of n rows the loop calls wait(n), which sleeps just enough to
+# keep the run under rows/sec and batches/sec; after committing it reports the
+# commit time to observe_commit(). The ceilings are:
+#   - OPS_THROTTLE_ROWS_PER_SEC / OPS_THROTTLE_BATCHES_PER_SEC, or the values of
+#     the OPS_THROTTLE_SCHEDULE window covering the local time of day;
+#   - scaled down while the commit latency (a moving average) is above
+#     OPS_THROTTLE_COMMIT_MS, and back up while it isn't. Commit latency is how
+#     log pressure (WRITELOG waits) shows up on the client. With no rows/sec
+#     ceiling configured, the scaling applies to the rate the run had reached.
+#
+# Time slept shows up as the "throttle" phase of the run metrics and the
+# governor's stats() as the report's "throttle" section.
+
+BACKOFF = 0.7  # ceiling factor applied while commits are slow
+RECOVER = 0.05  # factor regained per fast commit
+MIN_FACTOR = 0.05
+LATENCY_ALPHA = 0.3
+
+_WINDOW_RE = re.compile(r"^(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})=([\d.]+)(?:/([\d.]+))?$")
+
+
+@dataclass(frozen=True)
+class ScheduleWindow:
+    start: dtime
+    end: dtime  # exclusive; end <= start wraps past midnight
+    rows_per_sec: float | None
+    batches_per_sec: float | None
+
+    def covers(self, t: dtime) -> bool:
+        if self.start < self.end:
+            return self.start <= t < self.end
+        return t >= self.start or t < self.end
+
+    @property
+    def label(self) -> str:
+        return f"{self.start:%H:%M}-{self.end:%H:%M}"
+
+
+def _limit(v: str | None) -> float | None:
+    # 0 / missing = no ceiling
+    if v is None:
+        return None
+    f = float(v)
+    return f if f > 0 else None
+
+
+def parse_schedule(text: str | None) -> tuple[ScheduleWindow, ...]:
+    """
+    "HH:MM-HH:MM=ROWS[/BATCHES],..." (local time; 0 = no ceiling), e.g.
+    "07:00-19:00=20000/4,19:00-07:00=0". The first window covering the time wins.
+    """
+    windows: list[ScheduleWindow] = []
+    for part in re.split(r"[,;]", text or ""):
+        s = part.replace(" ", "")
+        if not s:
+            continue
+        m = _WINDOW_RE.match(s)
+        if m is None:
+            raise RuntimeError(f"Bad throttle schedule window: {part.strip()!r} (expected HH:MM-HH:MM=ROWS[/BATCHES])")
+        h1, m1, h2, m2 = (int(g) for g in m.groups()[:4])
+        if h1 > 23 or h2 > 23 or m1 > 59 or m2 > 59:
+            raise RuntimeError(f"Bad time in throttle schedule window: {part.strip()!r}")
+        windows.append(ScheduleWindow(dtime(h1, m1), dtime(h2, m2), _limit(m.group(5)), _limit(m.group(6))))
+    return tuple(windows)
+
+
+class RateGovernor:
+    """
+    Paces one run's batches; a governor with no ceilings and no latency target
+    never sleeps.
+
+        gov = RateGovernor.from_config(metrics=metrics)
+        for batch in batches:
+            gov.wait(len(batch))
+            write(batch)
+            t0 = time.perf_counter(); conn.commit()
+            gov.observe_commit(time.perf_counter() - t0)
+    """
+
+    def __init__(
+        self,
+        *,
+        rows_per_sec: float | None = None,
+        batches_per_sec: float | None = None,
+        schedule: tuple[ScheduleWindow, ...] = (),
+        commit_target_ms: float | None = None,
+        metrics: RunMetrics | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        now: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        self.rows_per_sec = rows_per_sec
+        self.batches_per_sec = batches_per_sec
+        self.schedule = schedule
+        self.commit_target = None if not commit_target_ms else commit_target_ms / 1000.0
+        self.metrics = metrics
+        self._clock = clock
+        self._sleep = sleep
+        self._now = now
+
+        self.factor = 1.0
+        self.commit_latency: float | None = None  # moving average, seconds
+        self.slept = 0.0
+        self.throttled_batches = 0
+        self.batches = 0
+        self.backoffs = 0
+        self._next_at = 0.0
+        self._last_wait: tuple[float, int] | None = None  # (clock, rows) of the previous wait()
+        self._reached: float | None = None  # rows/sec while unthrottled (moving average)
+        self._window: ScheduleWindow | None = None
+        self._limits: tuple[float | None, float | None] = (None, None)
+        if metrics is not None:
+            metrics.governor = self
+
+    @classmethod
+    def from_config(cls, *, metrics: RunMetrics | None = None) -> RateGovernor:
+        from app.config import get_throttle_config
+
+        cfg = get_throttle_config()
+        return cls(
+            rows_per_sec=cfg.rows_per_sec,
+            batches_per_sec=cfg.batches_per_sec,
+            schedule=parse_schedule(cfg.schedule),
+            commit_target_ms=cfg.commit_target_ms,
+            metrics=metrics,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.rows_per_sec or self.batches_per_sec or self.schedule or self.commit_target)
+
+    def limits(self) -> tuple[float | None, float | None]:
+        """
+        Effective (rows/sec, batches/sec) ceilings right now; None = no ceiling.
+        """
+        rows, batches = self.rows_per_sec, self.batches_per_sec
+        self._window = None
+        if self.schedule:
+            t = self._now().time()
+            for w in self.schedule:
+                if w.covers(t):
+                    self._window = w
+                    rows, batches = w.rows_per_sec, w.batches_per_sec
+                    break
+        if self.factor < 1.0:
+            if rows is None:
+                rows = self._reached
+            rows = None if rows is None else rows * self.factor
+            batches = None if batches is None else batches * self.factor
+        return rows, batches
+
+    def wait(self, rows: int) -> float:
+        """
+        Call before writing a batch of `rows` rows. Sleeps until the batch fits
+        under the ceilings; returns the seconds slept.
+        """
+        self.batches += 1
+        if not self.enabled:
+            return 0.0
+        now = self._clock()
+        if self._last_wait is not None and self.factor >= 1.0:
+            t_prev, n_prev = self._last_wait
+            if now > t_prev and n_prev:
+                rate = n_prev / (now - t_prev)
+                self._reached = rate if self._reached is None else self._reached + LATENCY_ALPHA * (rate - self._reached)
+
+        rows_ceiling, batches_ceiling = self._limits = self.limits()
+        interval = max(
+            rows / rows_ceiling if rows_ceiling else 0.0,
+            1.0 / batches_ceiling if batches_ceiling else 0.0,
+        )
+        start = max(now, self._next_at)
+        delay = start - now
+        if delay > 0:
+            self._sleep(delay)
+            self.slept += delay
+            self.throttled_batches += 1
+            if self.metrics is not None:
+                self.metrics.add_time("throttle", delay)
+        # this batch's share of the ceiling gates the next one
+        self._next_at = start + interval
+        self._last_wait = (start, rows)
+        return delay
+
+    def observe_commit(self, seconds: float) -> None:
+        """
+        Call with each commit's duration; drives the latency backoff.
+        """
+        if self.commit_target is None:
+            return
+        avg = self.commit_latency
+        self.commit_latency = seconds if avg is None else avg + LATENCY_ALPHA * (seconds - avg)
+        if self.commit_latency > self.commit_target:
+            self.factor = max(MIN_FACTOR, self.factor * BACKOFF)
+            self.backoffs += 1
+        else:
+            self.factor = min(1.0, self.factor + RECOVER)
+
+    def stats(self) -> dict[str, Any]:
+        rows, batches = self._limits
+        return {
+            "enabled": self.enabled,
+            "rows_per_sec_limit": None if rows is None else round(rows, 1),
+            "batches_per_sec_limit": None if batches is None else round(batches, 3),
+            "window": None if self._window is None else self._window.label,
+            "factor": round(self.factor, 3),
+            "commit_ms": None if self.commit_latency is None else round(self.commit_latency * 1000, 1),
+            "backoffs": self.backoffs,
+            "throttled_batches": self.throttled_batches,
+            "batches": self.batches,
+            "slept_seconds": round(self.slept, 3),
+        }
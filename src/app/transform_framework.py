@@ -3,10 +3,23 @@ from __future__ import annotations
 
 import hashlib
 import json
-from dataclasses import dataclass
-from typing import Callable, Any
+import time
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import partial
+from typing import Callable, Any, Sequence
 
 from app.db import get_conn
+from app.backends import get_backend
+from app.catalog import ColumnInfo, TableInfo, get_catalog
+from app.cast_memo import CastMemo, is_low_cardinality
+from app.metrics import RunMetrics
+from app.pk_index import KeyBitmap, load_existing_keys
+from app.reject_store import RejectInserter
+from app.rejects_summary import clear_summary
+from app.row_batch import RowBatch
+from app.throttle import RateGovernor
 from app.typecast import to_int, to_float, to_decimal_money, to_date_any, to_str
 
 
@@ -17,6 +30,12 @@ class FieldRule:
     source: str
     cast: str  # "str"|"int"|"float"|"money"|"date"
     required: bool = False
+    memo: bool | None = None  # memoize casts: True/False, None => auto (low sampled cardinality)
+    # final-table column hints (transform_schema); values that don't fit are rejected as overflow:<field>
+    length: int | None = None  # str: max characters (default 4000, -1 = MAX)
+    precision: int | None = None  # money: total digits (default 19); date: fractional seconds -> DATETIME2(p)
+    scale: int | None = None  # money: digits after the point (default 4)
+    width: int | None = None  # int: storage bytes 1/2/4/8 (default 4); float: 4 (REAL) or 8 (default)
 
 
 @dataclass(frozen=True)
@@ -38,6 +57,22 @@ class CrossRule:
     fn: Callable[[dict[str, Any]], bool]  # True => ok
 
 
+@dataclass(frozen=True)
+class BatchCrossRule:
+    """
+    Cross-field check evaluated once per batch.
+    fn receives the batch columns and returns one bool per row (True => ok):
+      frame="dict":   {field: list of typed values (None for NULL)}
+      frame="pandas": pandas.DataFrame with one column per field
+    If fn raises, the batch is re-evaluated row by row (one-row frames) so only
+    the offending rows get the reason.
+    """
+
+    name: str
+    fn: Callable[[Any], Any]
+    frame: str = "dict"  # "dict" | "pandas"
+
+
 @dataclass(frozen=True)
 class IndexSpec:
     name: str
@@ -48,6 +83,117 @@ class IndexSpec:
     if_not_exists: bool = True
 
 
+@dataclass(frozen=True)
+class StorageProfile:
+    """
+    Physical layout of the final table (SQL Server; other backends ignore it).
+      compression: "none" | "row" | "page", for the table and the spec's indexes.
+      columnstore: clustered columnstore index, for append-heavy fact tables that are
+        scanned and aggregated rather than looked up by key. Excludes row/page compression.
+    """
+
+    compression: str = "none"
+    columnstore: bool = False
+
+
+@dataclass(frozen=True)
+class PartitionSpec:
+    """
+    Date partitioning of the final table: one partition per day / month of `field`
+    (a required date field). transform_dataset(reload_partitions=True) then replaces
+    only the periods present in the staging data (transform_schema.switch_in_partitions).
+    Unique indexes must include the field (partition-aligned).
+    """
+
+    field: str
+    granularity: str = "month"  # "day" | "month"
+
+
+def period_start(v: date, granularity: str) -> date:
+    d = v.date() if isinstance(v, datetime) else v
+    return d if granularity == "day" else d.replace(day=1)
+
+
+def next_period(d: date, granularity: str) -> date:
+    if granularity == "day":
+        return d + timedelta(days=1)
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+
+# int width (bytes) -> (SQL type, min, max)
+INT_WIDTHS: dict[int, tuple[str, int, int]] = {
+    1: ("TINYINT", 0, 255),
+    2: ("SMALLINT", -(2**15), 2**15 - 1),
+    4: ("INT", -(2**31), 2**31 - 1),
+    8: ("BIGINT", -(2**63), 2**63 - 1),
+}
+# catalog int type -> width (SQLite reports INTEGER, a 64-bit int)
+INT_TYPE_WIDTHS = {"tinyint": 1, "smallint": 2, "int": 4, "integer": 8, "bigint": 8}
+DEFAULT_STR_LENGTH = 4000
+DEFAULT_MONEY_PRECISION = 19
+DEFAULT_MONEY_SCALE = 4
+_REAL_MAX = 3.4028234663852886e38
+
+
+def field_limit(fr: FieldRule) -> Callable[[Any], bool] | None:
+    """
+    Predicate "typed value fits the declared column" for fr, or None when every
+    cast result fits (date, float(8), str MAX).
+    """
+    kind = fr.cast.lower()
+    if kind == "str":
+        n = DEFAULT_STR_LENGTH if fr.length is None else fr.length
+        if n < 0:
+            return None
+        return lambda v: len(v) <= n
+    if kind == "int":
+        w = fr.width or 4
+        if w not in INT_WIDTHS:
+            raise RuntimeError(f"FieldRule {fr.field}: int width must be one of {sorted(INT_WIDTHS)} (got {w})")
+        _t, lo, hi = INT_WIDTHS[w]
+        return lambda v: lo <= v <= hi
+    if kind == "money":
+        p = fr.precision or DEFAULT_MONEY_PRECISION
+        s = DEFAULT_MONEY_SCALE if fr.scale is None else fr.scale
+        if not 0 <= s <= p <= 38:
+            raise RuntimeError(f"FieldRule {fr.field}: need 0 <= scale <= precision <= 38 (got {p},{s})")
+        limit = Decimal(10) ** (p - s)
+        return lambda v: abs(v) < limit
+    if kind == "float":
+        if fr.width not in (None, 4, 8):
+            raise RuntimeError(f"FieldRule {fr.field}: float width must be 4 or 8 (got {fr.width})")
+        if fr.width == 4:
+            return lambda v: abs(v) <= _REAL_MAX
+        return None
+    return None
+
+
+def column_rule(fr: FieldRule, col: ColumnInfo) -> FieldRule:
+    """
+    fr with the length / width / precision / scale of an existing column, so
+    field_limit checks what that column holds rather than the spec's hints or
+    defaults (an NVARCHAR(MAX) or BIGINT column loaded under an unhinted rule).
+    Column types that don't map onto fr's cast kind keep the hints.
+    """
+    kind = fr.cast.lower()
+    t = col.type_name
+    if kind == "str":
+        if t in ("nvarchar", "nchar", "varchar", "char"):
+            return replace(fr, length=-1 if col.max_length is None else col.max_length)
+        if t in ("text", "ntext", "xml"):
+            return replace(fr, length=-1)
+    elif kind == "int" and t in INT_TYPE_WIDTHS:
+        return replace(fr, width=INT_TYPE_WIDTHS[t])
+    elif kind == "money":
+        if t in ("decimal", "numeric") and col.precision is not None and col.scale is not None:
+            return replace(fr, precision=col.precision, scale=col.scale)
+        if t in ("money", "smallmoney"):
+            return replace(fr, precision=19 if t == "money" else 10, scale=4)
+    elif kind == "float" and t in ("real", "float"):
+        return replace(fr, width=4 if t == "real" else 8)
+    return fr
+
+
 @dataclass(frozen=True)
 class DatasetSpec:
     name: str
@@ -57,8 +203,12 @@ class DatasetSpec:
     required: list[str] | None = None
     ranges: list[RangeRule] | None = None
     allowed: list[AllowedRule] | None = None
-    cross: list[CrossRule] | None = None
+    cross: list[CrossRule | BatchCrossRule] | None = None
     indexes: list[IndexSpec] | None = None
+    storage: StorageProfile | None = None
+    partition: PartitionSpec | None = None
+    # staging is one JSON document per row in this column; FieldRule.source is a JSON path (app.json_shred)
+    payload_column: str | None = None
 
 
 # ---------- Casting ----------
@@ -89,175 +239,605 @@ def row_hash(raw: dict[str, Any]) -> bytes:
     return hashlib.sha256(payload).digest()
 
 
-# ---------- Transform runner ----------
-def transform_dataset(
+# Rejects of JSON payload specs store the payload text itself as raw_json, and
+# SHA-256 of its UTF-16LE bytes as row_hash: what HASHBYTES('SHA2_256', <NVARCHAR>)
+# gives the SQL pushdown (app.json_pushdown), so both paths write the same values.
+def payload_text(payload: Any) -> str:
+    if payload is None:
+        return ""
+    return payload if isinstance(payload, str) else repr(payload)
+
+
+def payload_hash(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-16-le")).digest()
+
+
+# ---------- Batch validation ----------
+class BatchValidator:
+    """
+    Validation rules of a DatasetSpec compiled once per run.
+    Every reject reason gets one bit, assigned in the order reasons are
+    reported, so decoding a row's bitmask yields the familiar
+    "required:x|range_min:y|..." text.
+
+    final: the existing table the rows go to. Its columns set the overflow:<field>
+    limits (column_rule); without it the FieldRule hints and defaults do, which
+    is what a table created from the spec holds.
+    """
+
+    __slots__ = ("reasons", "_required", "_overflow", "_ranges", "_allowed", "_cross", "_batch_cross")
+
+    def __init__(self, spec: DatasetSpec, final: TableInfo | None = None) -> None:
+        self.reasons: list[str] = []
+        idx = {fr.field: j for j, fr in enumerate(spec.fields)}
+
+        # (column index or None if the field does not exist, bit)
+        self._required: list[tuple[int | None, int]] = []
+        for j, fr in enumerate(spec.fields):
+            if fr.required:
+                self._required.append((j, self._bit(f"required:{fr.field}")))
+        for f in dict.fromkeys(spec.required or []):
+            self._required.append((idx.get(f), self._bit(f"required:{f}")))
+
+        # values the final column can't hold would fail the whole batch insert
+        self._overflow: list[tuple[int, Callable[[Any], bool], int]] = []
+        for j, fr in enumerate(spec.fields):
+            col = None if final is None else final.column(fr.field)
+            fits = field_limit(fr if col is None else column_rule(fr, col))
+            if fits is not None:
+                self._overflow.append((j, fits, self._bit(f"overflow:{fr.field}")))
+
+        self._ranges: list[tuple[int, Any, Any, int, int]] = []
+        for rr in spec.ranges or []:
+            if rr.field in idx:
+                self._ranges.append(
+                    (idx[rr.field], rr.min, rr.max, self._bit(f"range_min:{rr.field}"), self._bit(f"range_max:{rr.field}"))
+                )
+
+        self._allowed: list[tuple[int, set[str], int]] = []
+        for ar in spec.allowed or []:
+            if ar.field in idx:
+                self._allowed.append((idx[ar.field], {x.lower() for x in ar.allowed}, self._bit(f"allowed:{ar.field}")))
+
+        self._cross: list[tuple[CrossRule, int]] = []
+        self._batch_cross: list[tuple[BatchCrossRule, int]] = []
+        for cr in spec.cross or []:
+            if isinstance(cr, BatchCrossRule):
+                if cr.frame not in ("dict", "pandas"):
+                    raise RuntimeError(f"Unknown BatchCrossRule.frame: {cr.frame}")
+                self._batch_cross.append((cr, self._bit(f"cross:{cr.name}")))
+            else:
+                self._cross.append((cr, self._bit(f"cross:{cr.name}")))
+
+    def _bit(self, reason: str) -> int:
+        self.reasons.append(reason)
+        return len(self.reasons) - 1
+
+    def require(self, j: int, field: str) -> None:
+        """
+        Also rejects rows where field j is NULL (required:<field>), unless the spec
+        already requires it. Call before batches are validated.
+        """
+        if all(k != j for k, _bit in self._required):
+            self._required.append((j, self._bit(f"required:{field}")))
+
+    def reasons_text(self, mask: int) -> str:
+        return "|".join(r for b, r in enumerate(self.reasons) if mask >> b & 1)
+
+    def validate(self, batch: RowBatch) -> None:
+        """
+        Sets reason bits on every row of the batch, one rule at a time.
+        """
+        n = batch.n
+        reasons = batch.reasons
+
+        for j, bit in self._required:
+            flag = 1 << bit
+            if j is None:
+                for i in range(n):
+                    reasons[i] |= flag
+                continue
+            mask = batch.valid[j]
+            i = mask.find(0)
+            while i != -1:
+                reasons[i] |= flag
+                i = mask.find(0, i + 1)
+
+        for j, fits, bit in self._overflow:
+            col = batch.cols[j]
+            mask = batch.valid[j]
+            flag = 1 << bit
+            for i in range(n):
+                if mask[i] and not fits(col[i]):
+                    reasons[i] |= flag
+
+        for j, lo, hi, bit_min, bit_max in self._ranges:
+            col = batch.cols[j]
+            mask = batch.valid[j]
+            f_min = 1 << bit_min
+            f_max = 1 << bit_max
+            for i in range(n):
+                if not mask[i]:
+                    continue
+                v = col[i]
+                if lo is not None and v < lo:
+                    reasons[i] |= f_min
+                if hi is not None and v > hi:
+                    reasons[i] |= f_max
+
+        for j, allowed, bit in self._allowed:
+            col = batch.cols[j]
+            mask = batch.valid[j]
+            flag = 1 << bit
+            for i in range(n):
+                if mask[i] and str(col[i]).strip().lower() not in allowed:
+                    reasons[i] |= flag
+
+        if self._cross:
+            for i in range(n):
+                typed = batch.typed_row(i)
+                for cr, bit in self._cross:
+                    ok = True
+                    try:
+                        ok = bool(cr.fn(typed))
+                    except Exception:
+                        ok = False
+                    if not ok:
+                        reasons[i] |= 1 << bit
+
+        frames: dict[str, Any] = {}
+        for bcr, bit in self._batch_cross:
+            if bcr.frame not in frames:
+                frames[bcr.frame] = _batch_frame(batch, bcr.frame)
+            flag = 1 << bit
+            for i, ok in enumerate(_eval_batch_rule(bcr, batch, frames[bcr.frame])):
+                if not ok:
+                    reasons[i] |= flag
+
+
+def _batch_frame(batch: RowBatch, kind: str, rows: range | None = None) -> Any:
+    if rows is None:
+        cols = {f: batch.column(j) for j, f in enumerate(batch.fields)}
+    else:
+        cols = {f: [batch.value(j, i) for i in rows] for j, f in enumerate(batch.fields)}
+    if kind == "pandas":
+        import pandas as pd
+
+        return pd.DataFrame(cols)
+    return cols
+
+
+def _eval_batch_rule(rule: BatchCrossRule, batch: RowBatch, frame: Any) -> list[bool]:
+    """
+    Returns one ok flag per row. Falls back to one-row frames if the batch call fails
+    (raises, or returns the wrong number of values).
+    """
+    try:
+        mask = [bool(ok) for ok in rule.fn(frame)]
+        if len(mask) == batch.n:
+            return mask
+    except Exception:
+        pass
+
+    out: list[bool] = []
+    for i in range(batch.n):
+        try:
+            res = [bool(ok) for ok in rule.fn(_batch_frame(batch, rule.frame, range(i, i + 1)))]
+            out.append(len(res) == 1 and res[0])
+        except Exception:
+            out.append(False)
+    return out
+
+
+def batch_casters(spec: DatasetSpec, sample=None) -> list[Callable[[Any], Any]]:
+    """
+    One cast callable per field. Fields with memo=True, or memo=None and a
+    low-cardinality column in `sample` (staging row tuples), get a CastMemo.
+    """
+    casters: list[Callable[[Any], Any]] = []
+    for j, fr in enumerate(spec.fields):
+        cast = partial(cast_value, fr.cast.lower())
+        use_memo = fr.memo
+        if use_memo is None:
+            use_memo = bool(sample) and is_low_cardinality(r[j] for r in sample)
+        casters.append(CastMemo(fr.field, cast) if use_memo else cast)
+    return casters
+
+
+def make_batch(
     spec: DatasetSpec,
+    rows,
     *,
-    source_file: str | None = None,
-    truncate_final: bool = False,
-    truncate_rejects: bool = False,
-    batch_size: int = 1000,
-) -> None:
+    validator: BatchValidator,
+    first_row_num: int,
+    row_nums: list[int] | None = None,
+    casters: list[Callable[[Any], Any]] | None = None,
+    metrics: RunMetrics | None = None,
+) -> RowBatch:
     """
-    Reads staging rows, validates, writes to final + dataset_rejects.
+    Builds a RowBatch from staging row tuples (ordered like spec.fields) and validates it.
+    """
+    casters = casters or batch_casters(spec)
+    t0 = time.perf_counter()
+    batch = RowBatch.from_rows(
+        rows,
+        fields=[fr.field for fr in spec.fields],
+        sources=[fr.source for fr in spec.fields],
+        kinds=[fr.cast.lower() for fr in spec.fields],
+        casters=casters,
+        interners=[c.canonical if isinstance(c, CastMemo) else None for c in casters],
+        first_row_num=first_row_num,
+        row_nums=row_nums,
+        reason_bits=len(validator.reasons),
+    )
+    t1 = time.perf_counter()
+    validator.validate(batch)
+    if metrics is not None:
+        metrics.add_time("cast", t1 - t0)
+        metrics.add_time("validate", time.perf_counter() - t1)
+    return batch
+
+
+def reject_params(
+    spec: DatasetSpec,
+    batch: RowBatch,
+    validator: BatchValidator,
+    source_file: str | None,
+    payloads: Sequence[Any] | None = None,
+) -> list[tuple]:
+    """
+    payloads: the batch rows' JSON payloads (payload specs), stored instead of
+    the shredded values.
+    """
+    out: list[tuple] = []
+    for i in batch.rejected():
+        if payloads is not None:
+            text = payload_text(payloads[i])
+            h = payload_hash(text)
+        else:
+            raw = batch.raw_row(i)
+            text = json.dumps(raw, ensure_ascii=False)
+            h = row_hash(raw)
+        out.append((spec.name, source_file, batch.row_nums[i], h, validator.reasons_text(batch.reasons[i]), text))
+    return out
 
-    Behavior:
-      - If truncate_final=True, final table is truncated and we re-insert everything.
-      - If truncate_final=False, we INSERT-IF-MISSING by primary key (assumes first field is PK).
-        This prevents duplicate key crashes on reruns.
 
-    Assumes:
-      - spec.final_table exists and matches spec.fields order/types.
-      - dbo.dataset_rejects exists.
+def batch_periods(spec: DatasetSpec, batch: RowBatch) -> set[date]:
     """
-    conn = get_conn()
-    try:
-        cur = conn.cursor()
+    Partition periods (spec.partition) of the batch rows whose partition value parsed,
+    rejected rows included: reloading a period replaces it with what the source has now.
+    """
+    part = spec.partition
+    j = [fr.field for fr in spec.fields].index(part.field)
+    col = batch.cols[j]
+    mask = batch.valid[j]
+    return {period_start(col[i], part.granularity) for i in range(batch.n) if mask[i]}
+
+
+def payload_reject_params(spec: DatasetSpec, bad: list[tuple[int, Any]], source_file: str | None) -> list[tuple]:
+    """
+    dataset_rejects rows for staging payloads that aren't valid JSON (JsonShredder.shred).
+    """
+    out: list[tuple] = []
+    for row_num, payload in bad:
+        text = payload_text(payload)
+        out.append((spec.name, source_file, row_num, payload_hash(text), "invalid_json", text))
+    return out
+
+
+# ---------- Final table writer ----------
+class FinalWriter:
+    """
+    Writes validated RowBatches to spec.final_table + dbo.dataset_rejects (and its
+    counts to dbo.dataset_rejects_summary) on one connection, committing once per
+    batch. Shared by transform_dataset (staging -> final) and the one-pass CSV
+    pipeline (app.pipeline).
+
+    Insert modes:
+      - truncate_final=True: final table is truncated, rows go out as plain bulk inserts.
+      - otherwise INSERT-IF-MISSING by primary key (assumes first field is PK):
+          pk_mode="server": each insert carries a NOT EXISTS probe on the final table.
+          pk_mode="client": existing keys are streamed once into a KeyBitmap
+            (app.pk_index); existing and in-batch duplicate keys are dropped
+            client-side and the rest go out as plain bulk inserts.
+            Requires an int PK.
+    """
+
+    def __init__(
+        self,
+        spec: DatasetSpec,
+        conn,
+        validator: BatchValidator,
+        *,
+        source_file: str | None = None,
+        truncate_final: bool = False,
+        truncate_rejects: bool = False,
+        pk_mode: str = "server",  # "server" | "client"
+        metrics: RunMetrics | None = None,
+        governor: RateGovernor | None = None,
+    ) -> None:
+        if pk_mode not in ("server", "client"):
+            raise RuntimeError(f"Unknown pk_mode: {pk_mode}")
+        if pk_mode == "client" and spec.fields[0].cast.lower() != "int":
+            raise RuntimeError(f"pk_mode=client requires an int PK (got {spec.fields[0].field}:{spec.fields[0].cast})")
+
+        self.spec = spec
+        self.conn = conn
+        self.validator = validator
+        self.source_file = source_file
+        self.metrics = metrics
+        # write-rate ceilings (app.throttle); from config unless the caller shares one
+        self.governor = governor if governor is not None else RateGovernor.from_config(metrics=metrics)
+        self.good = 0
+        self.bad = 0
+        self.skipped = 0
+
+        self._backend = get_backend()
+        q = self._backend.quote_ident
+        self._cur = conn.cursor()
+        cur = self._cur
 
         if truncate_final:
-            cur.execute(f"TRUNCATE TABLE {spec.final_table};")
+            cur.execute(self._backend.truncate_sql(spec.final_table))
             conn.commit()
 
         if truncate_rejects:
             cur.execute("DELETE FROM dbo.dataset_rejects WHERE dataset_name = ?;", (spec.name,))
+            clear_summary(cur, spec.name)
             conn.commit()
 
-        # Pull staging columns (as defined in FieldRule.source)
-        stg_cols = [fr.source for fr in spec.fields]
-        stg_select_cols = ", ".join([f"[{c}]" for c in stg_cols])
-        cur.execute(f"SELECT {stg_select_cols} FROM {spec.stg_table};")
-
-        good_rows: list[list[Any]] = []
-        reject_rows: list[tuple] = []
-        total = 0
-        good = 0
-        bad = 0
-
-        # Precompute validators
-        required_set = set((spec.required or []))
-        range_rules = spec.ranges or []
-        allowed_rules = spec.allowed or []
-        cross_rules = spec.cross or []
-
-        # Insert SQL
         final_cols = [fr.field for fr in spec.fields]
-        final_cols_sql = ", ".join([f"[{c}]" for c in final_cols])
+        final_cols_sql = ", ".join([q(c) for c in final_cols])
         placeholders = ", ".join(["?"] * len(final_cols))
+        self._col_order = list(range(len(final_cols)))
 
         # Assume first field is PK for idempotent insert-if-missing
         pk_col = final_cols[0]
+        if not truncate_final:
+            # a NULL key can't be probed (or held by the KeyBitmap): reject the row
+            validator.require(0, pk_col)
 
-        # If we're not truncating, do insert-if-missing to avoid PK duplicates on reruns
+        self._known_keys: KeyBitmap | None = None
+        self._needs_pk_dup_param = False
         if truncate_final:
-            insert_final_sql = f"INSERT INTO {spec.final_table} ({final_cols_sql}) VALUES ({placeholders});"
-            needs_pk_dup_param = False
+            self._insert_sql = f"INSERT INTO {spec.final_table} ({final_cols_sql}) VALUES ({placeholders});"
+        elif pk_mode == "client":
+            # one streaming pass over existing keys; inserts below are plain bulk inserts
+            self._known_keys = load_existing_keys(cur, spec.final_table, pk_col)
+            self._insert_sql = f"INSERT INTO {spec.final_table} ({final_cols_sql}) VALUES ({placeholders});"
         else:
-            insert_final_sql = f"""
+            # If we're not truncating, do insert-if-missing to avoid PK duplicates on reruns
+            self._insert_sql = f"""
             INSERT INTO {spec.final_table} ({final_cols_sql})
             SELECT {placeholders}
             WHERE NOT EXISTS (
-              SELECT 1 FROM {spec.final_table} WHERE [{pk_col}] = ?
+              SELECT 1 FROM {spec.final_table} WHERE {q(pk_col)} = ?
             );
             """
-            needs_pk_dup_param = True
-
-        insert_reject_sql = """
-        INSERT INTO dbo.dataset_rejects(dataset_name, source_file, row_num, row_hash, reject_reasons, raw_json)
-        VALUES (?,?,?,?,?,?);
+            self._needs_pk_dup_param = True
+
+        # parameter sizes from the (cached) catalog; None = let the driver infer
+        catalog = get_catalog()
+        self._insert_sizes = catalog.input_sizes(cur, spec.final_table, final_cols)
+        if self._insert_sizes is not None and self._needs_pk_dup_param:
+            self._insert_sizes = self._insert_sizes + [self._insert_sizes[0]]
+        self._rejects = RejectInserter(cur)
+
+    def write(
+        self,
+        batch: RowBatch,
+        extra_rejects: list[tuple] | None = None,
+        payloads: Sequence[Any] | None = None,
+        on_commit: Callable[[Any], None] | None = None,
+    ) -> None:
         """
+        extra_rejects: reject rows built outside the batch (payload_reject_params),
+        committed together with it. payloads: see reject_params.
+        on_commit(cur) runs right before the commit, in the batch's transaction
+        (run_pipeline saves its checkpoint there).
+        """
+        self.governor.wait(batch.n + len(extra_rejects or ()))
+        t0 = time.perf_counter()
+        known_keys = self._known_keys
+        good_rows: list[tuple] = []
+        for vals in batch.good_rows(self._col_order):
+            if known_keys is not None and not known_keys.add(vals[0]):
+                # already in final table (or earlier in this run)
+                self.skipped += 1
+                continue
+            # append pk again for the NOT EXISTS (...) = ?
+            good_rows.append(vals + (vals[0],) if self._needs_pk_dup_param else vals)
+        self.good += len(good_rows)
+
+        reject_rows = reject_params(self.spec, batch, self.validator, self.source_file, payloads)
+        if extra_rejects:
+            reject_rows.extend(extra_rejects)
+        self.bad += len(reject_rows)
 
-        rownum = 0
-        for r in cur.fetchall():
-            rownum += 1
-            total += 1
-
-            raw = {stg_cols[i]: r[i] for i in range(len(stg_cols))}
-            typed: dict[str, Any] = {}
-            reasons: list[str] = []
-
-            # Cast each field + FieldRule.required
-            for fr in spec.fields:
-                v = raw.get(fr.source)
-                tv = cast_value(fr.cast, v)
-                typed[fr.field] = tv
-
-                if fr.required and tv is None:
-                    reasons.append(f"required:{fr.field}")
-
-            # Required list (additional)
-            for f in required_set:
-                if typed.get(f) is None:
-                    reasons.append(f"required:{f}")
-
-            # Ranges
-            for rr in range_rules:
-                v = typed.get(rr.field)
-                if v is None:
-                    continue
-                if rr.min is not None and v < rr.min:
-                    reasons.append(f"range_min:{rr.field}")
-                if rr.max is not None and v > rr.max:
-                    reasons.append(f"range_max:{rr.field}")
-
-            # Allowed
-            for ar in allowed_rules:
-                v = typed.get(ar.field)
-                if v is None:
-                    continue
-                vs = str(v).strip().lower()
-                if vs not in {x.lower() for x in ar.allowed}:
-                    reasons.append(f"allowed:{ar.field}")
-
-            # Cross rules
-            for cr in cross_rules:
-                ok = True
-                try:
-                    ok = bool(cr.fn(typed))
-                except Exception:
-                    ok = False
-                if not ok:
-                    reasons.append(f"cross:{cr.name}")
-
-            if reasons:
-                bad += 1
-                rh = row_hash(raw)
-                reject_rows.append(
-                    (
-                        spec.name,
-                        source_file,
-                        rownum,
-                        rh,
-                        "|".join(reasons),
-                        json.dumps(raw, ensure_ascii=False),
-                    )
-                )
+        if good_rows:
+            if self._needs_pk_dup_param:
+                self._backend.set_input_sizes(self._cur, self._insert_sizes)
+                self._cur.executemany(self._insert_sql, good_rows)
             else:
-                good += 1
-                vals = [typed[c] for c in final_cols]
-                if needs_pk_dup_param:
-                    # append pk again for the NOT EXISTS (...) = ?
-                    vals.append(typed[pk_col])
-                good_rows.append(vals)
-
-            # Flush batches
-            if len(good_rows) >= batch_size:
-                cur.executemany(insert_final_sql, good_rows)
-                conn.commit()
-                good_rows = []
-
-            if len(reject_rows) >= batch_size:
-                cur.executemany(insert_reject_sql, reject_rows)
-                conn.commit()
-                reject_rows = []
+                self._backend.bulk_insert(self._cur, self._insert_sql, good_rows, sizes=self._insert_sizes)
+        self._rejects.insert(self._cur, reject_rows)
+        if on_commit is not None:
+            on_commit(self._cur)
+        t1 = time.perf_counter()
+        self.conn.commit()
+        self.governor.observe_commit(time.perf_counter() - t1)
+
+        if self.metrics is not None:
+            self.metrics.add_time("write", t1 - t0)
+            self.metrics.add_time("commit", time.perf_counter() - t1)
+            self.metrics.count("batches")
+            self.metrics.count("rows_good", len(good_rows))
+            self.metrics.count("rows_bad", len(reject_rows))
+            self.metrics.count("rows_skipped", batch.n + len(extra_rejects or ()) - len(good_rows) - len(reject_rows))
+
+
+def print_memo_stats(casters: list[Callable[[Any], Any]] | None) -> None:
+    for c in casters or []:
+        if isinstance(c, CastMemo):
+            st = c.stats()
+            print(f"cast_memo ✅ field={st['field']} enabled={st['enabled']} hit_rate={st['hit_rate']} entries={st['entries']}")
 
-        if good_rows:
-            cur.executemany(insert_final_sql, good_rows)
-            conn.commit()
 
-        if reject_rows:
-            cur.executemany(insert_reject_sql, reject_rows)
-            conn.commit()
+# ---------- Transform runner ----------
+def transform_dataset(
+    spec: DatasetSpec,
+    *,
+    source_file: str | None = None,
+    truncate_final: bool = False,
+    truncate_rejects: bool = False,
+    batch_size: int = 1000,
+    pk_mode: str = "server",  # "server" | "client"
+    swap: bool = False,
+    reload_partitions: bool = False,
+) -> None:
+    """
+    Reads staging rows, validates, writes to final + dataset_rejects.
+
+    Staging rows are streamed batch_size at a time into a columnar RowBatch
+    (app.row_batch); validators (including BatchCrossRules) run over whole
+    batches and final-table parameters are produced straight from the columns.
 
-        print(f"transform_dataset ✅ dataset={spec.name} total={total} good={good} bad={bad}")
+    Behavior:
+      - If truncate_final=True, final table is truncated and we re-insert everything.
+      - If truncate_final=False, we INSERT-IF-MISSING by primary key (assumes first field is PK).
+        This prevents duplicate key crashes on reruns. See FinalWriter for pk_mode.
+      - If swap=True, everything is loaded into an index-less shadow table which then
+        replaces the final table (transform_schema.swap_in_shadow); readers never see
+        an empty or half-loaded table. A failed run leaves the final table untouched.
+        The shadow is built from the spec, so a final table with a primary key or
+        columns the spec can't reproduce is refused (transform_schema.create_shadow_table).
+      - If spec.payload_column is set, staging holds one JSON document per row and each
+        FieldRule.source is a JSON path into it (app.json_shred): every payload is parsed
+        once and all paths are read in one walk; payloads that aren't valid JSON are
+        rejected as invalid_json. For large SQL Server backfills see app.json_pushdown.
+      - If reload_partitions=True (spec.partition required), rows are loaded into a shadow
+        table and switched in for just the periods they cover
+        (transform_schema.switch_in_partitions); other periods are not touched.
+
+    Assumes:
+      - spec.final_table exists and matches spec.fields order/types.
+      - dbo.dataset_rejects and dbo.dataset_rejects_summary exist.
+    """
+    if swap and truncate_final:
+        raise RuntimeError("swap already replaces the final table; don't combine it with truncate_final")
+    # transform_schema imports this module
+    from app.transform_schema import (
+        check_reload_partitions,
+        create_shadow_table,
+        drop_shadow_table,
+        ensure_partition_boundaries,
+        swap_in_shadow,
+        switch_in_partitions,
+    )
+
+    if reload_partitions:
+        check_reload_partitions(spec, swap=swap, truncate_final=truncate_final)
+
+    q = get_backend().quote_ident
+    metrics = RunMetrics("transform_dataset", dataset=spec.name, source=source_file or spec.stg_table)
+    conn = get_conn()
+    read_conn = None
+    shadow = None
+    periods: set[date] | None = set() if reload_partitions else None
+    try:
+        if swap or reload_partitions:
+            shadow = create_shadow_table(spec, conn)
+        validator = BatchValidator(spec, get_catalog().table(conn.cursor(), shadow or spec.final_table))
+        writer = FinalWriter(
+            spec if shadow is None else replace(spec, final_table=shadow),
+            conn,
+            validator,
+            source_file=source_file,
+            # the shadow table starts empty: plain bulk inserts
+            truncate_final=truncate_final or shadow is not None,
+            truncate_rejects=truncate_rejects,
+            pk_mode=pk_mode,
+            metrics=metrics,
+        )
+
+        # Pull staging columns (as defined in FieldRule.source), or the JSON payload
+        shredder = None
+        if spec.payload_column:
+            from app.json_shred import JsonShredder
+
+            shredder = JsonShredder([fr.source for fr in spec.fields])
+            stg_cols = [spec.payload_column]
+        else:
+            stg_cols = [fr.source for fr in spec.fields]
+        stg_select_cols = ", ".join([q(c) for c in stg_cols])
+
+        # staging is streamed on its own connection so batches can be written while reading
+        read_conn = get_conn()
+        rcur = read_conn.cursor()
+        rcur.execute(f"SELECT {stg_select_cols} FROM {spec.stg_table};")
+
+        total = 0
+        casters: list[Callable[[Any], Any]] | None = None
+        while True:
+            with metrics.phase("read"):
+                rows = rcur.fetchmany(batch_size)
+            if not rows:
+                break
+            n_read = len(rows)
+            row_nums = extra = payloads = None
+            if shredder is not None:
+                fetched = rows
+                with metrics.phase("shred"):
+                    rows, row_nums, bad = shredder.shred((r[0] for r in fetched), first_row_num=total + 1)
+                extra = payload_reject_params(spec, bad, source_file)
+                payloads = [fetched[k - total - 1][0] for k in row_nums]
+            if casters is None:
+                # first batch doubles as the cardinality sample for memo=None fields
+                casters = batch_casters(spec, sample=rows)
+
+            batch = make_batch(
+                spec,
+                rows,
+                validator=validator,
+                first_row_num=total + 1,
+                row_nums=row_nums,
+                casters=casters,
+                metrics=metrics,
+            )
+            total += n_read
+            metrics.count("rows_read", n_read)
+            if periods is not None:
+                new = batch_periods(spec, batch) - periods
+                if new:
+                    # before the rows land, so each period gets a partition of its own
+                    with metrics.phase("split"):
+                        ensure_partition_boundaries(spec, conn, new)
+                    periods |= new
+            writer.write(batch, extra, payloads)
+
+        swapped = ""
+        if shadow is not None:
+            read_conn.close()
+            read_conn = None
+            if periods is None:
+                swap_seconds = swap_in_shadow(spec, conn, shadow, metrics=metrics)
+                swapped = f" swapped=1 swap_seconds={swap_seconds:.3f}"
+            else:
+                switch_seconds = switch_in_partitions(spec, conn, shadow, periods, metrics=metrics)
+                swapped = f" partitions={len(periods)} switch_seconds={switch_seconds:.3f}"
+            shadow = None
+
+        print_memo_stats(casters)
+        print(
+            f"transform_dataset ✅ dataset={spec.name} total={total} "
+            f"good={writer.good} bad={writer.bad} skipped={writer.skipped}{swapped}"
+        )
+        metrics.finish()
     finally:
+        if read_conn is not None:
+            read_conn.close()
+        if shadow is not None:
+            # failed before the swap: the final table was never touched
+            drop_shadow_table(spec, conn)
         conn.close()
+        metrics.close()
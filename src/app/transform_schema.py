@@ -1,25 +1,163 @@
 # src/app/transform_schema.py
 from __future__ import annotations
 
-from typing import Any
+import time
+from datetime import date
+from typing import Any, Iterable
 
+from app.backends import get_backend
+from app.catalog import ColumnInfo, TableInfo, get_catalog
 from app.db import get_conn
-from app.transform_framework import DatasetSpec, IndexSpec
+from app.metrics import RunMetrics
+from app.transform_framework import (
+    DEFAULT_MONEY_PRECISION,
+    DEFAULT_MONEY_SCALE,
+    DEFAULT_STR_LENGTH,
+    INT_TYPE_WIDTHS,
+    INT_WIDTHS,
+    DatasetSpec,
+    FieldRule,
+    IndexSpec,
+    PartitionSpec,
+    StorageProfile,
+    field_limit,
+    next_period,
+)
 
 
-def _sql_type(cast: str) -> str:
-    c = cast.lower().strip()
+def sql_type(fr: FieldRule) -> str:
+    """
+    Column type from the cast kind and the FieldRule hints (length / precision / scale / width).
+    """
+    c = fr.cast.lower().strip()
+    field_limit(fr)  # validates the hints
     if c == "str":
-        return "NVARCHAR(4000) NULL"
+        n = DEFAULT_STR_LENGTH if fr.length is None else fr.length
+        return get_backend().nvarchar_sql(n)
     if c == "int":
-        return "INT NULL"
+        return INT_WIDTHS[fr.width or 4][0]
     if c == "float":
-        return "FLOAT NULL"
+        return "REAL" if fr.width == 4 else "FLOAT"
     if c == "money":
-        return "DECIMAL(19,4) NULL"
+        p = fr.precision or DEFAULT_MONEY_PRECISION
+        s = DEFAULT_MONEY_SCALE if fr.scale is None else fr.scale
+        return f"DECIMAL({p},{s})"
     if c == "date":
-        return "DATE NULL"
-    raise RuntimeError(f"Unknown cast kind for SQL type: {cast}")
+        # to_date_any keeps the time of day; DATE (no precision hint) drops it
+        return "DATE" if fr.precision is None else f"DATETIME2({fr.precision})"
+    raise RuntimeError(f"Unknown cast kind for SQL type: {fr.cast}")
+
+
+def _column_sql(fr: FieldRule) -> str:
+    # a required field never reaches the final table empty (the row is rejected)
+    return f"{sql_type(fr)} {'NOT NULL' if fr.required else 'NULL'}"
+
+
+def _storage(spec: DatasetSpec) -> StorageProfile:
+    st = spec.storage or StorageProfile()
+    if st.compression not in ("none", "row", "page"):
+        raise RuntimeError(f"Unknown compression for {spec.name}: {st.compression} (expected none|row|page)")
+    if st.columnstore and st.compression != "none":
+        raise RuntimeError(f"{spec.name}: a clustered columnstore table can't also use {st.compression} compression")
+    return st
+
+
+def _partition(spec: DatasetSpec) -> PartitionSpec | None:
+    part = spec.partition
+    if part is None:
+        return None
+    if part.granularity not in ("day", "month"):
+        raise RuntimeError(f"Unknown partition granularity for {spec.name}: {part.granularity} (expected day|month)")
+    fr = next((f for f in spec.fields if f.field == part.field), None)
+    if fr is None or fr.cast.lower() != "date":
+        raise RuntimeError(f"{spec.name}: partition field {part.field} must be a date field of the spec")
+    if not (fr.required or part.field in (spec.required or [])):
+        # NULL dates would all land in the first partition
+        raise RuntimeError(f"{spec.name}: partition field {part.field} must be required")
+    for ix in spec.indexes or []:
+        if ix.unique and part.field not in ix.columns:
+            raise RuntimeError(f"{spec.name}: unique index {ix.name} must include partition field {part.field}")
+    return part
+
+
+def _partition_names(spec: DatasetSpec) -> tuple[str, str]:
+    # (function, scheme)
+    _schema, name = _split_schema_table(spec.final_table)
+    return f"PF_{name}", f"PS_{name}"
+
+
+def _partition_on(spec: DatasetSpec) -> tuple[str, str] | None:
+    # (scheme, column) for aligned tables / indexes
+    part = _partition(spec)
+    return None if part is None else (_partition_names(spec)[1], part.field)
+
+
+def _narrower_columns(spec: DatasetSpec, info: TableInfo) -> list[str]:
+    """
+    Spec fields the existing final table can't hold at the declared width
+    (missing, shorter text, smaller int, fewer integer/fraction digits).
+    """
+    out: list[str] = []
+    for fr in spec.fields:
+        col = info.column(fr.field)
+        if col is None:
+            out.append(f"{fr.field}: missing")
+            continue
+        c = fr.cast.lower()
+        want = sql_type(fr)
+        if c == "str" and col.type_name in ("nvarchar", "nchar", "varchar", "char"):
+            n = DEFAULT_STR_LENGTH if fr.length is None else fr.length
+            if col.max_length is not None and (n < 0 or col.max_length < n):
+                out.append(f"{fr.field}: {col.type_name}({col.max_length}) < {want}")
+        elif c == "int" and col.type_name in INT_TYPE_WIDTHS:
+            if INT_TYPE_WIDTHS[col.type_name] < (fr.width or 4):
+                out.append(f"{fr.field}: {col.type_name} < {want}")
+        elif c == "money" and col.precision is not None and col.scale is not None:
+            p = fr.precision or DEFAULT_MONEY_PRECISION
+            s = DEFAULT_MONEY_SCALE if fr.scale is None else fr.scale
+            if col.precision - col.scale < p - s or col.scale < s:
+                out.append(f"{fr.field}: {col.type_name}({col.precision},{col.scale}) < {want}")
+    return out
+
+
+def _wider_columns(spec: DatasetSpec, info: TableInfo) -> list[str]:
+    """
+    Columns of the existing table wider than the spec declares (the reverse of
+    _narrower_columns); rebuilding them from the spec would narrow them.
+    """
+    out: list[str] = []
+    for fr in spec.fields:
+        col = info.column(fr.field)
+        if col is None:
+            continue
+        c = fr.cast.lower()
+        want = sql_type(fr)
+        wider = False
+        if c == "str" and col.type_name in ("nvarchar", "nchar", "varchar", "char", "text"):
+            n = DEFAULT_STR_LENGTH if fr.length is None else fr.length
+            wider = n >= 0 and (col.max_length is None or col.max_length > n)
+        elif c == "int" and col.type_name in INT_TYPE_WIDTHS:
+            wider = INT_TYPE_WIDTHS[col.type_name] > (fr.width or 4)
+        elif c == "money" and col.precision is not None and col.scale is not None:
+            p = fr.precision or DEFAULT_MONEY_PRECISION
+            sc = DEFAULT_MONEY_SCALE if fr.scale is None else fr.scale
+            wider = col.precision - col.scale > p - sc or col.scale > sc
+        elif c == "float":
+            wider = col.type_name == "float" and fr.width == 4
+        elif c == "date":
+            wider = col.type_name in ("datetime2", "datetime") and fr.precision is None
+        if wider:
+            out.append(f"{fr.field}: {_column_type(col)} > {want}")
+    return out
+
+
+def _column_type(col: ColumnInfo) -> str:
+    t = col.type_name
+    if t in ("decimal", "numeric"):
+        return f"{t}({col.precision},{col.scale})"
+    if t in ("nvarchar", "nchar", "varchar", "char"):
+        return f"{t}({'max' if col.max_length is None else col.max_length})"
+    return t
 
 
 def _split_schema_table(full: str) -> tuple[str, str]:
@@ -30,6 +168,37 @@ def _split_schema_table(full: str) -> tuple[str, str]:
     return "dbo", s
 
 
+def _create_table_sql(spec: DatasetSpec, table: str) -> list[str]:
+    """
+    CREATE TABLE (plus the clustered columnstore, if the storage profile asks for one)
+    for spec.fields at `table`. Partitioned specs get the partition function / scheme
+    first (if missing) and the table on the scheme.
+    """
+    backend = get_backend()
+    storage = _storage(spec)
+    part_on = _partition_on(spec)
+    out: list[str] = []
+    on_sql = ""
+    if part_on is not None:
+        function, scheme = _partition_names(spec)
+        part_fr = next(f for f in spec.fields if f.field == part_on[1])
+        out.extend(backend.partition_scheme_sql(function, scheme, sql_type(part_fr)))
+        on_sql = backend.partition_on_sql(*part_on)
+    cols_sql = ",\n    ".join([f"{backend.quote_ident(fr.field)} {_column_sql(fr)}" for fr in spec.fields])
+    out.append(
+        f"""
+    CREATE TABLE {backend.full_table(table)} (
+        {cols_sql}
+    ){on_sql}{backend.table_compression_sql(storage.compression)};
+    """
+    )
+    if storage.columnstore:
+        cci = backend.clustered_columnstore_sql(table, f"CCI_{_split_schema_table(table)[1]}", part_on)
+        if cci:
+            out.append(cci)
+    return out
+
+
 def ensure_final_table_from_spec(
     spec: DatasetSpec,
     *,
@@ -38,6 +207,9 @@ def ensure_final_table_from_spec(
 ) -> None:
     """
     Creates spec.final_table (typed) based on spec.fields, and creates any indexes in spec.indexes.
+    Column types follow the FieldRule hints, table/index options follow spec.storage,
+    and with spec.partition the table and indexes are created on a date partition scheme.
+    An existing table that is narrower than the spec fails fast (inserts would overflow).
     Safety: drop_and_recreate requires confirm == f"DROP_CREATE {spec.final_table}"
     """
     if drop_and_recreate:
@@ -48,18 +220,14 @@ def ensure_final_table_from_spec(
                 f'Expected: --require-confirm "{expected}"'
             )
 
+    backend = get_backend()
     schema, name = _split_schema_table(spec.final_table)
-    full = f"{schema}.{name}"
-
-    cols_sql = ",\n    ".join([f"[{fr.field}] {_sql_type(fr.cast)}" for fr in spec.fields])
+    table = f"{schema}.{name}"
 
-    sql_drop = f"IF OBJECT_ID('{full}','U') IS NOT NULL DROP TABLE {full};"
-    sql_create = f"""
-    CREATE TABLE {full} (
-        {cols_sql}
-    );
-    """
+    sql_drop = backend.drop_table_if_exists_sql(table)
+    sql_create = _create_table_sql(spec, table)
 
+    catalog = get_catalog()
     conn = get_conn()
     try:
         cur = conn.cursor()
@@ -67,26 +235,27 @@ def ensure_final_table_from_spec(
         if drop_and_recreate:
             cur.execute(sql_drop)
             conn.commit()
+            catalog.invalidate(table)
 
         # create if not exists
-        cur.execute(
-            """
-            SELECT 1
-            FROM sys.tables t
-            JOIN sys.schemas s ON s.schema_id = t.schema_id
-            WHERE s.name = ? AND t.name = ?;
-            """,
-            (schema, name),
-        )
-        exists = cur.fetchone() is not None
-
-        if not exists:
-            cur.execute(sql_create)
+        info = catalog.table(cur, table)
+
+        if info is None:
+            for sql in sql_create:
+                cur.execute(sql)
             conn.commit()
+            catalog.invalidate(table)
+        else:
+            narrow = _narrower_columns(spec, info)
+            if narrow:
+                raise RuntimeError(
+                    f"Final table {table} is narrower than spec {spec.name}: " + "; ".join(narrow)
+                    + ". Widen the columns or recreate the table (drop_and_recreate)."
+                )
 
         # indexes
         for ix in (spec.indexes or []):
-            _ensure_index(cur, full, ix)
+            _ensure_index(cur, spec, table, ix)
         conn.commit()
 
         print(f"final_table ✅ ensured={spec.final_table}")
@@ -94,35 +263,253 @@ def ensure_final_table_from_spec(
         conn.close()
 
 
-def _ensure_index(cur, full_table: str, ix: IndexSpec) -> None:
-    """
-    Creates an index if it does not exist (by name) when ix.if_not_exists=True.
-    """
+def _index_sql(spec: DatasetSpec, full_table: str, ix: IndexSpec) -> str:
     idx_name = ix.name.strip()
     if not idx_name:
         raise RuntimeError("IndexSpec.name cannot be empty")
+    return get_backend().create_index_sql(
+        full_table,
+        idx_name,
+        ix.columns,
+        unique=ix.unique,
+        include=ix.include,
+        where=ix.where,
+        compression=_storage(spec).compression,
+        partition=_partition_on(spec),
+    )
 
-    if ix.if_not_exists:
-        cur.execute(
-            """
-            SELECT 1
-            FROM sys.indexes
-            WHERE name = ? AND object_id = OBJECT_ID(?);
-            """,
-            (idx_name, full_table),
-        )
-        if cur.fetchone() is not None:
-            return
-
-    unique_sql = "UNIQUE " if ix.unique else ""
-    cols_sql = ", ".join([f"[{c}]" for c in ix.columns])
-
-    include_sql = ""
-    if ix.include:
-        include_cols = ", ".join([f"[{c}]" for c in ix.include])
-        include_sql = f" INCLUDE ({include_cols})"
-
-    where_sql = f" WHERE {ix.where}" if ix.where else ""
-
-    sql = f"CREATE {unique_sql}INDEX [{idx_name}] ON {full_table} ({cols_sql}){include_sql}{where_sql};"
+
+def _ensure_index(cur, spec: DatasetSpec, full_table: str, ix: IndexSpec) -> None:
+    """
+    Creates an index if it does not exist (by name) when ix.if_not_exists=True.
+    """
+    sql = _index_sql(spec, full_table, ix)
+    catalog = get_catalog()
+    if ix.if_not_exists and catalog.index_exists(cur, full_table, ix.name.strip()):
+        return
     cur.execute(sql)
+    catalog.invalidate(full_table)
+
+
+def _build_indexes(cur, spec: DatasetSpec, full_table: str, metrics: RunMetrics | None) -> None:
+    t0 = time.perf_counter()
+    for ix in spec.indexes or []:
+        cur.execute(_index_sql(spec, full_table, ix))
+    if metrics is not None:
+        metrics.add_time("index", time.perf_counter() - t0)
+
+
+# ---------- Shadow table swap (full reloads) ----------
+def shadow_table_name(spec: DatasetSpec) -> str:
+    schema, name = _split_schema_table(spec.final_table)
+    return f"{schema}.{name}__swap"
+
+
+def _swap_differences(spec: DatasetSpec, info: TableInfo) -> list[str]:
+    """
+    What a shadow table built from spec would lose compared with the live table:
+    primary key, clustered index, NOT NULL columns, columns outside the spec and
+    wider column types.
+    """
+    out: list[str] = []
+    if info.primary_key:
+        name = f" {info.primary_key_name}" if info.primary_key_name else ""
+        out.append(f"primary key{name} ({', '.join(info.primary_key)})")
+    if info.clustered is not None and info.clustered != info.primary_key_name and not _storage(spec).columnstore:
+        out.append(f"clustered index {info.clustered}")
+    fields = {fr.field.lower(): fr for fr in spec.fields}
+    for col in info.columns:
+        fr = fields.get(col.name.lower())
+        if fr is None:
+            out.append(f"{col.name}: not in spec")
+        elif not col.nullable and not (fr.required or fr.field in (spec.required or [])):
+            out.append(f"{col.name}: NOT NULL, spec field not required")
+    out.extend(_wider_columns(spec, info))
+    return out
+
+
+def create_shadow_table(spec: DatasetSpec, conn) -> str:
+    """
+    (Re)creates an empty, index-less copy of spec.final_table for a full reload
+    and returns its name. Leftovers of an aborted run are dropped first.
+
+    The shadow is built from the spec alone, so an existing final table whose
+    primary key, clustered index, NOT NULL columns, extra columns or wider types
+    the spec can't reproduce is refused. Permissions, triggers and other objects
+    that depend on the old table are not carried over to the swapped-in table.
+    """
+    backend = get_backend()
+    shadow = shadow_table_name(spec)
+    cur = conn.cursor()
+    info = get_catalog().table(cur, spec.final_table)
+    if info is not None:
+        diff = _swap_differences(spec, info)
+        if diff:
+            raise RuntimeError(
+                f"Can't swap {spec.final_table}: a table built from spec {spec.name} would drop " + "; ".join(diff)
+                + ". Reload without --swap (or recreate the table from the spec first)."
+            )
+    cur.execute(backend.drop_table_if_exists_sql(shadow))
+    for sql in _create_table_sql(spec, shadow):
+        cur.execute(sql)
+    conn.commit()
+    get_catalog().invalidate(shadow)
+    return shadow
+
+
+def drop_shadow_table(spec: DatasetSpec, conn) -> None:
+    """
+    Best-effort cleanup after a failed reload (create_shadow_table drops leftovers anyway).
+    """
+    shadow = shadow_table_name(spec)
+    try:
+        conn.rollback()
+        cur = conn.cursor()
+        cur.execute(get_backend().drop_table_if_exists_sql(shadow))
+        conn.commit()
+    except Exception:
+        pass
+    get_catalog().invalidate(shadow)
+
+
+def swap_in_shadow(spec: DatasetSpec, conn, shadow: str, *, metrics: RunMetrics | None = None) -> float:
+    """
+    Builds spec.indexes on the loaded shadow table, then replaces spec.final_table
+    with it in one short transaction and drops the previous table.
+    Readers see the old rows until the commit and the new ones right after.
+    Returns the seconds the swap transaction took.
+
+    SQL Server renames (sp_rename) old -> <final>__old and shadow -> final, commits,
+    then drops the old table outside the swap. Engines with schema-wide index names
+    (SQLite) drop the old table inside the transaction and build the indexes there.
+    """
+    backend = get_backend()
+    catalog = get_catalog()
+    table = spec.final_table
+    schema, name = _split_schema_table(table)
+    old = f"{schema}.{name}__old"
+    cur = conn.cursor()
+
+    cur.execute(backend.drop_table_if_exists_sql(old))
+    conn.commit()
+    exists = catalog.table_exists(cur, table)
+    if not backend.schema_scoped_index_names:
+        _build_indexes(cur, spec, shadow, metrics)
+        conn.commit()
+
+    t0 = time.perf_counter()
+    begin = backend.begin_transaction_sql()
+    if begin:
+        cur.execute(begin)
+    if exists:
+        cur.execute(backend.rename_table_sql(table, f"{name}__old"))
+        if backend.schema_scoped_index_names:
+            # frees the index names for the new table
+            cur.execute(backend.drop_table_if_exists_sql(old))
+    cur.execute(backend.rename_table_sql(shadow, name))
+    if backend.schema_scoped_index_names:
+        _build_indexes(cur, spec, table, metrics)
+    conn.commit()
+    swap_seconds = time.perf_counter() - t0
+    catalog.invalidate(table)
+    if metrics is not None:
+        metrics.add_time("swap", swap_seconds)
+
+    if exists and not backend.schema_scoped_index_names:
+        cur.execute(backend.drop_table_if_exists_sql(old))
+        conn.commit()
+    return swap_seconds
+
+
+# ---------- Partition reloads ----------
+def check_reload_partitions(spec: DatasetSpec, *, swap: bool = False, truncate_final: bool = False) -> None:
+    if _partition(spec) is None:
+        raise RuntimeError(f"reload_partitions needs a partitioned spec ({spec.name} has no DatasetSpec.partition)")
+    if swap or truncate_final:
+        raise RuntimeError("reload_partitions only replaces the loaded periods; don't combine it with swap/truncate_final")
+
+
+def ensure_partition_boundaries(spec: DatasetSpec, conn, periods: Iterable[date]) -> None:
+    """
+    Splits the partition function so each period (start date) gets a partition of
+    its own: boundaries at the period start and at the next period's start.
+    Only new boundaries are added; splitting a non-empty partition moves its rows.
+    No-op on backends without partitioning.
+    """
+    backend = get_backend()
+    part = _partition(spec)
+    if part is None or not backend.supports_partitioning:
+        return
+    function, scheme = _partition_names(spec)
+    type_sql = sql_type(next(f for f in spec.fields if f.field == part.field))
+    bounds: set[date] = set()
+    for p in periods:
+        bounds.add(p)
+        bounds.add(next_period(p, part.granularity))
+    cur = conn.cursor()
+    for b in sorted(bounds):
+        cur.execute(backend.split_partition_sql(function, scheme, b, type_sql))
+    conn.commit()
+
+
+def switch_in_partitions(
+    spec: DatasetSpec,
+    conn,
+    shadow: str,
+    periods: Iterable[date],
+    *,
+    metrics: RunMetrics | None = None,
+) -> float:
+    """
+    Replaces the rows of `periods` in spec.final_table with the loaded shadow table
+    (create_shadow_table, boundaries from ensure_partition_boundaries) in one
+    transaction, then drops the shadow. Periods not listed are not touched.
+    Returns the seconds the switch transaction took.
+
+    SQL Server builds the aligned indexes on the shadow, then per period
+    TRUNCATE ... WITH (PARTITIONS) + ALTER TABLE ... SWITCH PARTITION: metadata-only,
+    so the cost is the period's own rows, not the table's.
+    Other backends delete the periods' date ranges and copy the shadow rows over.
+    """
+    backend = get_backend()
+    catalog = get_catalog()
+    part = _partition(spec)
+    table = spec.final_table
+    periods = sorted(periods)
+    cur = conn.cursor()
+
+    if backend.supports_partitioning:
+        _build_indexes(cur, spec, shadow, metrics)
+        conn.commit()
+        function, _scheme = _partition_names(spec)
+        numbers: list[int] = []
+        for p in periods:
+            cur.execute(backend.partition_number_sql(function), (p,))
+            numbers.append(int(cur.fetchone()[0]))
+        t0 = time.perf_counter()
+        if numbers:
+            cur.execute(backend.truncate_partitions_sql(table, numbers))
+            for n in numbers:
+                cur.execute(backend.switch_partition_sql(shadow, table, n))
+        conn.commit()
+    else:
+        q = backend.quote_ident
+        col = q(part.field)
+        cols_sql = ", ".join(q(fr.field) for fr in spec.fields)
+        t0 = time.perf_counter()
+        for p in periods:
+            cur.execute(
+                f"DELETE FROM {backend.full_table(table)} WHERE {col} >= ? AND {col} < ?;",
+                (p, next_period(p, part.granularity)),
+            )
+        cur.execute(f"INSERT INTO {backend.full_table(table)} ({cols_sql}) SELECT {cols_sql} FROM {backend.full_table(shadow)};")
+        conn.commit()
+    switch_seconds = time.perf_counter() - t0
+    if metrics is not None:
+        metrics.add_time("switch", switch_seconds)
+
+    cur.execute(backend.drop_table_if_exists_sql(shadow))
+    conn.commit()
+    catalog.invalidate(shadow)
+    catalog.invalidate(table)
+    return switch_seconds
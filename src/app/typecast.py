@@ -1,10 +1,21 @@
 # src/app/typecast.py
 from __future__ import annotations
 
+import re
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
 from typing import Any
 
+# Each parser tries a cheap fast path for the common clean shape first and
+# falls back to the exact general path, so results never depend on which
+# path was taken. benchmarks/typecast.py reports ns/value for both.
+
+_ISO_DATETIME = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})(?:[ T]([0-9]{2}):([0-9]{2})(?::([0-9]{2}))?)?")
+
+# Integers wider than DECIMAL(38,0) are not representable in SQL Server anyway;
+# refusing them also keeps "1e999999" from building a gigantic int.
+_MAX_INT_DIGITS = 38
+
 
 def to_str(v: Any) -> str:
     return str(v).strip()
@@ -14,13 +25,20 @@ def to_int(v: Any) -> int | None:
     s = str(v).strip()
     if s == "":
         return None
+    # fast path: int() parses plain (signed) digit strings directly
     try:
         return int(s)
     except ValueError:
-        try:
-            return int(float(s))
-        except ValueError:
-            return None
+        pass
+    # "12.0", "1e3", "-7.9": exact via Decimal (float would lose precision above 2**53),
+    # truncated toward zero as before
+    try:
+        d = Decimal(s)
+    except (InvalidOperation, ValueError):
+        return None
+    if not d.is_finite() or d.adjusted() >= _MAX_INT_DIGITS:
+        return None
+    return int(d)
 
 
 def to_float(v: Any) -> float | None:
@@ -37,7 +55,11 @@ def to_decimal_money(v: Any) -> Decimal | None:
     s = str(v).strip()
     if s == "":
         return None
-    s = s.replace("$", "").replace(",", "")
+    # clean values skip cleanup entirely (measured faster than translate())
+    if "$" in s:
+        s = s.replace("$", "")
+    if "," in s:
+        s = s.replace(",", "")
     try:
         return Decimal(s)
     except (InvalidOperation, ValueError):
@@ -49,6 +71,16 @@ def to_date_any(v: Any) -> datetime | None:
     if s == "":
         return None
 
+    # fast path: zero-padded ISO date / date-time (what the strptime loop and
+    # fromisoformat below would accept for this shape anyway)
+    m = _ISO_DATETIME.fullmatch(s)
+    if m is not None:
+        y, mo, d, hh, mi, ss = m.groups()
+        try:
+            return datetime(int(y), int(mo), int(d), int(hh or 0), int(mi or 0), int(ss or 0))
+        except ValueError:
+            pass
+
     for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
         try:
             return datetime.strptime(s, fmt)
@@ -0,0 +1,77 @@
+# tests/conftest.py
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+import pytest
+
+# Every test runs against the SQLite backend on a fresh database file.
+# `pip install -e .[test]` then `pytest` from the repo root (pyproject.toml
+# sets testpaths and pythonpath=src).
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """
+    Fresh migrated SQLite database; process-wide caches are reset around the test.
+    """
+    monkeypatch.setenv("OPS_DB_BACKEND", "sqlite")
+    monkeypatch.setenv("OPS_SQLITE_PATH", str(tmp_path / "ops.sqlite3"))
+    monkeypatch.setenv("OPS_METRICS_DIR", "off")
+    monkeypatch.setenv("OPS_METRICS_HISTORY", "0")
+    for name in ("OPS_PEOPLE_CACHE", "OPS_REJECTS_COMPRESS", "OPS_THROTTLE_ROWS_PER_SEC", "OPS_THROTTLE_SCHEDULE"):
+        monkeypatch.delenv(name, raising=False)
+
+    from app.catalog import get_catalog
+    from app.migrations.runner import apply_migrations
+    from app.people_cache import set_people_cache
+    from app.table_stats import invalidate_table_stats
+
+    get_catalog().invalidate()
+    invalidate_table_stats()
+    set_people_cache(None)
+    apply_migrations()
+    yield tmp_path
+    get_catalog().invalidate()
+    invalidate_table_stats()
+    set_people_cache(None)
+
+
+PEOPLE_ROWS = [
+    (1, "Ada Lovelace", "2024-01-05"),
+    (2, "Alan Turing", "2024-01-20"),
+    (3, "Grace Hopper", "2024-02-11"),
+    (4, "", "2024-02-12"),  # full_name required -> reject
+    ("x", "Bad Id", "2024-03-01"),  # person_id not an int -> reject
+]
+
+
+@pytest.fixture
+def make_people_csv(tmp_path):
+    """
+    make_people_csv(rows, name="people.csv") -> path of a person_id,full_name,created_at CSV.
+    """
+
+    def make(rows: list[tuple] = PEOPLE_ROWS, name: str = "people.csv") -> Path:
+        path = tmp_path / name
+        with path.open("w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["person_id", "full_name", "created_at"])
+            w.writerows(rows)
+        return path
+
+    return make
+
+
+@pytest.fixture
+def ensure_final(db):
+    """
+    ensure_final(spec): (re)creates spec.final_table.
+    """
+    from app.transform_schema import ensure_final_table_from_spec
+
+    def ensure(spec) -> None:
+        ensure_final_table_from_spec(spec, drop_and_recreate=True, confirm=f"DROP_CREATE {spec.final_table}")
+
+    return ensure
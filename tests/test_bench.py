@@ -0,0 +1,33 @@
+# tests/test_bench.py
+from __future__ import annotations
+
+import json
+
+from app.ops_cli import main
+
+
+def test_bench_on_unmigrated_database(tmp_path, monkeypatch, capsys):
+    from app.catalog import get_catalog
+
+    monkeypatch.setenv("OPS_DB_BACKEND", "sqlite")
+    monkeypatch.setenv("OPS_SQLITE_PATH", str(tmp_path / "fresh.sqlite3"))
+    get_catalog().invalidate()
+    try:
+        assert main(["bench", "--rows", "10", "--out", str(tmp_path / "bench.json")]) == 1
+    finally:
+        get_catalog().invalidate()
+    out = capsys.readouterr().out
+    assert "bench ❌" in out and "dbo.load_checkpoints" in out and "run `ops migrate` first" in out
+    assert not (tmp_path / "bench.json").exists()
+
+
+def test_bench_runs_every_phase(db, tmp_path):
+    from app.bench.suite import PHASES
+
+    out = tmp_path / "bench.json"
+    assert main(["bench", "--rows", "200", "--dirty-rate", "0.1", "--out", str(out)]) == 0
+    result = json.loads(out.read_text(encoding="utf-8"))
+    assert list(result["phases"]) == PHASES
+    t = result["phases"]["transform_dataset"]
+    assert t["good"] + t["bad"] == 200 and t["bad"] > 0
+    assert result["phases"]["export_rejects_jsonl"]["rows"] == t["bad"]
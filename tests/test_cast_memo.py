@@ -0,0 +1,43 @@
+# tests/test_cast_memo.py
+from __future__ import annotations
+
+from app.cast_memo import CastMemo, is_low_cardinality
+from app.typecast import to_int, to_str
+
+
+def test_repeated_strings_hit_and_share_one_object():
+    m = CastMemo("status", to_str)
+    a = m("shipped ")
+    b = m("shipped ")
+    assert a == "shipped" and a is b
+    assert (m.hits, m.misses) == (1, 1)
+
+
+def test_equal_values_of_different_types_are_not_shared():
+    # True == 1 == 1.0; each must be cast on its own (JSON-shredded payloads)
+    m = CastMemo("flag", repr)
+    assert [m(True), m(1), m(1.0), m("1")] == ["True", "1", "1.0", "'1'"]
+    assert m.canonical(True) is True
+    assert m.canonical(1.0) == 1.0 and type(m.canonical(1.0)) is float
+
+
+def test_canonical_returns_first_seen_string():
+    m = CastMemo("n", to_int)
+    first = "".join(["4", "2"])
+    m(first)
+    assert m.canonical("42") is first
+    assert m.canonical("43") == "43"
+
+
+def test_switches_off_when_hit_rate_stays_low():
+    m = CastMemo("id", to_int, max_entries=10, probe=50, min_hit_rate=0.5)
+    for i in range(100):
+        assert m(str(i)) == i
+    assert m.enabled is False
+    assert m.stats()["entries"] == 0
+
+
+def test_is_low_cardinality():
+    assert is_low_cardinality(["a", "b"] * 50)
+    assert not is_low_cardinality([str(i) for i in range(100)])
+    assert not is_low_cardinality([])
@@ -0,0 +1,77 @@
+# tests/test_field_limits.py
+from __future__ import annotations
+
+from dataclasses import replace
+
+from app.catalog import ColumnInfo
+from app.specs import PEOPLE_SPEC
+from app.transform_framework import FieldRule, column_rule
+
+# no width / length hints: INT and NVARCHAR(4000) when the spec creates the table
+UNHINTED = replace(
+    PEOPLE_SPEC,
+    final_table="dbo.people_wide",
+    fields=[replace(fr, width=None, length=None) for fr in PEOPLE_SPEC.fields],
+)
+
+
+def test_column_rule_takes_the_column_dimensions():
+    col = ColumnInfo("v", "nvarchar", None, None, None, True)
+    assert column_rule(FieldRule("v", "v", "str", length=200), col).length == -1
+    assert column_rule(FieldRule("v", "v", "int"), ColumnInfo("v", "bigint", None, None, None, True)).width == 8
+    money = column_rule(FieldRule("v", "v", "money"), ColumnInfo("v", "decimal", None, 28, 2, True))
+    assert (money.precision, money.scale) == (28, 2)
+    # a type that doesn't fit the cast keeps the hints
+    assert column_rule(FieldRule("v", "v", "int", width=2), ColumnInfo("v", "nvarchar", 10, None, None, True)).width == 2
+
+
+def test_existing_wider_final_table_sets_the_limits(db, make_people_csv):
+    from app.db import get_conn
+    from app.pipeline import run_pipeline
+    from app.rejects_repo import list_rejects
+
+    conn = get_conn()
+    try:
+        conn.cursor().execute(
+            "CREATE TABLE dbo.people_wide (person_id BIGINT NOT NULL PRIMARY KEY, full_name TEXT NOT NULL, created_at DATE NULL);"
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    path = make_people_csv([(2**40, "A" * 5000, "2024-01-01"), (2, "Alan", "2024-01-02")])
+
+    stats = run_pipeline(UNHINTED, csv_path=str(path))
+
+    assert stats == {"total": 2, "good": 2, "bad": 0, "skipped": 0}
+    assert list_rejects("people") == []
+
+
+def test_spec_limits_apply_to_tables_it_creates(ensure_final, make_people_csv):
+    from app.pipeline import run_pipeline
+    from app.rejects_repo import list_rejects
+
+    ensure_final(UNHINTED)
+    path = make_people_csv([(2**40, "Ada", "2024-01-01"), (2, "A" * 5000, "2024-01-02")])
+
+    stats = run_pipeline(UNHINTED, csv_path=str(path))
+
+    assert stats["bad"] == 2
+    assert sorted(r["reasons"] for r in list_rejects("people")) == ["overflow:full_name", "overflow:person_id"]
+
+
+def test_pushdown_overflow_follows_the_final_table(monkeypatch):
+    from app.catalog import TableInfo
+    from app.json_pushdown import openjson_sql
+    from app.specs import ORDERS_SPEC
+
+    monkeypatch.setenv("OPS_DB_BACKEND", "mssql")
+    cols = tuple(ColumnInfo(fr.field, "nvarchar", None, None, None, True) for fr in ORDERS_SPEC.fields if fr.cast == "str")
+    final = TableInfo("dbo", "orders_typed", cols, frozenset())
+    str_fields = [fr.field for fr in ORDERS_SPEC.fields if fr.cast == "str"]
+
+    shred = openjson_sql(ORDERS_SPEC)[0]
+    shred_wide = openjson_sql(ORDERS_SPEC, final=final)[0]
+
+    for f in str_fields:
+        assert f"overflow:{f}" in shred
+        assert f"overflow:{f}" not in shred_wide
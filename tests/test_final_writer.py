@@ -0,0 +1,36 @@
+# tests/test_final_writer.py
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+
+from app.specs import PEOPLE_SPEC
+
+
+@pytest.mark.parametrize("pk_mode", ["server", "client"])
+def test_null_pk_is_rejected_not_crashed(ensure_final, make_people_csv, pk_mode):
+    from app.db import get_conn
+    from app.pipeline import run_pipeline
+    from app.rejects_repo import list_rejects
+
+    # person_id not required by the spec: only insert-if-missing needs it
+    fields = [replace(fr, required=False) if fr.field == "person_id" else fr for fr in PEOPLE_SPEC.fields]
+    spec = replace(PEOPLE_SPEC, fields=fields)
+    ensure_final(spec)
+    path = make_people_csv([(1, "Ada", "2024-01-01"), ("", "No Id", "2024-01-02"), (2, "Alan", "2024-01-03")])
+
+    stats = run_pipeline(spec, csv_path=str(path), pk_mode=pk_mode)
+    stats_rerun = run_pipeline(spec, csv_path=str(path), pk_mode=pk_mode)
+
+    assert stats == {"total": 3, "good": 2, "bad": 1, "skipped": 0}
+    assert stats_rerun["good"] + stats_rerun["skipped"] == 2
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM dbo.people_typed;")
+        assert cur.fetchone()[0] == 2
+    finally:
+        conn.close()
+    reasons = {r["reasons"] for r in list_rejects("people", top=10)}
+    assert reasons == {"required:person_id"}
@@ -0,0 +1,103 @@
+# tests/test_json_rejects.py
+from __future__ import annotations
+
+import hashlib
+
+from app.specs import ORDERS_SPEC
+
+PAYLOADS = [
+    '{"order_id": 1, "status": "new", "total": "10.50", "created_at": "2024-01-02"}',
+    '{"order_id": null, "status": "new"}',  # required:order_id
+    '{"order_id": 2, "status": "ok"',  # invalid_json
+    '{"order_id": 3, "status": "café", "total": 7}',
+]
+
+
+def _rejects() -> dict[int, tuple]:
+    from app.db import get_conn
+
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT row_num, reject_reasons, row_hash, raw_json FROM dbo.dataset_rejects WHERE dataset_name = 'orders';")
+        return {int(n): (str(r), bytes(h), str(raw)) for n, r, h, raw in cur.fetchall()}
+    finally:
+        conn.close()
+
+
+def test_payload_rejects_store_payload_and_nvarchar_hash(ensure_final):
+    from app.db import get_conn
+    from app.transform_framework import transform_dataset
+
+    ensure_final(ORDERS_SPEC)
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.executemany("INSERT INTO dbo.raw_orders(payload_json) VALUES (?);", [(p,) for p in PAYLOADS])
+        conn.commit()
+    finally:
+        conn.close()
+
+    transform_dataset(ORDERS_SPEC, batch_size=2)
+
+    rejects = _rejects()
+    assert sorted(rejects) == [2, 3]
+    for row_num, (reasons, h, raw) in rejects.items():
+        payload = PAYLOADS[row_num - 1]
+        # the same values HASHBYTES('SHA2_256', <NVARCHAR payload>) / the payload give in the pushdown
+        assert raw == payload
+        assert h == hashlib.sha256(payload.encode("utf-16-le")).digest()
+    assert rejects[2][0] == "required:order_id"
+    assert rejects[3][0] == "invalid_json"
+
+
+def test_pushdown_rejects_hash_the_nvarchar_payload(monkeypatch):
+    from app.json_pushdown import openjson_sql
+
+    monkeypatch.setenv("OPS_DB_BACKEND", "mssql")
+    shred, _final, insert_rejects, _counts, _drop = openjson_sql(ORDERS_SPEC)
+    assert "COALESCE(CONVERT(NVARCHAR(MAX), s.[payload_json]), N'') AS __payload" in shred
+    assert "HASHBYTES('SHA2_256', __payload), __reasons, __payload" in insert_rejects
+
+
+def test_rejects_show_lists_invalid_json_payloads(ensure_final):
+    from app.db import get_conn
+    from app.rejects_repo import list_rejects
+    from app.transform_framework import transform_dataset
+
+    ensure_final(ORDERS_SPEC)
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.executemany("INSERT INTO dbo.raw_orders(payload_json) VALUES (?);", [(p,) for p in PAYLOADS])
+        conn.commit()
+    finally:
+        conn.close()
+    transform_dataset(ORDERS_SPEC)
+
+    raw = {r["reasons"]: r["raw"] for r in list_rejects("orders")}
+    assert raw == {"required:order_id": {"order_id": None, "status": "new"}, "invalid_json": PAYLOADS[2]}
+
+
+def test_null_payload_is_invalid_json_like_the_pushdown(ensure_final):
+    from dataclasses import replace
+
+    from app.db import get_conn
+    from app.transform_framework import transform_dataset
+
+    # dbo.raw_orders.payload_json is NOT NULL; other staging tables may allow it
+    spec = replace(ORDERS_SPEC, stg_table="dbo.raw_orders_nullable")
+    ensure_final(spec)
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute("CREATE TABLE dbo.raw_orders_nullable (id INTEGER PRIMARY KEY, payload_json TEXT NULL);")
+        cur.executemany("INSERT INTO dbo.raw_orders_nullable(payload_json) VALUES (?);", [(PAYLOADS[0],), (None,)])
+        conn.commit()
+    finally:
+        conn.close()
+
+    transform_dataset(spec)
+
+    # ISJSON(NULL) = 0 -> invalid_json, raw_json COALESCE(payload, N'')
+    assert _rejects() == {2: ("invalid_json", hashlib.sha256(b"").digest(), "")}
@@ -0,0 +1,63 @@
+# tests/test_jsonl_loader.py
+from __future__ import annotations
+
+import gzip
+
+import pytest
+
+from app.loaders.jsonl_loader import load_jsonl
+
+
+def _lines(*ids: int) -> bytes:
+    return b"".join(b'{"order_id": %d}\n' % i for i in ids)
+
+
+def _payloads() -> list[str]:
+    from app.db import get_conn
+
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT payload_json FROM dbo.raw_orders ORDER BY id;")
+        return [r[0] for r in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+def test_resume_continues_an_appended_file(db):
+    path = db / "orders.jsonl"
+    path.write_bytes(_lines(1, 2))
+    assert load_jsonl(path=str(path))["rows"] == 2
+
+    with path.open("ab") as f:
+        f.write(_lines(3))
+    out = load_jsonl(path=str(path))
+    assert (out["rows"], out["lines"]) == (1, 3)
+    assert _payloads() == ['{"order_id": 1}', '{"order_id": 2}', '{"order_id": 3}']
+
+
+@pytest.mark.parametrize("name, write", [("orders.jsonl", lambda p, b: p.write_bytes(b)), ("orders.jsonl.gz", lambda p, b: p.write_bytes(gzip.compress(b)))])
+def test_replaced_file_is_not_resumed(db, name, write):
+    path = db / name
+    write(path, _lines(1, 2))
+    load_jsonl(path=str(path))
+
+    # next day's file under the same name, longer than the checkpointed offset
+    write(path, _lines(10, 11, 12, 13))
+    with pytest.raises(RuntimeError, match="not the file checkpointed"):
+        load_jsonl(path=str(path))
+
+    assert load_jsonl(path=str(path), resume=False)["rows"] == 4
+    assert len(_payloads()) == 6
+
+
+def test_rejects_record_the_checkpointed_path(db, monkeypatch):
+    from app.rejects_repo import list_rejects
+
+    (db / "in").mkdir()
+    (db / "in" / "orders.jsonl").write_bytes(_lines(1) + b"[1, 2]\n")
+    monkeypatch.chdir(db)
+    load_jsonl(path="in/orders.jsonl")
+
+    [reject] = list_rejects("raw_orders")
+    assert reject["source_file"] == str((db / "in" / "orders.jsonl").resolve())
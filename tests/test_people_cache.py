@@ -0,0 +1,125 @@
+# tests/test_people_cache.py
+from __future__ import annotations
+
+import pytest
+
+from app import people_repo
+from app.people_cache import PeopleCache, TTLCache, set_people_cache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def cache(db):
+    c = PeopleCache(max_entries=100, ttl=60.0, max_page_rows=50)
+    set_people_cache(c)
+    return c
+
+
+def _names(rows) -> list[str]:
+    return [name for _pid, name, _created in rows]
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    c = TTLCache(max_entries=2, ttl=60.0, clock=FakeClock())
+    c.put("a", 1)
+    c.put("b", 2)
+    assert c.get("a") == 1  # "b" is now least recently used
+    c.put("c", 3)
+
+    assert c.get("b", None) is None
+    assert (c.get("a"), c.get("c")) == (1, 3)
+    assert c.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    c = TTLCache(max_entries=10, ttl=5.0, clock=clock)
+    c.put("a", 1)
+    clock.now = 4.9
+    assert c.get("a") == 1
+    clock.now = 5.0
+    assert c.get("a", None) is None
+    assert c.stats()["expirations"] == 1
+
+
+def test_put_after_invalidation_is_refused():
+    c = TTLCache(max_entries=10, ttl=60.0, clock=FakeClock())
+    generation = c.generation
+    c.invalidate(("a",))
+
+    assert c.put("a", "stale", generation=generation) is False
+    assert c.get("a", None) is None
+    assert c.stats()["stale_puts"] == 1
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda pid: people_repo.add_person("Someone Else"),
+        lambda pid: people_repo.update_person_name(pid, "Renamed"),
+        lambda pid: people_repo.delete_person(pid),
+    ],
+    ids=["add", "update", "delete"],
+)
+def test_read_racing_a_write_does_not_store_the_old_row(cache, write):
+    pid = people_repo.add_person("Ada Lovelace")
+    generation = cache.cache.generation
+    old = people_repo._get_person(pid)  # read before the write commits ...
+    write(pid)
+    # ... and stored after it
+    assert cache.cache.put(("id", pid), old, generation=generation) is False
+
+    assert people_repo.get_person(pid) == people_repo._get_person(pid)
+
+
+def test_person_reads_are_cached_until_written(cache):
+    pid = people_repo.add_person("Ada Lovelace")
+    assert people_repo.get_person(pid)[1] == "Ada Lovelace"
+    assert people_repo.get_person(pid)[1] == "Ada Lovelace"
+    assert cache.stats()["hits"] == 1
+
+    people_repo.update_person_name(pid, "Ada King")
+    assert people_repo.get_person(pid)[1] == "Ada King"
+    people_repo.delete_person(pid)
+    assert people_repo.get_person(pid) is None
+
+
+def test_pages_are_invalidated_by_batch_writes(cache):
+    ids = people_repo.add_people(["Ada Lovelace", "Alan Turing"])
+    assert _names(people_repo.list_people(10)) == ["Alan Turing", "Ada Lovelace"]
+    assert _names(people_repo.find_people("Ada", 10)) == ["Ada Lovelace"]
+
+    people_repo.add_people(["Grace Hopper"])
+    assert _names(people_repo.list_people(10)) == ["Grace Hopper", "Alan Turing", "Ada Lovelace"]
+
+    people_repo.update_people([(ids[0], "Ada King")])
+    assert _names(people_repo.find_people("Ada", 10)) == ["Ada King"]
+
+    people_repo.delete_people(ids)
+    assert _names(people_repo.list_people(10)) == ["Grace Hopper"]
+    assert people_repo.find_people("Ada", 10) == []
+
+
+def test_pages_are_invalidated_by_import(cache, make_people_csv):
+    from app.importers.people_importer import import_people_csv
+
+    people_repo.add_person("Ada Lovelace")
+    assert _names(people_repo.list_people(10)) == ["Ada Lovelace"]
+
+    result = import_people_csv(str(make_people_csv()))
+    assert result["inserted"] == 3  # Ada is skipped by name, "" has no name
+
+    assert _names(people_repo.list_people(10)) == ["Bad Id", "Grace Hopper", "Alan Turing", "Ada Lovelace"]
+
+
+def test_large_pages_bypass_the_cache(cache):
+    people_repo.add_person("Ada Lovelace")
+    people_repo.list_people(51)
+    assert cache.stats()["entries"] == 0
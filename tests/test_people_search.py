@@ -0,0 +1,23 @@
+# tests/test_people_search.py
+from __future__ import annotations
+
+from app import people_repo
+from app.people_search import can_use_index, name_trigrams, search_sql
+
+
+def test_trigrams_fit_nchar3_for_names_outside_the_bmp():
+    grams = name_trigrams("Zoë 😀 Li")
+
+    # every trigram is 3 UTF-16 units (6 bytes), like SUBSTRING(full_name, i, 3)
+    assert grams and all(len(g.encode("utf-16-le")) == 6 for g in grams)
+    assert grams == {"zoë", "oë ", " li"}
+    assert name_trigrams("Grace") == {"gra", "rac", "ace"}
+
+
+def test_patterns_outside_the_bmp_scan(db):
+    assert not can_use_index("😀 L")
+    assert "people_name_trigrams" not in search_sql("😀 L", 10)[0]
+
+    pid = people_repo.add_person("Zoë 😀 Li")
+    assert [r[0] for r in people_repo.find_people("😀 L")] == [pid]
+    assert [r[0] for r in people_repo.find_people("zoë")] == [pid]  # via the index
@@ -0,0 +1,106 @@
+# tests/test_pipeline.py
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+
+from app.specs import PEOPLE_SPEC
+from app.transform_framework import PartitionSpec
+
+
+def _final_rows(table: str) -> list[tuple]:
+    from app.db import get_conn
+
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"SELECT person_id, full_name FROM {table} ORDER BY person_id;")
+        return [tuple(r) for r in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+def _partitioned_people():
+    # partition field must be required
+    fields = [fr if fr.field != "created_at" else replace(fr, required=True) for fr in PEOPLE_SPEC.fields]
+    return replace(
+        PEOPLE_SPEC,
+        final_table="dbo.people_typed_part",
+        fields=fields,
+        indexes=[],
+        partition=PartitionSpec(field="created_at", granularity="month"),
+    )
+
+
+def test_run_pipeline_loads_final_and_rejects(ensure_final, make_people_csv):
+    from app.pipeline import run_pipeline
+    from app.rejects_repo import list_rejects
+
+    ensure_final(PEOPLE_SPEC)
+    path = make_people_csv()
+
+    stats = run_pipeline(PEOPLE_SPEC, csv_path=str(path), source_file="people.csv", batch_size=2)
+
+    assert stats == {"total": 5, "good": 3, "bad": 2, "skipped": 0}
+    assert _final_rows(PEOPLE_SPEC.final_table) == [(1, "Ada Lovelace"), (2, "Alan Turing"), (3, "Grace Hopper")]
+    rejects = sorted((r["row_num"], r["reasons"], r["source_file"]) for r in list_rejects("people"))
+    assert rejects == [(4, "required:full_name", "people.csv"), (5, "required:person_id", "people.csv")]
+
+
+def test_run_pipeline_reload_partitions_over_several_batches(ensure_final, make_people_csv):
+    from app.pipeline import run_pipeline
+
+    spec = _partitioned_people()
+    ensure_final(spec)
+    path = make_people_csv()
+
+    # every flush after the first adds periods
+    stats = run_pipeline(spec, csv_path=str(path), batch_size=2, reload_partitions=True)
+
+    assert stats == {"total": 5, "good": 3, "bad": 2, "skipped": 0}
+    assert _final_rows(spec.final_table) == [(1, "Ada Lovelace"), (2, "Alan Turing"), (3, "Grace Hopper")]
+
+
+def test_checkpoint_key_resumes_after_a_crash(ensure_final, make_people_csv, monkeypatch):
+    from app.pipeline import run_pipeline
+    from app.rejects_repo import count_rejects_from
+    from app.transform_framework import FinalWriter
+
+    ensure_final(PEOPLE_SPEC)
+    path = make_people_csv()
+    write = FinalWriter.write
+    calls = []
+
+    def crash_on_third(self, batch, *args, **kwargs):
+        calls.append(batch.n)
+        if len(calls) == 3:
+            raise RuntimeError("killed")
+        write(self, batch, *args, **kwargs)
+
+    # batches of 2: rows 1-2, rows 3-4 (one reject) commit, row 5 never does
+    monkeypatch.setattr(FinalWriter, "write", crash_on_third)
+    with pytest.raises(RuntimeError, match="killed"):
+        run_pipeline(PEOPLE_SPEC, csv_path=str(path), batch_size=2, checkpoint_key="people.csv:1")
+    monkeypatch.setattr(FinalWriter, "write", write)
+
+    stats = run_pipeline(PEOPLE_SPEC, csv_path=str(path), batch_size=2, checkpoint_key="people.csv:1")
+
+    assert stats == {"total": 5, "good": 0, "bad": 1, "skipped": 0}
+    assert count_rejects_from("people", exact=True)[0] == 2
+    assert count_rejects_from("people")[0] == 2
+    assert _final_rows(PEOPLE_SPEC.final_table) == [(1, "Ada Lovelace"), (2, "Alan Turing"), (3, "Grace Hopper")]
+
+
+def test_reload_partitions_replaces_only_loaded_periods(ensure_final, make_people_csv):
+    from app.pipeline import run_pipeline
+
+    spec = _partitioned_people()
+    ensure_final(spec)
+    run_pipeline(spec, csv_path=str(make_people_csv()), reload_partitions=True)
+    # February only: January rows stay, February is replaced
+    feb = make_people_csv([(3, "Grace B. Hopper", "2024-02-11")], name="feb.csv")
+    run_pipeline(spec, csv_path=str(feb), reload_partitions=True)
+
+    assert _final_rows(spec.final_table) == [(1, "Ada Lovelace"), (2, "Alan Turing"), (3, "Grace B. Hopper")]
+
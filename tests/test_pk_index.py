@@ -0,0 +1,57 @@
+# tests/test_pk_index.py
+from __future__ import annotations
+
+import random
+
+from app.pk_index import ARRAY_MAX, KeyBitmap, load_existing_keys
+
+
+def test_add_and_membership():
+    keys = KeyBitmap([5, 70_000, 5])
+    assert len(keys) == 2
+    assert keys.add(6) is True
+    assert keys.add(6) is False
+    assert 5 in keys and 70_000 in keys and 6 in keys
+    assert 7 not in keys and 65_541 not in keys  # same low bits as 5, other container
+    assert "5" not in keys and None not in keys
+    assert list(keys) == [5, 6, 70_000]
+
+
+def test_array_container_converts_to_bitmap():
+    keys = KeyBitmap(range(0, 2 * ARRAY_MAX, 2))
+    assert keys.nbytes() == 2 * ARRAY_MAX  # still a sorted array('H')
+    assert keys.add(1) is True  # container full: becomes an 8 KiB bitmap
+    assert keys.nbytes() == 65536 // 8
+    assert len(keys) == ARRAY_MAX + 1
+    assert all(k in keys for k in range(0, 2 * ARRAY_MAX, 2))
+    assert 1 in keys and 3 not in keys
+    assert keys.add(2) is False
+    assert len(keys) == ARRAY_MAX + 1
+
+
+def test_matches_a_set():
+    rnd = random.Random(7)
+    ref: set[int] = set()
+    keys = KeyBitmap()
+    # one dense container (bitmap) and many sparse ones (arrays)
+    for k in [rnd.randrange(0, 65536) for _ in range(20_000)] + [rnd.randrange(0, 10**9) for _ in range(5_000)]:
+        assert keys.add(k) is (k not in ref)
+        ref.add(k)
+    assert len(keys) == len(ref)
+    assert list(keys) == sorted(ref)
+    probes = [rnd.randrange(0, 10**9) for _ in range(5_000)]
+    assert [p in keys for p in probes] == [p in ref for p in probes]
+
+
+def test_load_existing_keys(db):
+    from app.db import get_conn
+
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.executemany("INSERT INTO dbo.people(person_id, full_name) VALUES (?, ?);", [(i, f"p{i}") for i in (1, 2, 100_000)])
+        conn.commit()
+        keys = load_existing_keys(cur, "dbo.people", "person_id", fetch_size=2)
+    finally:
+        conn.close()
+    assert list(keys) == [1, 2, 100_000]
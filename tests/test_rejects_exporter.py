@@ -0,0 +1,64 @@
+# tests/test_rejects_exporter.py
+from __future__ import annotations
+
+import csv
+import json
+
+import pytest
+
+from app.exporters.rejects_exporter import export_rejects_csv, export_rejects_jsonl
+from app.specs import PEOPLE_SPEC
+
+
+@pytest.fixture
+def people_rejects(ensure_final, make_people_csv):
+    # spec transforms write dbo.dataset_rejects; migrations also create the
+    # promoter's dbo.people_rejects, so export a dataset without its own table
+    from dataclasses import replace
+
+    from app.loaders.csv_loader import load_csv
+    from app.transform_framework import transform_dataset
+
+    spec = replace(PEOPLE_SPEC, name="contacts", stg_table="dbo.stage_contacts", final_table="dbo.contacts_typed", indexes=None)
+    load_csv(csv_path=str(make_people_csv()), table=spec.stg_table, drop_and_recreate=True, confirm=f"DROP_CREATE {spec.stg_table}")
+    ensure_final(spec)
+    transform_dataset(spec)
+    return spec.name
+
+
+def test_jsonl_falls_back_to_dataset_rejects(people_rejects, tmp_path):
+    out = export_rejects_jsonl(dataset=people_rejects, out_path=str(tmp_path / "r.jsonl"))
+    rows = [json.loads(line) for line in open(out, encoding="utf-8")]
+
+    assert [r["row_num"] for r in rows] == [5, 4]  # newest first
+    assert {r["dataset_name"] for r in rows} == {"contacts"}
+    assert sorted(r["reject_reasons"] for r in rows) == ["required:full_name", "required:person_id"]
+    assert all(len(r["row_hash"]) == 64 for r in rows)  # bytes as hex
+    assert "raw_json_z" not in rows[0]
+
+
+def test_csv_reads_compressed_payloads(people_rejects, tmp_path):
+    from app.reject_store import compress_existing
+
+    assert compress_existing(people_rejects)["rows"] == 2
+    out = export_rejects_csv(dataset=people_rejects, out_path=str(tmp_path / "r.csv"), top=1)
+    with open(out, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    assert len(rows) == 1
+    assert json.loads(rows[0]["raw_json"])["full_name"] == "Bad Id"
+
+
+def test_unknown_dataset_without_shared_table(db, tmp_path):
+    from app.catalog import get_catalog
+    from app.db import get_conn
+
+    conn = get_conn()
+    try:
+        conn.cursor().execute("DROP TABLE dbo.dataset_rejects;")
+        conn.commit()
+    finally:
+        conn.close()
+    get_catalog().invalidate()
+    with pytest.raises(RuntimeError, match="Rejects table not found: dbo.nothing_rejects"):
+        export_rejects_jsonl(dataset="nothing", out_path=str(tmp_path / "r.jsonl"))
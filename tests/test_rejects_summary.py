@@ -0,0 +1,90 @@
+# tests/test_rejects_summary.py
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date
+
+from app.rejects_summary import SUMMARY_TABLE, apply_summary, read_summary
+
+
+def _summary() -> dict[tuple, int]:
+    from app.db import get_conn
+
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"SELECT dataset_name, source_file, reason, reject_day, reject_count FROM {SUMMARY_TABLE};")
+        return {(ds, src, reason, str(day)): int(n) for ds, src, reason, day, n in cur.fetchall()}
+    finally:
+        conn.close()
+
+
+def _apply(counts) -> None:
+    from app.db import get_conn
+
+    conn = get_conn()
+    try:
+        apply_summary(conn.cursor(), counts)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_apply_summary_adds_to_existing_keys(db):
+    day = date(2024, 1, 5)
+    _apply(Counter({("people", "a.csv", "*", day): 2, ("people", "a.csv", "required:x", day): 1}))
+    _apply(Counter({("people", "a.csv", "*", day): 3, ("people", "b.csv", "*", day): 1, ("people", "a.csv", "zero", day): 0}))
+
+    assert _summary() == {
+        ("people", "a.csv", "*", "2024-01-05"): 5,
+        ("people", "a.csv", "required:x", "2024-01-05"): 1,
+        ("people", "b.csv", "*", "2024-01-05"): 1,
+    }
+    assert read_summary("people", by="source") == [
+        {"dataset": "people", "source": "a.csv", "count": 5, "first_day": "2024-01-05", "last_day": "2024-01-05"},
+        {"dataset": "people", "source": "b.csv", "count": 1, "first_day": "2024-01-05", "last_day": "2024-01-05"},
+    ]
+
+
+def test_upsert_sql_is_a_single_statement(monkeypatch):
+    from app.backends import get_backend
+
+    monkeypatch.setenv("OPS_DB_BACKEND", "mssql")
+    sql = get_backend().upsert_add_sql(SUMMARY_TABLE, ["dataset_name", "reason"], "reject_count", ["updated_at"])
+    assert sql.startswith("MERGE dbo.dataset_rejects_summary WITH (HOLDLOCK) AS t USING (SELECT ? AS [dataset_name]")
+    assert "t.[reject_count] = t.[reject_count] + s.[reject_count], t.[updated_at] = s.[updated_at]" in sql
+    assert "WHEN NOT MATCHED THEN INSERT ([dataset_name], [reason], [reject_count], [updated_at])" in sql
+
+
+def test_count_rejects_falls_back_without_summary_table(db, capsys):
+    from app.catalog import get_catalog
+    from app.db import get_conn
+    from app.ops_cli import main
+    from app.rejects_repo import count_rejects
+
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "INSERT INTO dbo.dataset_rejects(dataset_name, row_num, row_hash, reject_reasons, raw_json) VALUES (?, ?, ?, ?, ?);",
+            ("people", 1, b"\x00" * 32, "x", "{}"),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    # written without going through apply_summary
+    assert count_rejects("people") == 0
+    assert main(["rejects_count", "--dataset", "people"]) == 0
+    assert "count=0 from=dbo.dataset_rejects_summary" in capsys.readouterr().out
+
+    conn = get_conn()
+    try:
+        conn.cursor().execute(f"DROP TABLE {SUMMARY_TABLE};")
+        conn.commit()
+    finally:
+        conn.close()
+    get_catalog().invalidate()
+
+    assert count_rejects("people") == 1
+    assert main(["rejects_count", "--dataset", "people"]) == 0
+    assert "count=1 from=dbo.dataset_rejects" in capsys.readouterr().out
@@ -0,0 +1,131 @@
+# tests/test_smoke.py
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.ops_cli import main
+
+# The ops commands end to end on SQLite: staging load, transform, one-pass
+# pipeline, the serve daemon and the rejects tooling.
+
+
+def _count(table: str) -> int:
+    from app.db import get_conn
+
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"SELECT COUNT(*) FROM {table};")
+        return int(cur.fetchone()[0])
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def loaded(db, make_people_csv):
+    """
+    dbo.stage_people loaded from the PEOPLE_ROWS CSV and transformed into dbo.people_typed.
+    """
+    csv_path = make_people_csv()
+    assert main(["migrate"]) == 0
+    assert (
+        main(
+            [
+                "load_csv",
+                "--csv", str(csv_path),
+                "--table", "dbo.stage_people",
+                "--drop-create",
+                "--require-confirm", "DROP_CREATE dbo.stage_people",
+            ]
+        )
+        == 0
+    )
+    assert _count("dbo.stage_people") == 5
+    assert main(["ensure_people_final"]) == 0
+    assert main(["transform_people", "--source-file", csv_path.name]) == 0
+    return csv_path
+
+
+def test_load_and_transform(loaded, capsys):
+    assert _count("dbo.people_typed") == 3
+    assert _count("dbo.dataset_rejects") == 2
+
+    # a rerun inserts nothing new
+    assert main(["transform_people", "--truncate-rejects"]) == 0
+    assert _count("dbo.people_typed") == 3
+    assert _count("dbo.dataset_rejects") == 2
+
+
+def test_pipeline_matches_staged_transform(loaded, make_people_csv):
+    csv_path = make_people_csv([(10, "Edsger Dijkstra", "2024-04-01"), (11, "", "2024-04-02")], name="more.csv")
+    assert main(["pipeline", "--spec", "people", "--csv", str(csv_path)]) == 0
+    assert _count("dbo.people_typed") == 4
+    assert _count("dbo.dataset_rejects") == 3
+
+
+def test_serve_once_ingests_and_moves_files(loaded, make_people_csv, tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    good = make_people_csv([(20, "Barbara Liskov", "2024-05-01")], name="inbox/good.csv")
+    (inbox / "good.csv.done").write_text("")
+    bad = inbox / "bad.csv"
+    bad.write_text("not,a,people\nfile,at,all\n", encoding="utf-8")
+    (inbox / "bad.csv.done").write_text("")
+
+    rc = main(["serve", "--watch", str(inbox), "--spec", "people", "--ready", "done", "--poll-seconds", "0.05", "--workers", "2", "--once"])
+
+    assert rc == 1  # bad.csv failed
+    assert (inbox / "processed" / good.name).exists()
+    assert (inbox / "failed" / bad.name).exists()
+    assert (inbox / "failed" / "bad.csv.err").exists()
+    assert not good.exists() and not bad.exists()
+    assert _count("dbo.people_typed") == 4
+    assert _count("dbo.load_checkpoints") == 0  # dropped once good.csv is in the manifest
+    status = json.loads(next(inbox.glob("*status*.json")).read_text(encoding="utf-8"))
+    assert (status["files_ok"], status["files_failed"]) == (1, 1)
+
+
+def test_rejects_commands(loaded, tmp_path, capsys):
+    from app.rejects_repo import list_rejects
+
+    reasons = sorted(r["reasons"] for r in list_rejects("people"))
+    assert reasons == ["required:full_name", "required:person_id"]
+
+    capsys.readouterr()
+    assert main(["rejects_count", "--dataset", "people", "--exact"]) == 0
+    assert "2" in capsys.readouterr().out
+    assert main(["rejects_summary", "--dataset", "people", "--rebuild"]) == 0
+    out = capsys.readouterr().out
+    assert "required:full_name" in out and "required:person_id" in out
+    assert main(["rejects_show", "--dataset", "people"]) == 0
+    assert "Bad Id" in capsys.readouterr().out
+
+    assert main(["rejects_compress", "--dataset", "people"]) == 0
+    assert main(["rejects_compress", "--report-only"]) == 0
+    # compressed payloads still read back
+    assert sorted(r["reasons"] for r in list_rejects("people")) == reasons
+
+
+def test_rejects_export(loaded, tmp_path):
+    from app.db import get_conn
+
+    # dbo.people_rejects is written by promote_people (a T-SQL MERGE, no SQLite equivalent)
+    conn = get_conn()
+    try:
+        conn.cursor().executemany(
+            "INSERT INTO dbo.people_rejects(raw_person_id, raw_full_name, raw_created_at, reason) VALUES (?, ?, ?, ?);",
+            [("4", "", "2024-02-12", "full_name is empty"), ("x", "Bad Id", "2024-03-01", "person_id not an integer")],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    jsonl = tmp_path / "rejects.jsonl"
+    assert main(["rejects_export", "--dataset", "people", "--out", str(jsonl)]) == 0
+    rows = [json.loads(line) for line in jsonl.read_text(encoding="utf-8").splitlines()]
+    assert sorted(r["raw_full_name"] for r in rows) == ["", "Bad Id"]
+    out_csv = tmp_path / "rejects.csv"
+    assert main(["rejects_export_csv", "--dataset", "people", "--out", str(out_csv), "--top", "1"]) == 0
+    assert len(out_csv.read_text(encoding="utf-8").splitlines()) == 2  # header + 1
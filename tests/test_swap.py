@@ -0,0 +1,104 @@
+# tests/test_swap.py
+from __future__ import annotations
+
+import pytest
+
+from app.specs import PEOPLE_SPEC
+
+
+def _exec(*stmts: str) -> None:
+    from app.catalog import get_catalog
+    from app.db import get_conn
+
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        for sql in stmts:
+            cur.execute(sql)
+        conn.commit()
+    finally:
+        conn.close()
+    get_catalog().invalidate()
+
+
+def _rows(table: str) -> list[tuple]:
+    from app.db import get_conn
+
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"SELECT person_id, full_name FROM {table} ORDER BY person_id;")
+        return [tuple(r) for r in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def staged(db, make_people_csv):
+    from app.loaders.csv_loader import load_csv
+
+    load_csv(
+        csv_path=str(make_people_csv()),
+        table=PEOPLE_SPEC.stg_table,
+        drop_and_recreate=True,
+        confirm=f"DROP_CREATE {PEOPLE_SPEC.stg_table}",
+    )
+
+
+def test_swap_replaces_a_table_built_from_the_spec(staged, ensure_final):
+    from app.transform_framework import transform_dataset
+
+    ensure_final(PEOPLE_SPEC)
+    _exec("INSERT INTO dbo.people_typed(person_id, full_name) VALUES (99, 'Old Row');")
+    transform_dataset(PEOPLE_SPEC, swap=True)
+    assert _rows("dbo.people_typed") == [(1, "Ada Lovelace"), (2, "Alan Turing"), (3, "Grace Hopper")]
+
+
+def test_swap_refuses_the_migration_owned_table(staged):
+    from app.catalog import get_catalog
+    from app.db import get_conn
+    from app.transform_framework import transform_dataset
+
+    # dbo.people_typed as migration 007 creates it, plus a later column and a widened name
+    _exec(
+        "DROP TABLE IF EXISTS dbo.people_typed;",
+        """
+        CREATE TABLE dbo.people_typed (
+            person_id  BIGINT        NOT NULL,
+            full_name  NVARCHAR(400) NOT NULL,
+            created_at DATETIME2(0)  NOT NULL,
+            note       NVARCHAR(50)  NULL,
+            CONSTRAINT PK_people_typed PRIMARY KEY (person_id)
+        );
+        """,
+        "INSERT INTO dbo.people_typed(person_id, full_name, created_at) VALUES (99, 'Old Row', '2024-01-01 00:00:00');",
+    )
+    conn = get_conn()
+    try:
+        assert get_catalog().table(conn.cursor(), "dbo.people_typed").primary_key == ("person_id",)
+    finally:
+        conn.close()
+
+    with pytest.raises(RuntimeError) as e:
+        transform_dataset(PEOPLE_SPEC, swap=True)
+    msg = str(e.value)
+    assert "Can't swap dbo.people_typed" in msg
+    assert "primary key (person_id)" in msg
+    assert "created_at: NOT NULL, spec field not required" in msg
+    assert "note: not in spec" in msg
+    assert "full_name: nvarchar(400) > NVARCHAR(200)" in msg
+    assert _rows("dbo.people_typed") == [(99, "Old Row")]
+
+
+def test_catalog_reports_sql_server_clustered_primary_key():
+    from app.catalog import _build
+
+    info = _build(
+        "dbo",
+        [
+            ("people_typed", "C", "person_id", "bigint", None, 19, 0, False),
+            ("people_typed", "I", "PK_people_typed", "clustered", None, None, None, None),
+            ("people_typed", "K", "person_id", "PK_people_typed", None, None, None, None),
+        ],
+    )["people_typed"]
+    assert (info.primary_key, info.primary_key_name, info.clustered) == (("person_id",), "PK_people_typed", "PK_people_typed")
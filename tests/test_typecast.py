@@ -0,0 +1,92 @@
+# tests/test_typecast.py
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+import pytest
+
+from app.typecast import to_date_any, to_decimal_money, to_int
+
+# The fast paths must agree with the general paths they short-circuit.
+
+
+def reference_to_date_any(v: Any) -> datetime | None:
+    s = str(v).strip()
+    if s == "":
+        return None
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(s)
+    except ValueError:
+        return None
+
+
+def reference_to_decimal_money(v: Any) -> Decimal | None:
+    s = str(v).strip()
+    if s == "":
+        return None
+    s = s.replace("$", "").replace(",", "")
+    try:
+        return Decimal(s)
+    except (InvalidOperation, ValueError):
+        return None
+
+
+DATES = [
+    "2024-01-05",
+    "2024-01-05 10:20",
+    "2024-01-05 10:20:30",
+    "2024-01-05T10:20:30",
+    "2024-01-05T10:20",
+    " 2024-12-31 ",
+    "2024-02-30",  # invalid day: fast path falls through
+    "2024-13-01",
+    "2024-1-5",  # not zero-padded
+    "2024-01-05 10:20:30.5",
+    "2024-01-05T10:20:30+02:00",
+    "20240105",
+    "05/01/2024",
+    "",
+    "n/a",
+]
+
+
+@pytest.mark.parametrize("v", DATES)
+def test_to_date_any_matches_reference(v):
+    assert to_date_any(v) == reference_to_date_any(v)
+
+
+@pytest.mark.parametrize("v", ["10.50", " 7 ", "$1,234.50", "1,000", "$", "abc", "", "-0.01", "1e3", "NaN"])
+def test_to_decimal_money_matches_reference(v):
+    got, want = to_decimal_money(v), reference_to_decimal_money(v)
+    if want is not None and want.is_nan():
+        assert got.is_nan()
+    else:
+        assert got == want
+
+
+@pytest.mark.parametrize(
+    "v, expected",
+    [
+        ("42", 42),
+        (" -7 ", -7),
+        ("12.0", 12),
+        ("-7.9", -7),  # truncated toward zero
+        ("1e3", 1000),
+        ("9007199254740993", 2**53 + 1),
+        ("9007199254740993.0", 2**53 + 1),  # beyond float precision
+        ("", None),
+        ("12x", None),
+        ("inf", None),
+        ("nan", None),
+        ("1e999999", None),
+    ],
+)
+def test_to_int(v, expected):
+    assert to_int(v) == expected